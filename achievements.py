@@ -0,0 +1,180 @@
+"""
+Achievements for Cloud Engineer Bootcamp
+
+Badge and skill rules loaded from config.yaml. Badge rules are indexed by the
+progress fields they depend on, so a mutation only re-evaluates the rules it
+can affect, and the same engine can award badges across a whole cohort.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional
+
+from progress_model import Progress
+from progress_storage import ProgressDatabase, VersionConflictError, set_change
+
+# Fields compared with a minimum value
+NUMERIC_FIELDS = ("days_completed", "streak", "total_hours")
+# Fields whose size is compared with a minimum count
+COUNTED_FIELDS = ("completed_days", "notes", "portfolio_projects")
+
+DEFAULT_BADGES = [
+    {"name": "First Step", "description": "Complete your first day", "requires": {"days_completed": 1}},
+    {"name": "Week Warrior", "description": "Complete a full week", "requires": {"days_completed": 5}},
+    {"name": "Month Master", "description": "Complete 20 days", "requires": {"days_completed": 20}},
+    {"name": "Streak Starter", "description": "Maintain a 3-day streak", "requires": {"streak": 3}},
+    {"name": "Streak Master", "description": "Maintain a 7-day streak", "requires": {"streak": 7}},
+    {"name": "Dedication", "description": "Maintain a 14-day streak", "requires": {"streak": 14}},
+    {"name": "Foundation Expert", "description": "Complete Week 2", "requires": {"completed_weeks": 2}},
+    {"name": "Container Captain", "description": "Complete Week 4", "requires": {"completed_weeks": 4}},
+    {"name": "Pipeline Pro", "description": "Complete Week 6", "requires": {"completed_weeks": 6}},
+    {"name": "Cloud Champion", "description": "Complete Week 8", "requires": {"completed_weeks": 8}},
+]
+
+DEFAULT_SKILLS_BY_WEEK = {
+    1: ["Linux", "Command Line"],
+    2: ["Networking", "Scripting", "Git"],
+    3: ["Docker", "Containerization"],
+    4: ["Kubernetes", "Orchestration"],
+    5: ["CI/CD", "GitHub Actions"],
+    6: ["Terraform", "IaC", "GitOps"],
+    7: ["Cloud Platforms", "AWS/Azure/GCP"],
+    8: ["Monitoring", "Security", "Production"],
+}
+
+
+class BadgeRule:
+    """A badge and the conditions a progress document must meet to earn it.
+
+    `requires` maps progress fields to conditions, all of which must hold:
+    a minimum for days_completed, streak and total_hours; a minimum count
+    for completed_days, notes and portfolio_projects; a week number (or list
+    of them) for completed_weeks; and {week, score} for assessment_scores.
+    """
+    
+    def __init__(self, name: str, description: str, requires: Dict[str, Any]):
+        """Initialize and validate the rule."""
+        if not requires:
+            raise ValueError(f"Badge {name!r} has no requirements")
+        for field, condition in requires.items():
+            if field == "assessment_scores":
+                if not isinstance(condition, dict) or "week" not in condition:
+                    raise ValueError(f"Badge {name!r}: assessment_scores needs a week and a score")
+            elif field not in NUMERIC_FIELDS + COUNTED_FIELDS + ("completed_weeks",):
+                raise ValueError(f"Badge {name!r} depends on unknown field {field!r}")
+        self.name = name
+        self.description = description
+        self.requires = requires
+    
+    @property
+    def fields(self) -> List[str]:
+        """Progress fields this rule depends on."""
+        return list(self.requires)
+    
+    def matches(self, progress: Progress) -> bool:
+        """Check whether a progress document meets every condition."""
+        for field, condition in self.requires.items():
+            if field in NUMERIC_FIELDS:
+                if getattr(progress, field) < condition:
+                    return False
+            elif field in COUNTED_FIELDS:
+                if len(getattr(progress, field)) < condition:
+                    return False
+            elif field == "completed_weeks":
+                weeks = condition if isinstance(condition, list) else [condition]
+                if not all(int(week) in progress.completed_weeks for week in weeks):
+                    return False
+            else:
+                result = progress.assessment_scores.get(int(condition['week']))
+                if not result or result.score < condition.get("score", 70):
+                    return False
+        return True
+
+
+class AchievementEngine:
+    """Awards badges and skill points from configured rules."""
+    
+    def __init__(self, badges: Optional[List[Dict[str, Any]]] = None,
+                 skills_by_week: Optional[Dict[Any, List[str]]] = None, skill_points_per_week: float = 20):
+        """Initialize the engine and index badge rules by the fields they depend on."""
+        self.rules = [BadgeRule(**badge) for badge in (DEFAULT_BADGES if badges is None else badges)]
+        names = [rule.name for rule in self.rules]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate badge names: {', '.join(sorted(duplicates))}")
+        
+        self.rules_by_field: Dict[str, List[BadgeRule]] = {}
+        for rule in self.rules:
+            for field in rule.fields:
+                self.rules_by_field.setdefault(field, []).append(rule)
+        
+        self.skills_by_week = {
+            int(week): skills for week, skills in (skills_by_week or DEFAULT_SKILLS_BY_WEEK).items()
+        }
+        self.skill_points_per_week = skill_points_per_week
+    
+    @classmethod
+    def from_config(cls, achievements_config: Dict[str, Any]) -> "AchievementEngine":
+        """Create an engine from the `achievements` section of config.yaml."""
+        return cls(
+            badges=achievements_config.get('badges'),
+            skills_by_week=achievements_config.get('skills_by_week'),
+            skill_points_per_week=achievements_config.get('skill_points_per_week', 20)
+        )
+    
+    def award_badges(self, progress: Progress, changed: Optional[Iterable[str]] = None) -> List[str]:
+        """Add newly earned badges to `progress` and return them.
+
+        Only rules depending on one of the `changed` fields are evaluated;
+        pass None to evaluate every rule.
+        """
+        if changed is None:
+            candidates = self.rules
+        else:
+            seen = set()
+            candidates = []
+            for field in changed:
+                for rule in self.rules_by_field.get(field, ()):
+                    if rule.name not in seen:
+                        seen.add(rule.name)
+                        candidates.append(rule)
+            if not candidates:
+                return []
+        
+        earned = set(progress.badges)
+        awarded = [rule.name for rule in candidates if rule.name not in earned and rule.matches(progress)]
+        progress.badges.extend(awarded)
+        return awarded
+    
+    def update_skills(self, progress: Progress, week: int, score: float) -> List[str]:
+        """Raise the skills taught in `week` in proportion to the score and return them."""
+        skills = progress.skills
+        increase = (score / 100) * self.skill_points_per_week
+        updated = self.skills_by_week.get(week, [])
+        for skill in updated:
+            skills[skill] = min(skills.get(skill, 0) + increase, 100)
+        return updated
+
+
+def award_cohort_badges(database: ProgressDatabase, engine: AchievementEngine,
+                        max_retries: int = 5) -> Dict[str, List[str]]:
+    """Evaluate every rule for every learner in a cohort database.
+
+    Useful after adding badges to config.yaml, since learners otherwise only
+    earn them on their next matching update. Returns the newly awarded
+    badges per learner.
+    """
+    awarded: Dict[str, List[str]] = {}
+    for learner_id in database.learner_ids():
+        storage = database.storage_for(learner_id)
+        for attempt in range(max_retries):
+            progress = storage.load()
+            new_badges = engine.award_badges(progress)
+            if not new_badges:
+                break
+            try:
+                storage.append([set_change(["badges"], progress.badges)], expected_version=progress.version)
+            except VersionConflictError:
+                # The learner was updated meanwhile; evaluate the fresh document
+                continue
+            awarded[learner_id] = new_badges
+            break
+    return awarded
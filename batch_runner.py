@@ -0,0 +1,170 @@
+"""
+Batch Runner for Cloud Engineer Bootcamp
+
+Answers many questions concurrently through the provider router, bounded by a
+concurrency limit, with rate limits retried with backoff.
+"""
+
+import asyncio
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, List, Optional, TextIO, Iterable
+
+from providers import ProviderRouter, ProviderError, create_router
+
+
+def read_questions(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """Parse JSONL questions.
+
+    Each line is either an object with a `question` field (plus optional `id`
+    and `system_prompt`), a JSON string, or plain text.
+    """
+    questions = []
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            item = line
+        if isinstance(item, str):
+            item = {"question": item}
+        if not isinstance(item, dict) or not item.get("question"):
+            raise ValueError(f"Line {line_number}: expected a question")
+        item.setdefault("id", len(questions) + 1)
+        questions.append(item)
+    return questions
+
+
+class BatchRunner:
+    """Dispatches questions to the configured providers with bounded concurrency."""
+    
+    def __init__(self, agent, concurrency: int = 8, max_retries: int = 5):
+        """Initialize the batch runner.
+
+        `agent` is a MentorAgent; its configuration, model choice and response
+        cache are shared with the interactive commands.
+        """
+        self.agent = agent
+        self.config = agent.config
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.stats = {"answered": 0, "cached": 0, "failed": 0, "retries": 0}
+        self._router = None
+        self._router_error = None
+        self._executor = None
+    
+    def _create_router(self) -> Optional[ProviderRouter]:
+        """Create a router that makes a single round per call, or None in demo mode.
+
+        Retries are left to `_answer`, which waits without holding a slot.
+        """
+        from dotenv import load_dotenv
+        
+        load_dotenv()
+        try:
+            router = create_router(self.config, max_retries=0)
+        except ProviderError as e:
+            self._router_error = str(e)
+            self.agent.diagnostics.print(f"[yellow]Warning: {e}. No questions can be answered.[/yellow]")
+            return None
+        provider = self.config.get('ai_provider', 'openai')
+        if router.primary.name != provider:
+            self.agent.diagnostics.print(
+                f"[yellow]Warning: AI provider '{provider}' not available, using '{router.primary.name}'.[/yellow]"
+            )
+        return router
+    
+    async def _answer(self, item: Dict[str, Any], system_prompt: Optional[str],
+                      semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Answer one question, using the cache when possible."""
+        prompt = item["question"]
+        system_prompt = item.get("system_prompt", system_prompt)
+        result = {"id": item["id"], "question": prompt}
+        
+        if not self._router:
+            # Demo mode: the agent's fallback text is not an answer
+            self.stats["failed"] += 1
+            result["error"] = f"No AI provider available: {self._router_error}"
+            return result
+        
+        cache_key = self.agent.cache_key(prompt, system_prompt)
+        cached = self.agent.cached_response(cache_key, "batch")
+        if cached is not None:
+            self.stats["cached"] += 1
+            result.update(answer=cached, cached=True)
+            return result
+        
+        # Each call runs on its own thread and makes one round across the
+        # providers, with failover and hedging. Rate limits and transient
+        # failures are retried here, sleeping after the slot is released so
+        # a throttled question doesn't keep the others waiting
+        call = partial(
+            self._router.complete,
+            system_prompt,
+            [{"role": "user", "content": prompt}],
+            temperature=self.config.get('temperature', 0.7),
+            max_tokens=self.config.get('max_tokens', 2000)
+        )
+        for attempt in range(self.max_retries + 1):
+            call_metrics: Dict[str, Any] = {}
+            try:
+                async with semaphore:
+                    answer = await asyncio.get_running_loop().run_in_executor(
+                        self._executor, partial(call, metrics=call_metrics)
+                    )
+                break
+            except ProviderError as e:
+                if e.emitted or not e.retryable or attempt == self.max_retries:
+                    self.stats["failed"] += 1
+                    result["error"] = str(e)
+                    return result
+                self.stats["retries"] += 1
+                delay = e.retry_after or self._router.backoff * 2 ** attempt
+                await asyncio.sleep(delay * random.uniform(1.0, 1.5))
+            finally:
+                if call_metrics:
+                    self.agent.metrics.record(command="batch", cached=False, **call_metrics)
+        
+        if cache_key and answer:
+            self.agent.response_cache.set(cache_key, answer)
+        self.stats["answered"] += 1
+        result["answer"] = answer
+        return result
+    
+    async def run(self, questions: List[Dict[str, Any]], output: TextIO,
+                  system_prompt: Optional[str] = None):
+        """Answer all questions and write results to `output` in input order.
+
+        Results are written as soon as every earlier question has finished,
+        so long batches produce output incrementally.
+        """
+        self._router = self._create_router()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [
+            asyncio.create_task(self._answer(item, system_prompt, semaphore))
+            for item in questions
+        ]
+        
+        try:
+            for task in tasks:
+                result = await task
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_batch(agent, input_stream: TextIO, output: TextIO, system_prompt: Optional[str] = None,
+              concurrency: int = 8, max_retries: int = 5) -> Dict[str, int]:
+    """Read JSONL questions, answer them concurrently and write JSONL answers."""
+    questions = read_questions(input_stream)
+    runner = BatchRunner(agent, concurrency=concurrency, max_retries=max_retries)
+    asyncio.run(runner.run(questions, output, system_prompt))
+    return dict(runner.stats, total=len(questions))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Assessment grading benchmark.
+
+Writes a cohort of synthetic Week 1 submissions (a mix of reference answers,
+partial answers and blanks, as Markdown and JSON), then grades them the way
+`grade` does: parsing and answer key checks with one process and with a
+process pool, and the written answers against the bundled mock Ollama server
+with one request at a time and with several in flight.
+
+Usage:
+    python benchmarks/assessment_grading_benchmark.py
+    python benchmarks/assessment_grading_benchmark.py --submissions 2000 --concurrency 1,8,32 --first-token-ms 500
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from assessment_engine import load_assessment, grade_submissions
+from mentor_agent import MentorAgent, BASE_DIR
+from mock_ollama_server import start_in_background
+from providers import OllamaProvider, ProviderRouter
+
+GRADED_QUESTION = re.compile(r"^Question id: (\w+) \((\d+) points?\)", re.MULTILINE)
+
+
+def grade_reply(messages: List[Dict[str, str]]) -> str:
+    """Mock reply: half marks for every question in the grading request."""
+    grades = {
+        question_id: {"points": int(points) // 2, "feedback": "Partly correct."}
+        for question_id, points in GRADED_QUESTION.findall(messages[-1]["content"])
+    }
+    return json.dumps(grades)
+
+
+def synthetic_answers(assessment: Dict[str, Any], generator: random.Random) -> Dict[str, str]:
+    """Answer each question with the reference, its first line or nothing."""
+    answers = {}
+    for question in assessment["questions"]:
+        if question["kind"] == "choice":
+            wrong = generator.choice(list(question["options"]))
+            answers[question["id"]] = question["key"]["answer"] if generator.random() < 0.7 else wrong
+            continue
+        reference = question["key"]["reference"]
+        answers[question["id"]] = generator.choices(
+            [reference, reference.split("\n")[0], ""], weights=[6, 3, 1]
+        )[0]
+    return answers
+
+
+def write_submissions(assessment: Dict[str, Any], directory: Path, count: int, seed: int = 7):
+    """Write `count` submissions, alternating Markdown and JSON."""
+    generator = random.Random(seed)
+    for i in range(count):
+        answers = synthetic_answers(assessment, generator)
+        if i % 2:
+            (directory / f"learner{i:05d}.json").write_text(json.dumps(answers), encoding='utf-8')
+            continue
+        lines = [f"# {assessment['title']}: Submission", "", "## Multiple Choice", ""]
+        lines += [f"{question['id'][2:]}. {answers[question['id']]}" for question in assessment["questions"]
+                  if question["kind"] == "choice"]
+        for question in assessment["questions"]:
+            if question["kind"] != "choice":
+                lines += ["", f"## {question['title']}", "", "```", answers[question["id"]], "```"]
+        (directory / f"learner{i:05d}.md").write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--submissions", type=int, default=500)
+    parser.add_argument("--concurrency", default="1,8,16", help="AI grading requests in flight to compare")
+    parser.add_argument("--first-token-ms", type=float, default=100, help="Mock: delay before each reply")
+    parser.add_argument("--tokens-per-second", type=float, default=400, help="Mock: generation speed")
+    args = parser.parse_args()
+    
+    assessment = load_assessment(BASE_DIR, 1)
+    with tempfile.TemporaryDirectory() as workdir:
+        directory = Path(workdir)
+        write_submissions(assessment, directory, args.submissions)
+        
+        print(f"Local grading of {args.submissions} submissions (parsing and answer key checks)")
+        for workers in (1, os.cpu_count() or 1):
+            start = time.perf_counter()
+            results = grade_submissions(assessment, directory, workers=workers)
+            elapsed = time.perf_counter() - start
+            mean = sum(result["score"] for result in results) / len(results)
+            print(f"  {workers:>3} processes: {elapsed * 1000:>8.0f} ms  (mean score {mean:.1f}%)")
+        
+        server = start_in_background(
+            tokens=60, tokens_per_second=args.tokens_per_second, first_token_ms=args.first_token_ms,
+            responder=grade_reply
+        )
+        agent = MentorAgent(use_cache=False, connect_daemon=False)
+        agent.config.update(ai_provider="ollama", ollama_host=server.url)
+        agent.metrics.enabled = False
+        agent.router = ProviderRouter([OllamaProvider(agent.model_name(), server.url)])
+        
+        print(f"\nAI grading of written answers ({args.first_token_ms:g} ms mock latency per request)")
+        baseline = None
+        for concurrency in (int(value) for value in args.concurrency.split(",")):
+            start = time.perf_counter()
+            results = grade_submissions(assessment, directory, complete=agent.grade_answers,
+                                        concurrency=concurrency)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            ai_graded = sum(
+                any(item["graded_by"] == "ai" for item in result["questions"].values()) for result in results
+            )
+            print(f"  concurrency {concurrency:>3}: {elapsed:>7.2f} s  {args.submissions / elapsed:>7.1f} "
+                  f"submissions/s  {baseline / elapsed:>5.1f}x  ({ai_graded} graded by AI)")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Cohort report benchmark.
+
+Generates a directory of synthetic learner progress files and times loading
+them into arrays, computing the cohort analysis and writing the report.
+
+Usage:
+    python benchmarks/cohort_report_benchmark.py --learners 10000
+    python benchmarks/cohort_report_benchmark.py --learners 2000 --workers 1 --keep /tmp/cohort
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from achievements import AchievementEngine
+from cohort_report import load_cohort, analyze, write_report
+from progress_model import Progress, CompletedDay, AssessmentResult, encode
+
+
+def random_progress(rng: random.Random, engine: AchievementEngine) -> Progress:
+    """Build a plausible progress document for a learner somewhere in the bootcamp."""
+    days_completed = min(40, int(rng.expovariate(1 / 12)))
+    start = date.today() - timedelta(days=days_completed + rng.randint(0, 20))
+    progress = Progress(
+        started=True,
+        user_name=f"Learner {rng.randint(1, 10 ** 6)}",
+        start_date=str(start),
+        current_week=days_completed // 5 + 1 if days_completed < 40 else 8,
+        current_day=days_completed % 5 + 1,
+        days_completed=days_completed,
+        streak=min(days_completed, int(rng.expovariate(1 / 4))),
+        last_activity_date=str(date.today() - timedelta(days=rng.randint(0, 14))),
+        completed_days={
+            (i // 5 + 1, i % 5 + 1): CompletedDay(str(start + timedelta(days=i)), 6.0)
+            for i in range(days_completed)
+        },
+        total_hours=days_completed * 6.0,
+    )
+    for week in range(1, days_completed // 5 + 1):
+        score = min(100, max(0, rng.gauss(78, 12)))
+        progress.assessment_scores[week] = AssessmentResult(score, str(start), score >= 70)
+        if score >= 70:
+            progress.completed_weeks.add(week)
+            engine.update_skills(progress, week, score)
+    engine.award_badges(progress)
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--learners", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--keep", type=Path, help="Write the progress files here and keep them")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        directory = args.keep or Path(workdir) / "progress"
+        directory.mkdir(parents=True, exist_ok=True)
+        rng = random.Random(42)
+        engine = AchievementEngine()
+        for i in range(args.learners):
+            learner_dir = directory / f"learner{i:05d}"
+            learner_dir.mkdir(exist_ok=True)
+            with open(learner_dir / "user_progress.json", 'wb') as f:
+                f.write(encode(random_progress(rng, engine)))
+        
+        start = time.perf_counter()
+        cohort = load_cohort(directory, workers=args.workers)
+        loaded = time.perf_counter()
+        analysis = analyze(cohort)
+        analyzed = time.perf_counter()
+        written = write_report(cohort, analysis, Path(workdir) / "report", formats=("md", "csv", "parquet"))
+        done = time.perf_counter()
+    
+    print(f"{cohort.size} learners")
+    print(f"load     {(loaded - start) * 1000:8.1f} ms")
+    print(f"analyze  {(analyzed - loaded) * 1000:8.1f} ms")
+    print(f"write    {(done - analyzed) * 1000:8.1f} ms ({len(written)} files)")
+    print(f"total    {(done - start) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Hot path benchmark for ProgressTracker and CLI cold starts.
+
+Seeds synthetic progress documents of growing size (thousands of notes,
+completed days and portfolio projects) and times the tracker operations every
+command goes through, then times cold starts of the Typer commands against
+the bundled mock Ollama server. Results are compared with the stored baseline
+and the run fails if any measurement regressed past the threshold.
+
+Usage:
+    python benchmarks/hot_path_benchmark.py
+    python benchmarks/hot_path_benchmark.py --sizes 100,1000 --skip-startup
+    python benchmarks/hot_path_benchmark.py --save-baseline
+"""
+
+import argparse
+import copy
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional
+
+import yaml
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCHMARK_DIR.parent
+
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(BENCHMARK_DIR))
+
+from mock_ollama_server import start_in_background
+from progress_model import Progress, CompletedDay, Note, AssessmentResult, PortfolioProject
+from progress_tracker import ProgressTracker
+
+# Command line, stdin
+COMMANDS = {
+    "--help": (["--help"], ""),
+    "progress": (["progress"], ""),
+    "stats": (["stats"], ""),
+    "search": (["search", "file permissions"], ""),
+    "resources": (["resources", "--topic", "docker"], ""),
+    "assess": (["assess", "--week", "1"], "n\n"),
+    "ask": (["ask", "How do file permissions work?", "--no-cache"], ""),
+    "standup": (["standup", "--no-cache"], "Linux basics\nNetworking\nNone\n"),
+}
+
+# Measurements faster than this are compared loosely: a few microseconds of
+# scheduler noise shouldn't read as a 50% regression
+NOISE_FLOOR_MS = 1.0
+
+
+def synthetic_progress(size: int) -> Progress:
+    """Build a progress document with `size` completed days and notes."""
+    start = date.today() - timedelta(days=size)
+    completed_days = {}
+    notes = {}
+    for i in range(size):
+        key = (i // 5 + 1, i % 5 + 1)
+        completed_days[key] = CompletedDay(str(start + timedelta(days=i)), 6.0)
+        notes[key] = Note(
+            f"Day {i + 1}: practiced permissions, pipes and systemd units. " * 3, str(start + timedelta(days=i))
+        )
+    weeks = min(size // 5, 8)
+    return Progress(
+        started=True,
+        user_name="Benchmark Learner",
+        start_date=str(start),
+        current_week=min(size // 5 + 1, 8),
+        current_day=size % 5 + 1,
+        days_completed=size,
+        streak=1,
+        last_activity_date=str(date.today() - timedelta(days=1)),
+        completed_weeks=set(range(1, weeks + 1)),
+        completed_days=completed_days,
+        assessment_scores={week: AssessmentResult(85, str(start), True) for week in range(1, weeks + 1)},
+        skills={"Linux": 17.0, "Command Line": 17.0, "Networking": 17.0, "Docker": 17.0},
+        badges=["First Step"],
+        portfolio_projects=[
+            PortfolioProject(
+                f"Project {i}",
+                "Deploy a containerized service with Terraform and a CI pipeline",
+                ["Docker", "Terraform", "GitHub Actions"],
+                f"https://example.com/learner/project-{i}",
+                str(start)
+            )
+            for i in range(size // 10)
+        ],
+        total_hours=size * 6.0,
+        notes=notes,
+    )
+
+
+def time_operation(operation: Callable[[int], Any], repeat: int) -> float:
+    """Run `operation(i)` `repeat` times and return the median in ms."""
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        operation(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_tracker(backend: str, size: int, repeat: int) -> Dict[str, float]:
+    """Time tracker operations against a seeded document of `size` days."""
+    with tempfile.TemporaryDirectory() as workdir:
+        tracker = ProgressTracker(
+            progress_file=str(Path(workdir) / "user_progress.json"),
+            backend=backend,
+            db_file=str(Path(workdir) / "cohort.sqlite"),
+            learner_id="benchmark"
+        )
+        seed = synthetic_progress(size)
+        tracker._save_progress(seed)
+        
+        def get_progress_cold(i):
+            tracker._invalidate_cache()
+            tracker.get_progress()
+        
+        # Week numbers past the seeded ones keep every write a new key
+        results = {
+            "complete_day": time_operation(lambda i: tracker.complete_day(1000 + i, 1), repeat),
+            "add_note": time_operation(lambda i: tracker.add_note(1000 + i, 1, "Benchmark note"), repeat),
+            "get_progress": time_operation(get_progress_cold, repeat),
+            "get_progress_cached": time_operation(lambda i: tracker.get_progress(), repeat),
+            "export_progress_report": time_operation(lambda i: tracker.export_progress_report(), repeat),
+        }
+        documents = [copy.deepcopy(seed) for _ in range(repeat)]
+        results["check_badges"] = time_operation(
+            lambda i: tracker.achievements.award_badges(documents[i], ["days_completed", "streak"]), repeat
+        )
+        return results
+
+
+def write_mock_config(workdir: Path, host: str) -> Path:
+    """Write a config.yaml that points the CLI at the mock server."""
+    with open(REPO_DIR / "config.yaml", 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    config.update(ai_provider="ollama", ollama_host=host)
+    config["providers"] = dict(config.get("providers", {}), fallback=[])
+    config["daemon"] = dict(config.get("daemon", {}), enabled=False)
+    config["metrics"] = dict(config.get("metrics", {}), enabled=False)
+    config_file = workdir / "config.yaml"
+    with open(config_file, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f)
+    return config_file
+
+
+def bench_startup(runs: int) -> Dict[str, float]:
+    """Time cold starts of each command in a fresh process."""
+    server = start_in_background(tokens=50, first_token_ms=0)
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ, MENTOR_CONFIG=str(write_mock_config(Path(workdir), server.url)))
+        env.pop("OLLAMA_HOST", None)
+        for name, (args, stdin) in COMMANDS.items():
+            samples = []
+            # The first run builds the curriculum and search caches in the work
+            # directory; later runs measure a warm disk but a cold process
+            for _ in range(runs + 1):
+                start = time.perf_counter()
+                result = subprocess.run(
+                    [sys.executable, str(REPO_DIR / "mentor_agent.py"), *args],
+                    input=stdin, capture_output=True, text=True, cwd=workdir, env=env
+                )
+                samples.append((time.perf_counter() - start) * 1000)
+                if result.returncode != 0:
+                    raise RuntimeError(f"{name} failed:\n{result.stderr[-2000:]}")
+            results[name] = statistics.median(samples[1:])
+    server.shutdown()
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """List measurements that regressed more than `threshold` over the baseline."""
+    failures = []
+    for key, value in results.items():
+        expected = baseline.get(key)
+        if expected is None:
+            continue
+        limit = max(expected * (1 + threshold), expected + NOISE_FLOOR_MS)
+        if value > limit:
+            failures.append(f"{key}: {value:.2f} ms > {limit:.2f} ms (baseline {expected:.2f} ms)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", type=Path, default=BENCHMARK_DIR / "hot_path_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Allowed slowdown as a fraction (default from the baseline file)")
+    parser.add_argument("--backends", default="eventlog,json,sqlite")
+    parser.add_argument("--sizes", default="100,1000,5000", help="Completed days and notes per document")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per tracker operation")
+    parser.add_argument("--rounds", type=int, default=3, help="Tracker rounds per backend and size")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts per command")
+    parser.add_argument("--skip-startup", action="store_true", help="Only benchmark the tracker")
+    args = parser.parse_args()
+    
+    baseline: Dict[str, Any] = {}
+    if args.baseline.exists():
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    threshold = args.threshold if args.threshold is not None else baseline.get("threshold", 0.5)
+    expected: Dict[str, float] = baseline.get("results", {})
+    
+    results: Dict[str, float] = {}
+    best: Dict[str, float] = {}
+    print(f"{'measurement':<44} {'ms':>10} {'baseline':>10}")
+    
+    def report(key: str, value: float):
+        results[key] = value
+        previous: Optional[float] = expected.get(key)
+        print(f"{key:<44} {value:>10.3f} {f'{previous:.3f}' if previous is not None else '-':>10}")
+    
+    for backend in args.backends.split(","):
+        for size in (int(size) for size in args.sizes.split(",")):
+            # Disk-bound timings drift between runs on a busy machine. The
+            # baseline stores the typical round, but a regression has to show
+            # up even in the fastest one
+            rounds = [bench_tracker(backend, size, args.repeat) for _ in range(args.rounds)]
+            for operation in rounds[0]:
+                samples = [result[operation] for result in rounds]
+                report(f"tracker/{backend}/{size}/{operation}", statistics.median(samples))
+                best[f"tracker/{backend}/{size}/{operation}"] = min(samples)
+    
+    if not args.skip_startup:
+        for command, value in bench_startup(args.runs).items():
+            report(f"startup/{command}", value)
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({"threshold": threshold, "results": {key: round(value, 3) for key, value in results.items()}},
+                      f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+        return
+    
+    if not expected:
+        print("No baseline yet; run with --save-baseline to store one.")
+        return
+    
+    failures = compare(dict(results, **best), expected, threshold)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Stand-in Ollama server for offline benchmarking.
+
+Answers /api/chat (streaming and non-streaming) and /api/tags with
+deterministic canned tokens, at a configurable first-token delay and token
+rate. Connections are kept alive like the real server. Benchmarks that need
+replies with specific content (e.g. JSON grades) pass a `responder`.
+
+It also simulates a provider prompt cache: every message boundary of a
+request is remembered, a later request starting with the same messages only
+pays prompt processing time (--prefill-tokens-per-second) for the rest, and
+the final reply reports the reused part as `cached_tokens`.
+
+Usage:
+    python benchmarks/mock_ollama_server.py --port 11434 --tokens 200 --tokens-per-second 50
+    python benchmarks/mock_ollama_server.py --prefill-tokens-per-second 2000 --no-prompt-cache
+    # then set ai_provider: "ollama" in config.yaml (or OLLAMA_HOST=http://127.0.0.1:11434)
+"""
+
+import argparse
+import hashlib
+import json
+import socket
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+CANNED_TEXT = (
+    "Great question! In Linux every file has an owner, a group and permission bits "
+    "for the user, the group and everyone else. Run `ls -l` to see them, `chmod 640 file` "
+    "to change them and `chown user:group file` to change ownership. "
+)
+
+
+def canned_tokens(count: int) -> List[str]:
+    """Build `count` deterministic tokens from the canned text."""
+    words = CANNED_TEXT.split(" ")
+    return [words[i % len(words)] + " " for i in range(count)]
+
+
+class MockOllamaHandler(BaseHTTPRequestHandler):
+    """Implements the parts of the Ollama API the mentor uses."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def setup(self):
+        super().setup()
+        # Streamed tokens are tiny writes; don't let Nagle hold them back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def _send_json(self, status: int, data: Dict[str, Any]):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+    
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": self.server.model}]})
+        else:
+            self._send_json(404, {"error": "not found"})
+    
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length))
+        except ValueError:
+            self._send_json(400, {"error": "invalid JSON"})
+            return
+        if self.path != "/api/chat":
+            self._send_json(404, {"error": "not found"})
+            return
+        
+        with self.server.stats_lock:
+            self.server.requests += 1
+        options = request.get("options", {})
+        count = min(self.server.tokens, options.get("num_predict") or self.server.tokens)
+        if self.server.responder:
+            tokens = [self.server.responder(request.get("messages", []))]
+        else:
+            tokens = canned_tokens(count)
+        prompt_tokens, cached_tokens = self.server.lookup_prefix(request.get("messages", []))
+        start = time.perf_counter()
+        time.sleep(self.server.first_token_delay + (prompt_tokens - cached_tokens) * self.server.prefill_interval)
+        
+        final = {
+            "model": request.get("model", self.server.model),
+            "done": True,
+            "done_reason": "stop",
+            "prompt_eval_count": prompt_tokens,
+            "eval_count": count,
+            "cached_tokens": cached_tokens,
+        }
+        
+        if not request.get("stream", True):
+            time.sleep(count * self.server.token_interval)
+            final["total_duration"] = int((time.perf_counter() - start) * 1e9)
+            self._send_json(200, dict(final, message={"role": "assistant", "content": "".join(tokens)}))
+            return
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self.server.token_interval)
+            line = {"model": final["model"], "message": {"role": "assistant", "content": token}, "done": False}
+            self._write_chunk(json.dumps(line).encode('utf-8') + b"\n")
+        final["total_duration"] = int((time.perf_counter() - start) * 1e9)
+        self._write_chunk(json.dumps(dict(final, message={"role": "assistant", "content": ""})).encode('utf-8') + b"\n")
+        self._write_chunk(b"")
+
+
+class MockOllamaServer(ThreadingHTTPServer):
+    """Threaded mock server holding the response settings."""
+    
+    daemon_threads = True
+    # Benchmarks open hundreds of connections at once; the default backlog of 5 drops them
+    request_queue_size = 1024
+    
+    def __init__(self, address, tokens: int = 200, tokens_per_second: float = 0,
+                 first_token_ms: float = 0, model: str = "llama2", verbose: bool = False,
+                 prefill_tokens_per_second: float = 0, prompt_cache: bool = True, cache_entries: int = 1024,
+                 responder: Optional[Callable[[List[Dict[str, str]]], str]] = None):
+        super().__init__(address, MockOllamaHandler)
+        self.tokens = tokens
+        self.token_interval = 1 / tokens_per_second if tokens_per_second else 0
+        self.first_token_delay = first_token_ms / 1000
+        self.prefill_interval = 1 / prefill_tokens_per_second if prefill_tokens_per_second else 0
+        self.model = model
+        self.verbose = verbose
+        self.requests = 0
+        self.stats_lock = threading.Lock()
+        self.prompt_cache = prompt_cache
+        self.cache_entries = cache_entries
+        # Builds the whole reply from the request messages instead of canned tokens
+        self.responder = responder
+        self._prefixes: "OrderedDict[str, int]" = OrderedDict()
+    
+    def lookup_prefix(self, messages: List[Dict[str, str]]) -> Tuple[int, int]:
+        """Get the prompt's token count and how much of it is a cached prefix.
+
+        Every message boundary except the last becomes a cached prefix for
+        later requests, like a cache breakpoint on the conversation so far.
+        """
+        digest = hashlib.sha256()
+        boundaries = []
+        total = 0
+        for message in messages:
+            content = message.get("content", "")
+            digest.update(json.dumps([message.get("role"), content]).encode('utf-8'))
+            total += len(content) // 4
+            boundaries.append((digest.hexdigest(), total))
+        if not self.prompt_cache:
+            return total, 0
+        
+        cached = 0
+        with self.stats_lock:
+            for key, tokens in boundaries:
+                if key in self._prefixes:
+                    self._prefixes.move_to_end(key)
+                    cached = tokens
+            for key, tokens in boundaries[:-1]:
+                self._prefixes[key] = tokens
+            while len(self._prefixes) > self.cache_entries:
+                self._prefixes.popitem(last=False)
+        return total, cached
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_in_background(**settings) -> MockOllamaServer:
+    """Start a mock server on a free local port in a daemon thread."""
+    server = MockOllamaServer(("127.0.0.1", 0), **settings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--tokens", type=int, default=200, help="Tokens per response")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="0 sends tokens as fast as possible")
+    parser.add_argument("--first-token-ms", type=float, default=200, help="Delay before the first token")
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=0,
+                        help="Prompt processing speed for uncached tokens (0 makes prompts free)")
+    parser.add_argument("--no-prompt-cache", action="store_true", help="Process every prompt in full")
+    parser.add_argument("--model", default="llama2")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    
+    server = MockOllamaServer(
+        (args.host, args.port),
+        tokens=args.tokens,
+        tokens_per_second=args.tokens_per_second,
+        first_token_ms=args.first_token_ms,
+        prefill_tokens_per_second=args.prefill_tokens_per_second,
+        prompt_cache=not args.no_prompt_cache,
+        model=args.model,
+        verbose=args.verbose
+    )
+    print(f"Mock Ollama server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
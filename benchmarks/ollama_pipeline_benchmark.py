@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency and throughput benchmark for the mentor pipeline.
+
+Runs questions through MentorAgent (retrieval, prompt building and streaming)
+against the bundled mock Ollama server, so no API calls are made. Pass
+--host to benchmark a real Ollama instance instead.
+
+Usage:
+    python benchmarks/ollama_pipeline_benchmark.py --requests 50 --concurrency 4
+    python benchmarks/ollama_pipeline_benchmark.py --compare-keepalive --tokens-per-second 0
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mentor_agent import MentorAgent, ASK_SYSTEM_PROMPT
+from metrics import percentile
+from mock_ollama_server import start_in_background
+from ollama_client import OllamaClient
+from providers import OllamaProvider, ProviderRouter
+
+QUESTIONS = [
+    "How do file permissions work in Linux?",
+    "What does chmod 755 mean?",
+    "How do I find large files on disk?",
+    "What is the difference between a process and a thread?",
+    "How do I read logs with journalctl?",
+]
+
+
+def _timed_request(agent: MentorAgent, question: str) -> Dict[str, Any]:
+    """Run one question through the pipeline and time it."""
+    start = time.perf_counter()
+    prompt = agent.grounded_prompt(question, 1, 2)
+    first_token = None
+    chunks = 0
+    for _ in agent.stream_ai_response(prompt, ASK_SYSTEM_PROMPT, use_cache=False):
+        if first_token is None:
+            first_token = time.perf_counter() - start
+        chunks += 1
+    return {"first_token": first_token or 0.0, "total": time.perf_counter() - start, "chunks": chunks}
+
+
+def run(host: str, requests: int, concurrency: int, keepalive: bool) -> Dict[str, Any]:
+    """Benchmark one configuration and return its summary."""
+    agent = MentorAgent(use_cache=False, connect_daemon=False)
+    agent.config.update(ai_provider="ollama", ollama_host=host, stream_responses=True)
+    provider = OllamaProvider(agent.model_name(), host)
+    provider.client = OllamaClient(host, max_idle=concurrency if keepalive else 0)
+    agent.router = ProviderRouter([provider])
+    # Build the indexes before timing starts
+    agent.grounded_prompt(QUESTIONS[0], 1, 2)
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(
+            lambda i: _timed_request(agent, QUESTIONS[i % len(QUESTIONS)]), range(requests)
+        ))
+    elapsed = time.perf_counter() - start
+    provider.client.close()
+    
+    first_tokens = [result["first_token"] * 1000 for result in results]
+    totals = [result["total"] * 1000 for result in results]
+    return {
+        "keepalive": keepalive,
+        "ttft_p50": statistics.median(first_tokens),
+        "ttft_p95": percentile(first_tokens, 0.95),
+        "total_p50": statistics.median(totals),
+        "total_p95": percentile(totals, 0.95),
+        "requests_per_second": requests / elapsed,
+        "tokens_per_second": sum(result["chunks"] for result in results) / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", help="Benchmark a running Ollama server instead of the mock")
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--tokens", type=int, default=100, help="Mock: tokens per response")
+    parser.add_argument("--tokens-per-second", type=float, default=200, help="Mock: 0 for unthrottled")
+    parser.add_argument("--first-token-ms", type=float, default=50, help="Mock: delay before the first token")
+    parser.add_argument("--compare-keepalive", action="store_true", help="Also run with a new connection per request")
+    args = parser.parse_args()
+    
+    host = args.host
+    if not host:
+        server = start_in_background(
+            tokens=args.tokens, tokens_per_second=args.tokens_per_second, first_token_ms=args.first_token_ms
+        )
+        host = server.url
+    
+    modes = [True, False] if args.compare_keepalive else [True]
+    print(f"{args.requests} requests, concurrency {args.concurrency}, server {host}")
+    print(f"{'connections':<12} {'ttft p50':>9} {'ttft p95':>9} {'total p50':>10} {'total p95':>10} "
+          f"{'req/s':>7} {'tok/s':>8}")
+    for keepalive in modes:
+        summary = run(host, args.requests, args.concurrency, keepalive)
+        print(f"{'keep-alive' if keepalive else 'per request':<12} "
+              f"{summary['ttft_p50']:>7.1f}ms {summary['ttft_p95']:>7.1f}ms "
+              f"{summary['total_p50']:>8.1f}ms {summary['total_p95']:>8.1f}ms "
+              f"{summary['requests_per_second']:>7.1f} {summary['tokens_per_second']:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Progress codec benchmark.
+
+Compares the original progress format (indented JSON, dicts keyed by strings
+like "week1_day3") with the typed model in its compact schema, for documents
+with growing numbers of completed days and notes: encode and decode time,
+size on disk and the memory the loaded document holds. The compact schema is
+measured with orjson when it's installed and with the json module fallback.
+
+Usage:
+    python benchmarks/progress_codec_benchmark.py
+    python benchmarks/progress_codec_benchmark.py --sizes 1000,20000 --repeat 5
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import progress_model
+from hot_path_benchmark import synthetic_progress
+from progress_model import decode, encode
+
+
+def median_ms(operation: Callable[[], Any], repeat: int) -> float:
+    """Run `operation` `repeat` times and return the median in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def retained_kb(load: Callable[[], Any]) -> float:
+    """Memory held by the object `load` returns, in KiB."""
+    gc.collect()
+    tracemalloc.start()
+    document = load()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del document
+    return retained / 1024
+
+
+def measure(size: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Measure each format for a document with `size` days and notes."""
+    progress = synthetic_progress(size)
+    legacy = progress.to_dict()
+    legacy_data = json.dumps(legacy, indent=2).encode('utf-8')
+    
+    formats = {
+        "schema 1 (json, indent=2)": (
+            lambda: json.dumps(legacy, indent=2).encode('utf-8'),
+            lambda: json.loads(legacy_data),
+            legacy_data
+        ),
+    }
+    codecs = [("orjson", progress_model.orjson)] if progress_model.orjson else []
+    codecs.append(("json", None))
+    
+    results = {}
+    for name, (save, load, data) in formats.items():
+        results[name] = {
+            "encode_ms": median_ms(save, repeat),
+            "decode_ms": median_ms(load, repeat),
+            "bytes": len(data),
+            "memory_kb": retained_kb(load),
+        }
+    
+    saved = progress_model.orjson
+    try:
+        for codec, module in codecs:
+            progress_model.orjson = module
+            data = encode(progress)
+            results[f"schema 2 ({codec})"] = {
+                "encode_ms": median_ms(lambda: encode(progress), repeat),
+                "decode_ms": median_ms(lambda: decode(data), repeat),
+                "bytes": len(data),
+                "memory_kb": retained_kb(lambda: decode(data)),
+            }
+        # What a learner pays once, the first time an old file is loaded
+        results["schema 1 -> 2 migration"] = {
+            "encode_ms": float("nan"),
+            "decode_ms": median_ms(lambda: decode(legacy_data), repeat),
+            "bytes": len(legacy_data),
+            "memory_kb": retained_kb(lambda: decode(legacy_data)),
+        }
+    finally:
+        progress_model.orjson = saved
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,5000,20000", help="Completed days and notes per document")
+    parser.add_argument("--repeat", type=int, default=9, help="Timed runs per measurement")
+    args = parser.parse_args()
+    
+    print(f"{'size':>6} {'format':<28} {'encode':>10} {'decode':>10} {'size':>10} {'memory':>10}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        for name, result in measure(size, args.repeat).items():
+            print(f"{size:>6} {name:<28} {result['encode_ms']:>8.2f}ms {result['decode_ms']:>8.2f}ms "
+                  f"{result['bytes'] / 1024:>8.0f}KB {result['memory_kb']:>8.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
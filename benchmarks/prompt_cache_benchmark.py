@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Prompt cache benchmark for multi-turn sessions.
+
+Replays an interactive session (the session system prompt, a growing
+conversation history and retrieved excerpts for each question) against the
+bundled mock Ollama server, which simulates a provider prompt cache and
+charges prompt processing time for uncached tokens. Prints time to first
+token and cached prompt tokens per turn, for the mentor's layout (excerpts
+in the final message) and for excerpts in the system prompt, which changes
+the prefix on every turn.
+
+Usage:
+    python benchmarks/prompt_cache_benchmark.py --turns 8
+    python benchmarks/prompt_cache_benchmark.py --prefill-tokens-per-second 500
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Any, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mentor_agent import MentorAgent, SESSION_SYSTEM_PROMPT
+from mock_ollama_server import start_in_background
+from providers import OllamaProvider, ProviderRouter
+
+QUESTIONS = [
+    "How do file permissions work in Linux?",
+    "What does chmod 755 mean?",
+    "How do I find large files on disk?",
+    "What is the difference between a process and a thread?",
+    "How do I read logs with journalctl?",
+    "How do I make a systemd service start on boot?",
+    "What is a symbolic link?",
+    "How do pipes and redirection work?",
+]
+
+
+def run_session(agent: MentorAgent, turns: int, excerpts_in_system: bool) -> List[Dict[str, Any]]:
+    """Ask `turns` questions in one conversation and return each call's metrics."""
+    system_prompt = SESSION_SYSTEM_PROMPT.format(week=1, day=2)
+    history: List[Dict[str, str]] = []
+    results = []
+    for i in range(turns):
+        question = QUESTIONS[i % len(QUESTIONS)]
+        grounded = agent.grounded_prompt(question, 1, 2)
+        if excerpts_in_system:
+            prompt, system = question, f"{system_prompt}\n\n{grounded}"
+        else:
+            prompt, system = grounded, system_prompt
+        metrics: Dict[str, Any] = {}
+        answer = agent.get_ai_response(prompt, system, use_cache=False, history=history, metrics=metrics)
+        history += [{"role": "user", "content": question}, {"role": "assistant", "content": answer}]
+        results.append(metrics)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=8)
+    parser.add_argument("--tokens", type=int, default=150, help="Mock: tokens per answer")
+    parser.add_argument("--first-token-ms", type=float, default=20, help="Mock: fixed delay before the first token")
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=1000,
+                        help="Mock: prompt processing speed for uncached tokens")
+    args = parser.parse_args()
+    
+    server = start_in_background(
+        tokens=args.tokens, tokens_per_second=0, first_token_ms=args.first_token_ms,
+        prefill_tokens_per_second=args.prefill_tokens_per_second
+    )
+    agent = MentorAgent(use_cache=False, connect_daemon=False)
+    agent.config.update(ai_provider="ollama", ollama_host=server.url)
+    agent.metrics.enabled = False
+    agent.router = ProviderRouter([OllamaProvider(agent.model_name(), server.url)])
+    # Build the indexes before timing starts
+    agent.grounded_prompt(QUESTIONS[0], 1, 2)
+    
+    layouts = (("excerpts in message", False), ("excerpts in system", True))
+    for name, excerpts_in_system in layouts:
+        results = run_session(agent, args.turns, excerpts_in_system)
+        print(f"\n{name}")
+        print(f"{'turn':>4} {'prompt':>8} {'cached':>8} {'ttft':>9}")
+        for turn, metrics in enumerate(results, 1):
+            print(f"{turn:>4} {metrics['prompt_tokens']:>8} {metrics['cached_tokens']:>8} "
+                  f"{metrics['first_token_ms']:>7.1f}ms")
+        prompt_tokens = sum(metrics['prompt_tokens'] for metrics in results)
+        cached_tokens = sum(metrics['cached_tokens'] for metrics in results)
+        ttft = sum(metrics['first_token_ms'] for metrics in results) / len(results)
+        print(f"{'all':>4} {prompt_tokens:>8} {cached_tokens:>8} {ttft:>7.1f}ms "
+              f"({cached_tokens / prompt_tokens:.0%} of prompt tokens cached)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
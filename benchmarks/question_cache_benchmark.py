@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Question cache benchmark.
+
+Asks pairs of questions that should share an answer (rewordings) and pairs
+that shouldn't (different questions on the same topic), and reports how many
+of each the question cache matches at several thresholds. Then fills an index
+with synthetic questions and times lookups and loading the saved index.
+
+Usage:
+    python benchmarks/question_cache_benchmark.py
+    python benchmarks/question_cache_benchmark.py --entries 5000 --thresholds 0.6,0.7,0.8
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from question_cache import QuestionCache
+
+REWORDINGS = [
+    ("What is an inode?", "explain inodes"),
+    ("What is a symbolic link?", "Explain symbolic links"),
+    ("What's a process?", "what are processes"),
+    ("What is a VPC?", "explain VPCs please"),
+    ("What is a load balancer?", "Can you explain load balancers?"),
+    ("What is the difference between a process and a thread?", "difference between threads and processes"),
+    ("How do I check disk usage?", "how to check disk usage"),
+    ("What does chmod 755 mean?", "chmod 755 meaning"),
+    ("What is terraform state?", "explain terraform state files"),
+    ("What is a Kubernetes pod?", "explain kubernetes pods"),
+    ("How do I write a Dockerfile?", "how to write dockerfiles"),
+    ("What is a systemd unit?", "describe systemd units"),
+]
+
+DIFFERENT = [
+    ("What does chmod 755 mean?", "What does chmod 644 mean?"),
+    ("How do I create an S3 bucket?", "How do I delete an S3 bucket?"),
+    ("What is Docker?", "What is Kubernetes?"),
+    ("How do pipes work?", "How does redirection work?"),
+    ("What is a load balancer?", "What is a network load balancer?"),
+    ("How do I list docker containers?", "How do I list docker images?"),
+    ("What is a public subnet?", "What is a private subnet?"),
+    ("What is IAM?", "What is a VPC?"),
+    ("How do I install nginx on Ubuntu?", "How do I uninstall nginx on Ubuntu?"),
+    ("Why is my EC2 instance not reachable?", "Why is my EC2 instance reachable?"),
+]
+
+TOPICS = ["linux", "docker", "kubernetes", "terraform", "aws", "networking", "git", "ci", "python", "bash"]
+NOUNS = ["volume", "service", "deployment", "module", "bucket", "subnet", "branch", "pipeline", "process",
+         "socket", "namespace", "secret", "role", "policy", "image", "registry", "cron job", "variable"]
+VERBS = ["create", "debug", "delete", "configure", "monitor", "secure", "scale", "back up", "inspect", "rotate"]
+
+
+def match_rates(threshold: float):
+    """Count matched rewordings and matched different questions at a threshold."""
+    matched = {"rewordings": 0, "different": 0}
+    for name, pairs in (("rewordings", REWORDINGS), ("different", DIFFERENT)):
+        for first, second in pairs:
+            cache = QuestionCache(None, threshold=threshold)
+            cache.add(first, "answer")
+            if cache.lookup(second):
+                matched[name] += 1
+    return matched
+
+
+def synthetic_questions(count: int, seed: int = 7):
+    """Generate distinct questions about the bootcamp topics."""
+    generator = random.Random(seed)
+    questions = set()
+    while len(questions) < count:
+        questions.add(f"How do I {generator.choice(VERBS)} a {generator.choice(TOPICS)} "
+                      f"{generator.choice(NOUNS)} {generator.randrange(1000)}?")
+    return sorted(questions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--thresholds", default="0.5,0.6,0.7,0.8,0.9")
+    parser.add_argument("--entries", type=int, default=2000, help="Questions in the timed index")
+    parser.add_argument("--answer-chars", type=int, default=1500, help="Length of each stored answer")
+    args = parser.parse_args()
+    
+    print(f"{'threshold':>9} {'rewordings':>12} {'different':>10}")
+    for threshold in (float(value) for value in args.thresholds.split(",")):
+        matched = match_rates(threshold)
+        print(f"{threshold:>9.2f} {matched['rewordings']:>6} / {len(REWORDINGS):<3} "
+              f"{matched['different']:>4} / {len(DIFFERENT):<3}")
+    
+    questions = synthetic_questions(args.entries)
+    answer = "x" * args.answer_chars
+    with tempfile.TemporaryDirectory() as workdir:
+        index_file = Path(workdir) / "questions.json"
+        cache = QuestionCache(str(index_file), max_entries=args.entries)
+        start = time.perf_counter()
+        for question in questions:
+            cache.add(question, answer)
+        print(f"\nIndexed {args.entries} questions in {time.perf_counter() - start:.1f} s "
+              f"({index_file.stat().st_size / 1024 / 1024:.1f} MB on disk)")
+        
+        # Lookups without the save that follows a hit
+        cache.index_file = None
+        samples = []
+        for question in questions[:200]:
+            start = time.perf_counter()
+            cache.lookup(question.lower().replace("how do i", "how to"))
+            samples.append((time.perf_counter() - start) * 1000)
+        print(f"Lookup: median {statistics.median(samples):.2f} ms, max {max(samples):.2f} ms")
+        
+        samples = []
+        for _ in range(5):
+            start = time.perf_counter()
+            QuestionCache(str(index_file), max_entries=args.entries)
+            samples.append((time.perf_counter() - start) * 1000)
+        print(f"Load saved index: median {statistics.median(samples):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+CLI startup benchmark for mentor_agent.py.
+
+Runs commands that never talk to an AI provider under `python -X importtime`,
+measures total import time and wall-clock time, and fails if a command goes
+over the budget in startup_budget.json or imports a provider SDK.
+
+Usage:
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --runs 10
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Set, Tuple
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+MENTOR_AGENT = BENCHMARK_DIR.parent / "mentor_agent.py"
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Set[str]]:
+    """Get total import time in ms and the set of imported modules."""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = line.split("|")
+        modules.add(module.strip())
+        # Nested imports are indented and already counted in their parent
+        if not module.startswith("  "):
+            total_us += int(cumulative_us)
+    return total_us / 1000, modules
+
+
+def run_command(args: List[str], stdin: str, workdir: str) -> Tuple[float, float, Set[str]]:
+    """Run one command and return (wall ms, import ms, imported modules)."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(MENTOR_AGENT), *args],
+        input=stdin, capture_output=True, text=True, cwd=workdir
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr[-2000:]}")
+    import_ms, modules = parse_importtime(result.stderr)
+    return wall_ms, import_ms, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=Path, default=BENCHMARK_DIR / "startup_budget.json")
+    parser.add_argument("--runs", type=int, default=None)
+    args = parser.parse_args()
+    
+    with open(args.budget, 'r', encoding='utf-8') as f:
+        budget: Dict[str, Any] = json.load(f)
+    runs = args.runs or budget.get("runs", 5)
+    
+    failures = []
+    print(f"{'command':<12} {'import ms':>10} {'budget':>8} {'wall ms':>10} {'budget':>8}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for command, limits in budget["commands"].items():
+            samples = [run_command(command.split(), limits.get("input", ""), workdir) for _ in range(runs)]
+            wall_ms = statistics.median(sample[0] for sample in samples)
+            import_ms = statistics.median(sample[1] for sample in samples)
+            modules = set().union(*(sample[2] for sample in samples))
+            
+            print(f"{command:<12} {import_ms:>10.1f} {limits['import_ms']:>8} {wall_ms:>10.1f} {limits['wall_ms']:>8}")
+            
+            if import_ms > limits["import_ms"]:
+                failures.append(f"{command}: import time {import_ms:.1f} ms > {limits['import_ms']} ms")
+            if wall_ms > limits["wall_ms"]:
+                failures.append(f"{command}: wall time {wall_ms:.1f} ms > {limits['wall_ms']} ms")
+            # Typer's own help formatter renders with rich.markdown
+            for module in budget.get("forbidden_modules", []):
+                if module in modules and module not in limits.get("allowed_modules", []):
+                    failures.append(f"{command}: imports {module}")
+    
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Stress test for concurrent ProgressTracker writers.
+
+Spawns many processes that call complete_day and add_note against the same
+progress store at the same time, then checks that no update was lost.
+
+Usage:
+    python benchmarks/stress_progress_tracker.py --backend eventlog --workers 8 --iterations 50
+"""
+
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from progress_tracker import ProgressTracker
+
+
+def _make_tracker(backend: str, workdir: Path) -> ProgressTracker:
+    """Create a tracker pointing at the shared store."""
+    return ProgressTracker(
+        progress_file=str(workdir / "user_progress.json"),
+        backend=backend,
+        compact_every=25,
+        db_file=str(workdir / "cohort.sqlite"),
+        learner_id="stress",
+        max_retries=1000
+    )
+
+
+def _worker(backend: str, workdir: str, worker_id: int, iterations: int):
+    """Complete a distinct set of days and notes from one process."""
+    tracker = _make_tracker(backend, Path(workdir))
+    for i in range(iterations):
+        # Week numbers past the curriculum keep every worker's keys distinct
+        tracker.complete_day(100 + worker_id, i + 1, hours_spent=1.0)
+        tracker.add_note(100 + worker_id, i + 1, f"worker {worker_id} note {i}")
+
+
+def run(backend: str, workers: int, iterations: int) -> bool:
+    """Run the stress test and report whether all updates survived."""
+    with tempfile.TemporaryDirectory() as workdir:
+        tracker = _make_tracker(backend, Path(workdir))
+        tracker.initialize_progress("Stress Test")
+        
+        start = time.perf_counter()
+        processes = [
+            multiprocessing.Process(target=_worker, args=(backend, workdir, worker_id, iterations))
+            for worker_id in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+        
+        progress = _make_tracker(backend, Path(workdir)).get_progress()
+        expected = workers * iterations
+        checks = {
+            "completed_days": len(progress.completed_days),
+            "days_completed": progress.days_completed,
+            "notes": len(progress.notes),
+            "total_hours": progress.total_hours,
+        }
+        
+        print(f"{backend}: {workers} workers x {iterations} iterations in {elapsed:.2f}s "
+              f"({2 * expected / elapsed:.0f} writes/s)")
+        ok = True
+        for name, value in checks.items():
+            status = "ok" if value == expected else "LOST UPDATES"
+            ok = ok and value == expected
+            print(f"  {name}: {value} / {expected} {status}")
+        
+        if any(process.exitcode != 0 for process in processes):
+            print("  a worker process failed")
+            ok = False
+        return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["eventlog", "json", "sqlite", "all"], default="all")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=25)
+    args = parser.parse_args()
+    
+    backends = ["eventlog", "json", "sqlite"] if args.backend == "all" else [args.backend]
+    results = [run(backend, args.workers, args.iterations) for backend in backends]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
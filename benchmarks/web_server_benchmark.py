@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Web server benchmark.
+
+Drives the ASGI app in-process (no HTTP server needed) with growing numbers
+of simultaneous learners, each asking a question that streams from the
+bundled mock Ollama server, run in a process of its own so it doesn't
+compete with the server for the GIL. For every level it reports time to the first
+streamed event and to the end of the answer, the time the server added on
+top of the mock's own generation time, and the event loop's worst stall,
+measured by a timer that should fire every 10 ms.
+
+Usage:
+    python benchmarks/web_server_benchmark.py
+    python benchmarks/web_server_benchmark.py --learners 1,100,400 --tokens 200 --tokens-per-second 40
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from hot_path_benchmark import write_mock_config
+
+QUESTIONS = ["How do pipes work?", "What is an inode?", "How do I find large files?", "What does chmod do?"]
+
+
+async def ask(app, learner_id: str, question: str) -> Dict[str, float]:
+    """Ask one question and time the streamed answer."""
+    body = json.dumps({"question": question, "no_cache": True}).encode('utf-8')
+    request = [{"type": "http.request", "body": body, "more_body": False}]
+    times: Dict[str, float] = {}
+    start = time.perf_counter()
+    
+    async def receive():
+        if request:
+            return request.pop()
+        # The client stays connected until the answer ends
+        await asyncio.Event().wait()
+    
+    async def send(message):
+        if message.get("body") and "first_event_ms" not in times:
+            times["first_event_ms"] = (time.perf_counter() - start) * 1000
+    
+    await app({"type": "http", "method": "POST", "path": f"/learners/{learner_id}/ask", "headers": []},
+              receive, send)
+    times["total_ms"] = (time.perf_counter() - start) * 1000
+    return times
+
+
+async def loop_stall_ms(stop: asyncio.Event) -> float:
+    """Largest delay of a 10 ms timer while the event loop is busy."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        worst = max(worst, (time.perf_counter() - start) * 1000 - 10)
+    return worst
+
+
+async def run_level(app, learners: int) -> Dict[str, Any]:
+    """Have `learners` learners ask at the same moment."""
+    stop = asyncio.Event()
+    stall = asyncio.ensure_future(loop_stall_ms(stop))
+    start = time.perf_counter()
+    results: List[Dict[str, float]] = await asyncio.gather(*(
+        ask(app, f"learner{i:04d}", f"{QUESTIONS[i % len(QUESTIONS)]} ({i})") for i in range(learners)
+    ))
+    wall = time.perf_counter() - start
+    stop.set()
+    return {"results": results, "wall": wall, "stall_ms": await stall}
+
+
+def start_mock_server(args) -> subprocess.Popen:
+    """Start the mock Ollama server on a free port and return the process, with its URL as `url`."""
+    process = subprocess.Popen(
+        [sys.executable, "-u", str(Path(__file__).resolve().parent / "mock_ollama_server.py"), "--port", "0",
+         "--tokens", str(args.tokens), "--tokens-per-second", str(args.tokens_per_second),
+         "--first-token-ms", str(args.first_token_ms)],
+        stdout=subprocess.PIPE, text=True
+    )
+    # "Mock Ollama server listening on http://127.0.0.1:<port>"
+    process.url = process.stdout.readline().split()[-1]
+    return process
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--learners", default="1,50,200", help="Simultaneous learners per level")
+    parser.add_argument("--tokens", type=int, default=100, help="Mock: tokens per answer")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="Mock: generation speed")
+    parser.add_argument("--first-token-ms", type=float, default=300, help="Mock: delay before the first token")
+    args = parser.parse_args()
+    
+    server = start_mock_server(args)
+    generation_ms = args.first_token_ms + (args.tokens - 1) * 1000 / args.tokens_per_second
+    with tempfile.TemporaryDirectory() as workdir:
+        config_file = write_mock_config(Path(workdir), server.url)
+        config = yaml.safe_load(config_file.read_text(encoding='utf-8'))
+        config.update(progress_backend="sqlite", progress_db=str(Path(workdir) / "cohort.sqlite"))
+        config_file.write_text(yaml.safe_dump(config), encoding='utf-8')
+        os.environ["MENTOR_CONFIG"] = str(config_file)
+        os.environ.pop("OLLAMA_HOST", None)
+        os.chdir(workdir)
+        
+        from mentor_agent import MentorAgent, create_progress_tracker
+        from web_server import MentorWebApp
+        
+        app = MentorWebApp(
+            lambda: MentorAgent(connect_daemon=False, command="web"),
+            lambda learner_id: create_progress_tracker(dict(config, learner_id=learner_id)),
+            config.get('web', {})
+        )
+        
+        async def run():
+            await app.startup()
+            return [(learners, await run_level(app, learners))
+                    for learners in (int(value) for value in args.learners.split(","))]
+        
+        levels = asyncio.run(run())
+        app.shutdown()
+    server.terminate()
+    
+    print(f"Mock generation time per answer: {generation_ms:.0f} ms\n")
+    print(f"{'learners':>8} {'first p50':>10} {'first p95':>10} {'total p50':>10} {'total p95':>10} "
+          f"{'overhead p50':>13} {'loop stall':>11} {'answers/s':>10}")
+    for learners, level in levels:
+        first = [result["first_event_ms"] for result in level["results"]]
+        total = [result["total_ms"] for result in level["results"]]
+        print(f"{learners:>8} {statistics.median(first):>8.0f}ms {percentile(first, 0.95):>8.0f}ms "
+              f"{statistics.median(total):>8.0f}ms {percentile(total, 0.95):>8.0f}ms "
+              f"{statistics.median(total) - generation_ms:>11.0f}ms {level['stall_ms']:>9.1f}ms "
+              f"{learners / level['wall']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""
+Cohort Report for Cloud Engineer Bootcamp
+
+Loads a directory of learners' progress files into columnar NumPy arrays and
+computes completion funnels, streak distributions, assessment pass rates and
+skill averages for the whole cohort. Files are parsed in a process pool, and
+the report is written as Markdown plus CSV and, with pyarrow, Parquet.
+"""
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+
+from progress_storage import EventLogStorage
+
+# Lower edges of the streak buckets; the last bucket is open-ended
+STREAK_BUCKETS = [0, 1, 3, 7, 14, 30]
+SCALAR_FIELDS = ["current_week", "current_day", "days_completed", "streak", "total_hours"]
+
+
+def find_progress_files(directory: Path) -> List[Path]:
+    """Find progress documents under a directory, one per learner."""
+    return sorted(path for path in Path(directory).rglob("*.json") if path.is_file())
+
+
+def learner_id_for(path: Path, directory: Path) -> str:
+    """Name a learner after their file, or its folder for `<learner>/user_progress.json`."""
+    relative = path.relative_to(directory)
+    if path.stem == "user_progress" and len(relative.parts) > 1:
+        return relative.parent.as_posix()
+    return relative.with_suffix("").as_posix()
+
+
+def _parse_chunk(task) -> Dict[str, Any]:
+    """Parse progress files into flat column lists (runs in a worker process)."""
+    directory, paths, total_weeks, days_per_week = task
+    columns: Dict[str, Any] = {
+        "learner_id": [], "user_name": [], "started": [], "last_activity_date": [],
+        "day_rows": [], "day_slots": [],
+        "score_rows": [], "score_weeks": [], "score_values": [],
+        "skill_rows": [], "skill_names": [], "skill_values": [],
+        "errors": [],
+    }
+    for field in SCALAR_FIELDS:
+        columns[field] = []
+    
+    for path in paths:
+        try:
+            # Replays a sidecar event log if the learner used the eventlog backend
+            progress = EventLogStorage(path).load()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            columns["errors"].append((str(path), str(e)))
+            continue
+        
+        row = len(columns["learner_id"])
+        columns["learner_id"].append(learner_id_for(path, directory))
+        columns["user_name"].append(progress.user_name)
+        columns["started"].append(bool(progress.started))
+        columns["last_activity_date"].append(progress.last_activity_date)
+        for field in SCALAR_FIELDS:
+            columns[field].append(getattr(progress, field))
+        
+        for week, day in progress.completed_days:
+            if 1 <= week <= total_weeks and 1 <= day <= days_per_week:
+                columns["day_rows"].append(row)
+                columns["day_slots"].append((week - 1) * days_per_week + day - 1)
+        
+        for week, result in progress.assessment_scores.items():
+            if 1 <= week <= total_weeks:
+                columns["score_rows"].append(row)
+                columns["score_weeks"].append(week - 1)
+                columns["score_values"].append(float(result.score))
+        
+        for skill, level in progress.skills.items():
+            columns["skill_rows"].append(row)
+            columns["skill_names"].append(skill)
+            columns["skill_values"].append(float(level))
+    return columns
+
+
+class CohortData:
+    """Columnar view of a cohort: one row per learner."""
+    
+    def __init__(self, chunks: Sequence[Dict[str, Any]], total_weeks: int, days_per_week: int):
+        """Concatenate parsed chunks into arrays and matrices."""
+        self.total_weeks = total_weeks
+        self.days_per_week = days_per_week
+        self.errors = [error for chunk in chunks for error in chunk["errors"]]
+        
+        offsets = np.cumsum([0] + [len(chunk["learner_id"]) for chunk in chunks])
+        self.size = int(offsets[-1])
+        
+        def column(name, dtype, shift=False):
+            # `shift` turns chunk-local row numbers into cohort row numbers
+            parts = [
+                np.asarray(chunk[name], dtype=dtype) + offset if shift else np.asarray(chunk[name], dtype=dtype)
+                for chunk, offset in zip(chunks, offsets)
+            ]
+            return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+        
+        self.learner_id = column("learner_id", object)
+        self.user_name = column("user_name", object)
+        self.started = column("started", bool)
+        self.current_week = column("current_week", np.int32)
+        self.current_day = column("current_day", np.int32)
+        self.days_completed = column("days_completed", np.int32)
+        self.streak = column("streak", np.int32)
+        self.total_hours = column("total_hours", np.float64)
+        # Empty dates become NaT
+        self.last_activity = column("last_activity_date", object).astype("datetime64[D]")
+        
+        # learners x (weeks * days) completion matrix
+        self.completed_days = np.zeros((self.size, total_weeks * days_per_week), dtype=bool)
+        self.completed_days[column("day_rows", np.int64, shift=True), column("day_slots", np.int64)] = True
+        
+        # learners x weeks scores, NaN where the assessment wasn't taken
+        self.scores = np.full((self.size, total_weeks), np.nan)
+        self.scores[column("score_rows", np.int64, shift=True), column("score_weeks", np.int64)] = \
+            column("score_values", np.float64)
+        
+        # learners x skills levels, NaN where the learner has no level yet
+        self.skill_names, skill_columns = np.unique(column("skill_names", object).astype(str), return_inverse=True)
+        self.skills = np.full((self.size, len(self.skill_names)), np.nan)
+        self.skills[column("skill_rows", np.int64, shift=True), skill_columns] = column("skill_values", np.float64)
+
+
+def load_cohort(directory: Path, total_weeks: int = 8, days_per_week: int = 5,
+                workers: Optional[int] = None, chunk_size: int = 500) -> CohortData:
+    """Parse every progress file under `directory` into a CohortData.
+
+    Files are split into chunks parsed by a process pool; small cohorts are
+    parsed in-process, where starting workers would cost more than it saves.
+    """
+    directory = Path(directory)
+    paths = find_progress_files(directory)
+    tasks = [
+        (directory, paths[start:start + chunk_size], total_weeks, days_per_week)
+        for start in range(0, len(paths), chunk_size)
+    ]
+    workers = workers or os.cpu_count() or 1
+    if len(tasks) <= 1 or workers == 1:
+        chunks = [_parse_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            chunks = list(pool.map(_parse_chunk, tasks))
+    return CohortData(chunks, total_weeks, days_per_week)
+
+
+def _rate(part: np.ndarray, whole: np.ndarray) -> np.ndarray:
+    """Divide element-wise, with 0 where the denominator is 0."""
+    return np.divide(part, whole, out=np.zeros(part.shape, dtype=np.float64), where=whole > 0)
+
+
+def analyze(cohort: CohortData, passing_score: float = 70, active_days: int = 7) -> Dict[str, Any]:
+    """Compute the cohort's funnels, distributions and averages."""
+    started = int(cohort.started.sum())
+    active_since = np.datetime64(date.today() - timedelta(days=active_days), "D")
+    overview = {
+        "learners": cohort.size,
+        "started": started,
+        "active": int((cohort.last_activity >= active_since).sum()),
+        "days_completed_mean": float(cohort.days_completed.mean()) if cohort.size else 0.0,
+        "days_completed_median": float(np.median(cohort.days_completed)) if cohort.size else 0.0,
+        "total_hours": float(cohort.total_hours.sum()),
+    }
+    
+    day_counts = cohort.completed_days.sum(axis=0)
+    by_week = cohort.completed_days.reshape(cohort.size, cohort.total_weeks, cohort.days_per_week)
+    week_counts = by_week.all(axis=2).sum(axis=0)
+    funnel = [
+        {
+            "week": slot // cohort.days_per_week + 1,
+            "day": slot % cohort.days_per_week + 1,
+            "learners": int(count),
+            "rate": float(rate),
+        }
+        for slot, (count, rate) in enumerate(zip(day_counts, _rate(day_counts, np.full(day_counts.shape, started))))
+    ]
+    weeks = [
+        {"week": week + 1, "learners": int(count), "rate": float(rate)}
+        for week, (count, rate) in enumerate(zip(week_counts, _rate(week_counts, np.full(week_counts.shape, started))))
+    ]
+    
+    edges = STREAK_BUCKETS + [max(int(cohort.streak.max(initial=0)), STREAK_BUCKETS[-1]) + 1]
+    streak_counts, _ = np.histogram(cohort.streak, bins=edges)
+    streaks = [
+        {
+            "bucket": f"{low}+" if i == len(STREAK_BUCKETS) - 1 else (str(low) if high - low == 1 else f"{low}-{high - 1}"),
+            "learners": int(count),
+        }
+        for i, (low, high, count) in enumerate(zip(edges, edges[1:], streak_counts))
+    ]
+    
+    taken = ~np.isnan(cohort.scores)
+    attempts = taken.sum(axis=0)
+    passes = (np.nan_to_num(cohort.scores, nan=-1) >= passing_score).sum(axis=0)
+    score_sums = np.nansum(cohort.scores, axis=0)
+    assessments = [
+        {
+            "week": week + 1,
+            "attempts": int(attempts[week]),
+            "passed": int(passes[week]),
+            "pass_rate": float(pass_rate),
+            "mean_score": float(mean_score),
+        }
+        for week, (pass_rate, mean_score) in enumerate(zip(_rate(passes, attempts), _rate(score_sums, attempts)))
+    ]
+    
+    has_skill = ~np.isnan(cohort.skills)
+    skill_counts = has_skill.sum(axis=0)
+    skill_means = _rate(np.nansum(cohort.skills, axis=0), skill_counts)
+    skills = sorted(
+        (
+            {"skill": str(name), "learners": int(count), "mean_level": float(mean)}
+            for name, count, mean in zip(cohort.skill_names, skill_counts, skill_means)
+        ),
+        key=lambda row: row["mean_level"], reverse=True
+    )
+    
+    return {
+        "overview": overview,
+        "funnel": funnel,
+        "weeks": weeks,
+        "streaks": streaks,
+        "streak_mean": float(cohort.streak.mean()) if cohort.size else 0.0,
+        "streak_p90": float(np.percentile(cohort.streak, 90)) if cohort.size else 0.0,
+        "assessments": assessments,
+        "skills": skills,
+        "passing_score": passing_score,
+        "errors": cohort.errors,
+    }
+
+
+def format_markdown(analysis: Dict[str, Any]) -> str:
+    """Render the analysis as a Markdown report."""
+    overview = analysis["overview"]
+    days_per_week = max((row["day"] for row in analysis["funnel"]), default=5)
+    lines = [
+        "# Cohort Report",
+        "",
+        f"Generated {date.today()}",
+        "",
+        "## Overview",
+        f"- Learners: {overview['learners']} ({overview['started']} started, {overview['active']} active in the last week)",
+        f"- Days completed: mean {overview['days_completed_mean']:.1f}, median {overview['days_completed_median']:.0f}",
+        f"- Total hours logged: {overview['total_hours']:,.0f}",
+        "",
+        "## Completion Funnel",
+        "",
+        "| Week | Whole Week | " + " | ".join(f"Day {day}" for day in range(1, days_per_week + 1)) + " |",
+        "|" + "---|" * (days_per_week + 2),
+    ]
+    for week in analysis["weeks"]:
+        days = [row for row in analysis["funnel"] if row["week"] == week["week"]]
+        lines.append(
+            f"| {week['week']} | {week['learners']} ({week['rate']:.0%}) | "
+            + " | ".join(f"{row['learners']} ({row['rate']:.0%})" for row in days) + " |"
+        )
+    
+    lines += [
+        "",
+        "## Streaks",
+        "",
+        f"Mean {analysis['streak_mean']:.1f} days, 90th percentile {analysis['streak_p90']:.0f} days.",
+        "",
+        "| Streak (days) | Learners |",
+        "|---|---|",
+    ]
+    lines += [f"| {row['bucket']} | {row['learners']} |" for row in analysis["streaks"]]
+    
+    lines += [
+        "",
+        f"## Assessments (pass mark {analysis['passing_score']:g}%)",
+        "",
+        "| Week | Attempts | Passed | Pass Rate | Mean Score |",
+        "|---|---|---|---|---|",
+    ]
+    lines += [
+        f"| {row['week']} | {row['attempts']} | {row['passed']} | {row['pass_rate']:.0%} | {row['mean_score']:.1f} |"
+        for row in analysis["assessments"]
+    ]
+    
+    lines += ["", "## Skills", "", "| Skill | Learners | Mean Level |", "|---|---|---|"]
+    lines += [f"| {row['skill']} | {row['learners']} | {row['mean_level']:.1f}% |" for row in analysis["skills"]]
+    
+    if analysis["errors"]:
+        lines += ["", "## Unreadable Files", ""]
+        lines += [f"- `{path}`: {message}" for path, message in analysis["errors"]]
+    return "\n".join(lines) + "\n"
+
+
+def _write_csv(path: Path, rows: List[Dict[str, Any]]):
+    """Write a list of dicts as CSV."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def learner_table(cohort: CohortData) -> Dict[str, Any]:
+    """Per-learner columns for CSV and Parquet output."""
+    table = {
+        "learner_id": cohort.learner_id,
+        "user_name": cohort.user_name,
+        "started": cohort.started,
+        "current_week": cohort.current_week,
+        "current_day": cohort.current_day,
+        "days_completed": cohort.days_completed,
+        "streak": cohort.streak,
+        "total_hours": cohort.total_hours,
+        "last_activity_date": cohort.last_activity,
+    }
+    for week in range(cohort.total_weeks):
+        table[f"week{week + 1}_score"] = cohort.scores[:, week]
+    return table
+
+
+def write_report(cohort: CohortData, analysis: Dict[str, Any], output_dir: Path,
+                 formats: Sequence[str] = ("md", "csv")) -> List[Path]:
+    """Write the report in the requested formats and return the files written.
+
+    Parquet output needs pyarrow.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    
+    if "md" in formats:
+        path = output_dir / "cohort_report.md"
+        path.write_text(format_markdown(analysis), encoding='utf-8')
+        written.append(path)
+    
+    if "csv" in formats:
+        for name in ("funnel", "weeks", "streaks", "assessments", "skills"):
+            path = output_dir / f"{name}.csv"
+            _write_csv(path, analysis[name])
+            written.append(path)
+        table = learner_table(cohort)
+        path = output_dir / "learners.csv"
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(table)
+            # Missing dates and scores are written as empty cells
+            columns = [
+                np.where(np.isnat(values), "", values.astype(str)) if values.dtype.kind == "M"
+                else np.where(np.isnan(values), "", np.round(values, 2).astype(str)) if values.dtype.kind == "f"
+                else values
+                for values in table.values()
+            ]
+            writer.writerows(zip(*(column.tolist() for column in columns)))
+        written.append(path)
+    
+    if "parquet" in formats:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        path = output_dir / "learners.parquet"
+        pq.write_table(pa.table({name: values.tolist() if values.dtype == object else values
+                                 for name, values in learner_table(cohort).items()}), path)
+        written.append(path)
+    return written
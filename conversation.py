@@ -0,0 +1,173 @@
+"""
+Conversation Memory for Cloud Engineer Bootcamp
+
+Keeps an interactive session's recent turns verbatim and folds older ones into
+a running summary, so follow-up questions keep their context while the prompt
+stays within a fixed token budget. Sessions are saved per day and reloaded
+when the learner resumes.
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+
+from progress_storage import atomic_write_json
+from retrieval import estimate_tokens
+
+SUMMARY_PROMPT = """Update the running summary of a tutoring conversation between a
+cloud engineering student and their mentor. Keep what the student already
+understands, what they struggled with, and any commands or examples they were
+given that later questions may refer to. Reply with the summary only, in at
+most {words} words.
+
+Current summary:
+{summary}
+
+New turns to fold in:
+{turns}"""
+
+
+def format_turns(turns: List[Dict[str, Any]]) -> str:
+    """Render turns as a plain transcript."""
+    return "\n\n".join(f"Student: {turn['question']}\nMentor: {turn['answer']}" for turn in turns)
+
+
+def extractive_summary(summary: str, turns: List[Dict[str, Any]], max_tokens: int) -> str:
+    """Summarize without a model by keeping the questions asked, newest last."""
+    topics = [turn["question"].strip().replace("\n", " ") for turn in turns]
+    text = " ".join(filter(None, [summary, "The student asked: " + "; ".join(topics) + "."]))
+    # Drop the oldest material first when over budget
+    max_chars = max_tokens * 4
+    return text if len(text) <= max_chars else "…" + text[-(max_chars - 1):]
+
+
+class ConversationMemory:
+    """Recent turns verbatim plus a rolling summary of older ones."""
+    
+    def __init__(self, session_file: Optional[Path] = None, history_tokens: int = 1500,
+                 summary_tokens: int = 300, keep_turns: int = 2,
+                 summarizer: Optional[Callable[[str, List[Dict[str, Any]], int], str]] = None):
+        """Initialize conversation memory.
+
+        Once the verbatim turns exceed `history_tokens`, the oldest are folded
+        into a summary of at most `summary_tokens`, always keeping the last
+        `keep_turns` turns verbatim. `summarizer(summary, turns, max_tokens)`
+        produces the new summary; it defaults to an extractive one.
+        """
+        self.session_file = Path(session_file) if session_file else None
+        self.history_tokens = history_tokens
+        self.summary_tokens = summary_tokens
+        self.keep_turns = keep_turns
+        self.summarizer = summarizer or extractive_summary
+        self.summary = ""
+        self.turns: List[Dict[str, Any]] = []
+        self.summarized_turns = 0
+        self.token_log: List[Dict[str, int]] = []
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self._load()
+    
+    def _load(self):
+        """Reload a saved session, if any."""
+        if not self.session_file or not self.session_file.exists():
+            return
+        with open(self.session_file, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        self.summary = saved.get("summary", "")
+        self.turns = saved.get("turns", [])
+        self.summarized_turns = saved.get("summarized_turns", 0)
+        self.token_log = saved.get("token_log", [])
+    
+    def save(self):
+        """Persist the session."""
+        if not self.session_file:
+            return
+        with self._lock:
+            data = {
+                "summary": self.summary,
+                "turns": list(self.turns),
+                "summarized_turns": self.summarized_turns,
+                "token_log": list(self.token_log),
+                "updated_at": datetime.now().isoformat()
+            }
+        self.session_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(self.session_file, data)
+    
+    @property
+    def total_turns(self) -> int:
+        """Number of turns in the session, including summarized ones."""
+        return self.summarized_turns + len(self.turns)
+    
+    def history_messages(self) -> List[Dict[str, str]]:
+        """Get the verbatim turns as alternating user/assistant messages."""
+        with self._lock:
+            turns = list(self.turns)
+        messages = []
+        for turn in turns:
+            messages.append({"role": "user", "content": turn["question"]})
+            messages.append({"role": "assistant", "content": turn["answer"]})
+        return messages
+    
+    def system_context(self) -> str:
+        """Get the summary of earlier turns for the system prompt."""
+        with self._lock:
+            summary = self.summary
+        return f"Summary of the conversation so far:\n{summary}" if summary else ""
+    
+    def add_turn(self, question: str, answer: str, prompt_tokens: Optional[Dict[str, int]] = None):
+        """Record a finished turn and the size of the prompt that produced it."""
+        with self._lock:
+            self.turns.append({
+                "question": question,
+                "answer": answer,
+                "tokens": estimate_tokens(question) + estimate_tokens(answer)
+            })
+            if prompt_tokens:
+                self.token_log.append(dict(prompt_tokens, turn=self.summarized_turns + len(self.turns)))
+        self.save()
+    
+    def _turns_to_fold(self) -> int:
+        """Count the oldest turns that must be summarized to get back under budget."""
+        with self._lock:
+            total = sum(turn["tokens"] for turn in self.turns)
+            count = 0
+            while total > self.history_tokens and len(self.turns) - count > self.keep_turns:
+                total -= self.turns[count]["tokens"]
+                count += 1
+            return count
+    
+    def compact(self):
+        """Fold the oldest turns into the summary until the history fits its budget."""
+        count = self._turns_to_fold()
+        if not count:
+            return
+        
+        with self._lock:
+            summary, folded = self.summary, self.turns[:count]
+        try:
+            new_summary = self.summarizer(summary, folded, self.summary_tokens)
+        except Exception:
+            new_summary = extractive_summary(summary, folded, self.summary_tokens)
+        
+        with self._lock:
+            self.summary = new_summary
+            del self.turns[:count]
+            self.summarized_turns += count
+        self.save()
+    
+    def compact_in_background(self):
+        """Start compaction on a background thread so it runs while the learner types."""
+        if self._compactor and self._compactor.is_alive():
+            return
+        if not self._turns_to_fold():
+            return
+        self._compactor = threading.Thread(target=self.compact, daemon=True)
+        self._compactor.start()
+    
+    def wait(self):
+        """Wait for background compaction to finish."""
+        if self._compactor:
+            self._compactor.join()
+            self._compactor = None
@@ -0,0 +1,276 @@
+"""
+Curriculum Index for Cloud Engineer Bootcamp
+
+Scans the bootcamp's Markdown content once, records titles, headings and
+sections for every file, and caches file content and rendered output keyed by
+content hash so only changed files are ever reprocessed.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+
+INDEX_VERSION = 1
+
+CONTENT_ROOTS = ("curriculum", "assessments", "exercises", "resources", "docs")
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+DAY_PATTERN = re.compile(r"^curriculum/week(\d+)/day(\d+)\.md$")
+ASSESSMENT_PATTERN = re.compile(r"^assessments/week(\d+)_assessment\.md$")
+# Answer keys stay out of the index, so search and grounded answers can't reveal them
+ANSWER_KEY_PATTERN = re.compile(r"^assessments/week(\d+)_answers\.md$")
+
+
+def slugify(heading: str) -> str:
+    """Turn a heading into a lowercase anchor."""
+    slug = re.sub(r"[^\w\s-]", "", heading.lower()).strip()
+    return re.sub(r"[\s_]+", "-", slug)
+
+
+def parse_sections(text: str) -> List[Dict[str, Any]]:
+    """Split Markdown into sections at each heading, ignoring fenced code."""
+    sections = []
+    in_fence = False
+    lines = text.splitlines()
+    
+    for number, line in enumerate(lines):
+        if line.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else HEADING_PATTERN.match(line)
+        if match:
+            if sections:
+                sections[-1]["end_line"] = number
+            heading = match.group(2)
+            sections.append({
+                "heading": heading,
+                "anchor": slugify(heading),
+                "level": len(match.group(1)),
+                "start_line": number,
+                "end_line": len(lines)
+            })
+    
+    # Text before the first heading becomes an untitled section
+    if lines and (not sections or sections[0]["start_line"] > 0):
+        sections.insert(0, {
+            "heading": "",
+            "anchor": "",
+            "level": 0,
+            "start_line": 0,
+            "end_line": sections[0]["start_line"] if sections else len(lines)
+        })
+    return sections
+
+
+class CurriculumIndex:
+    """Index of the bootcamp's Markdown content with hash-keyed caches."""
+    
+    def __init__(self, base_dir: Path, cache_dir: Path, roots=CONTENT_ROOTS):
+        """Initialize the index and load the saved copy, if any."""
+        self.base_dir = Path(base_dir)
+        self.cache_dir = Path(cache_dir)
+        self.roots = tuple(roots)
+        self.index_file = self.cache_dir / "index.json"
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._text: Dict[str, str] = {}
+        self._load_index()
+    
+    def _load_index(self):
+        """Load the saved index, discarding it if it was built differently."""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get("version") == INDEX_VERSION and saved.get("roots") == list(self.roots):
+            self.files = saved["files"]
+    
+    def _save_index(self):
+        """Write the index atomically."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_suffix(".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "roots": list(self.roots), "files": self.files}, f)
+        os.replace(tmp_file, self.index_file)
+    
+    def _content_file(self, sha256: str) -> Path:
+        """Path of the cached content for a hash."""
+        return self.cache_dir / "content" / f"{sha256}.md"
+    
+    def _scan(self) -> Dict[str, os.stat_result]:
+        """Stat every Markdown file under the content roots."""
+        found = {}
+        for root in self.roots:
+            root_dir = self.base_dir / root
+            if not root_dir.is_dir():
+                continue
+            for dirpath, _, filenames in os.walk(root_dir):
+                for filename in filenames:
+                    if filename.endswith(".md"):
+                        path = Path(dirpath) / filename
+                        relative = path.relative_to(self.base_dir).as_posix()
+                        if not ANSWER_KEY_PATTERN.match(relative):
+                            found[relative] = path.stat()
+        return found
+    
+    def refresh(self, force: bool = False) -> List[str]:
+        """Bring the index up to date and return the paths that were reprocessed.
+
+        Files whose size and mtime are unchanged are skipped without being
+        read; files that were touched but whose hash is unchanged keep their
+        parsed data and rendered output.
+        """
+        found = self._scan()
+        reprocessed = []
+        changed = False
+        
+        for path in list(self.files):
+            if path not in found:
+                del self.files[path]
+                changed = True
+        
+        for path, stat in sorted(found.items()):
+            entry = self.files.get(path)
+            if not force and entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                continue
+            
+            with open(self.base_dir / path, 'rb') as f:
+                raw = f.read()
+            sha256 = hashlib.sha256(raw).hexdigest()
+            changed = True
+            
+            if not force and entry and entry["sha256"] == sha256:
+                entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                continue
+            
+            text = raw.decode('utf-8')
+            self.files[path] = self._build_entry(path, text, sha256, stat)
+            self._store_content(sha256, text)
+            self._text[path] = text
+            reprocessed.append(path)
+        
+        if changed:
+            self._save_index()
+        return reprocessed
+    
+    def _build_entry(self, path: str, text: str, sha256: str, stat: os.stat_result) -> Dict[str, Any]:
+        """Extract metadata and section boundaries from one file."""
+        sections = parse_sections(text)
+        title = next((s["heading"] for s in sections if s["level"] == 1), Path(path).stem)
+        entry = {
+            "path": path,
+            "kind": path.split("/", 1)[0],
+            "title": title,
+            "sha256": sha256,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sections": sections
+        }
+        
+        day = DAY_PATTERN.match(path)
+        if day:
+            entry.update(week=int(day.group(1)), day=int(day.group(2)))
+        assessment = ASSESSMENT_PATTERN.match(path)
+        if assessment:
+            entry.update(week=int(assessment.group(1)))
+        return entry
+    
+    def _store_content(self, sha256: str, text: str):
+        """Keep a copy of the content keyed by its hash."""
+        content_file = self._content_file(sha256)
+        if not content_file.exists():
+            content_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(content_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+    
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Get the index entry for a path relative to the base directory."""
+        return self.files.get(path)
+    
+    def get_day(self, week: int, day: int) -> Optional[Dict[str, Any]]:
+        """Get the index entry for a curriculum day."""
+        return self.get(f"curriculum/week{week}/day{day}.md")
+    
+    def get_assessment(self, week: int) -> Optional[Dict[str, Any]]:
+        """Get the index entry for a week's assessment."""
+        return self.get(f"assessments/week{week}_assessment.md")
+    
+    def days(self) -> List[Dict[str, Any]]:
+        """List all curriculum days in order."""
+        return sorted(
+            (entry for entry in self.files.values() if "day" in entry),
+            key=lambda entry: (entry["week"], entry["day"])
+        )
+    
+    def text(self, path: str) -> Optional[str]:
+        """Get the content of an indexed file from the hash-keyed cache."""
+        entry = self.get(path)
+        if entry is None:
+            return None
+        if path not in self._text:
+            content_file = self._content_file(entry["sha256"])
+            if not content_file.exists():
+                self._store_content(entry["sha256"], (self.base_dir / path).read_text(encoding='utf-8'))
+            self._text[path] = content_file.read_text(encoding='utf-8')
+        return self._text[path]
+    
+    def find_section(self, path: str, heading: str) -> Optional[Dict[str, Any]]:
+        """Find a section by heading text or anchor and include its text."""
+        entry = self.get(path)
+        if entry is None:
+            return None
+        
+        wanted = slugify(heading)
+        for section in entry["sections"]:
+            if section["anchor"] == wanted or wanted in section["anchor"]:
+                lines = self.text(path).splitlines()
+                return dict(section, path=path, text="\n".join(lines[section["start_line"]:section["end_line"]]))
+        return None
+    
+    def render(self, path: str, console, wrap: Optional[Callable[[Any], Any]] = None, variant: str = ""):
+        """Render a file's Markdown, reusing cached output for the same content and width.
+
+        `wrap` lets callers put the Markdown inside another renderable (such as
+        a Panel); `variant` must identify that wrapping in the cache key.
+        """
+        from rich.text import Text
+        
+        entry = self.get(path)
+        if entry is None:
+            return None
+        
+        key = hashlib.sha256(
+            f"{entry['sha256']}|{console.width}|{console.color_system}|{variant}".encode('utf-8')
+        ).hexdigest()
+        rendered_file = self.cache_dir / "rendered" / f"{key}.ansi"
+        
+        if rendered_file.exists():
+            rendered = rendered_file.read_text(encoding='utf-8')
+            return Text.from_ansi(rendered.removesuffix("\n"), no_wrap=True)
+        
+        from rich.markdown import Markdown
+        
+        renderable = Markdown(self.text(path))
+        if wrap:
+            renderable = wrap(renderable)
+        with console.capture() as capture:
+            console.print(renderable)
+        rendered = capture.get()
+        
+        rendered_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(rendered_file, 'w', encoding='utf-8') as f:
+            f.write(rendered)
+        return Text.from_ansi(rendered.removesuffix("\n"), no_wrap=True)
+    
+    def clear_cache(self):
+        """Remove cached content, rendered output and the saved index."""
+        for subdir in ("content", "rendered"):
+            for cached in (self.cache_dir / subdir).glob("*"):
+                cached.unlink()
+        if self.index_file.exists():
+            self.index_file.unlink()
+        self.files = {}
+        self._text = {}
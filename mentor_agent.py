@@ -10,37 +10,41 @@ hands-on labs, and continuous assessment.
 import os
 import sys
 import json
+import time
+import hashlib
+import functools
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterator, List
 
 import typer
-import yaml
 from rich.console import Console
 from rich.panel import Panel
-from rich.markdown import Markdown
 from rich.table import Table
-from rich.prompt import Prompt, Confirm
-from rich import print as rprint
-from dotenv import load_dotenv
-
-# Import AI providers
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-try:
-    from anthropic import Anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+from rich.prompt import Prompt, Confirm, IntPrompt
 
+# AI provider SDKs, YAML, dotenv and rich.markdown are imported where they're
+# used: loading both SDKs alone takes longer than running `progress` or `reset`.
+# So are the daemon, conversation, search, retrieval, prefetch and metrics
+# modules, which only some commands need.
+from achievements import AchievementEngine, award_cohort_badges
 from progress_tracker import ProgressTracker
+from progress_storage import open_database
+from response_cache import ResponseCache
+from question_cache import QuestionCache
+from curriculum_index import CurriculumIndex
+from providers import ProviderRouter, ProviderError, create_router
+from prompts import (
+    ASK_SYSTEM_PROMPT, SESSION_SYSTEM_PROMPT, PRIMER_SYSTEM_PROMPT, PRIMER_PROMPT, INTERVIEW_TOPICS,
+    INTERVIEW_QUESTION_PROMPT, STANDUP_PROMPT, INTERVIEW_FEEDBACK_PROMPT
+)
 
-# Load environment variables
-load_dotenv()
+if TYPE_CHECKING:
+    from conversation import ConversationMemory
+    from mentor_daemon import DaemonClient
+    from prefetch import Prefetcher
+    from retrieval import Retriever
+    from search_index import SearchIndex
 
 # Initialize Typer app and Rich console
 app = typer.Typer(help="Cloud Engineer Bootcamp - AI Mentor Agent")
@@ -50,77 +54,479 @@ console = Console()
 BASE_DIR = Path(__file__).parent
 
 
+def load_config() -> Dict[str, Any]:
+    """Load configuration from config.yaml, or from $MENTOR_CONFIG if set."""
+    import yaml
+    
+    config_path = Path(os.getenv('MENTOR_CONFIG') or BASE_DIR / "config.yaml")
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def create_progress_tracker(config: Dict[str, Any]) -> ProgressTracker:
+    """Create a progress tracker using the storage settings from config.yaml."""
+    return ProgressTracker(
+        progress_file=config.get('progress_file', 'progress/user_progress.json'),
+        backend=config.get('progress_backend', 'eventlog'),
+        compact_every=config.get('progress_compact_every', 100),
+        db_file=config.get('progress_db', 'progress/cohort.sqlite'),
+        learner_id=config.get('learner_id', ''),
+        achievements=load_achievements(config)
+    )
+
+
+def load_achievements(config: Dict[str, Any]) -> AchievementEngine:
+    """Create the badge and skill engine from config.yaml."""
+    engine = AchievementEngine.from_config(config.get('achievements', {}))
+    if not config.get('enable_badges', True):
+        engine = AchievementEngine(badges=[], skills_by_week=engine.skills_by_week,
+                                   skill_points_per_week=engine.skill_points_per_week)
+    return engine
+
+
+def load_curriculum_index(config: Dict[str, Any]) -> CurriculumIndex:
+    """Load the curriculum index, reprocessing only files that changed since the last run."""
+    index = CurriculumIndex(BASE_DIR, Path(config.get('curriculum_cache', '.cache/curriculum')))
+    index.refresh()
+    return index
+
+
+def load_search_index(config: Dict[str, Any]) -> "SearchIndex":
+    """Load the full-text search index, reindexing only files that changed."""
+    from search_index import SearchIndex
+    
+    search_index = SearchIndex(load_curriculum_index(config))
+    search_index.refresh()
+    return search_index
+
+
+def print_indexed_markdown(index: CurriculumIndex, path: str, title: Optional[str] = None,
+                           border_style: str = "green") -> bool:
+    """Print an indexed Markdown file, optionally in a panel, from the render cache."""
+    wrap = None
+    if title:
+        wrap = lambda markdown: Panel(markdown, title=title, border_style=border_style)
+    rendered = index.render(path, console, wrap=wrap, variant=f"panel|{title}|{border_style}" if title else "")
+    if rendered is None:
+        return False
+    console.print(rendered)
+    return True
+
+
 class MentorAgent:
     """Main mentor agent class handling AI interactions and curriculum delivery."""
     
-    def __init__(self):
-        """Initialize the mentor agent with configuration."""
-        self.config = self._load_config()
-        self.progress_tracker = ProgressTracker()
-        self.ai_client = self._initialize_ai_client()
+    def __init__(self, use_cache: bool = True, connect_daemon: bool = True, command: str = ""):
+        """Initialize the mentor agent with configuration.
+        
+        `command` names the CLI command using the agent in recorded metrics.
+        """
+        from metrics import MetricsRecorder
         
+        self.config = self._load_config()
+        self.command = command
+        # Warnings and errors; `batch` sends them to stderr, away from its JSONL answers
+        self.diagnostics = console
+        self.metrics = MetricsRecorder.from_config(self.config.get('metrics', {}))
+        self.progress_tracker = create_progress_tracker(self.config)
+        self.use_cache = use_cache
+        self.daemon = self._connect_daemon() if connect_daemon else None
+        self._router = None
+        self._router_initialized = False
+        self._curriculum_index = None
+        self._retriever = None
+        self._prefetcher = None
+        self._question_cache = None
+        self._question_cache_initialized = False
+        # The daemon keeps its own cache when AI calls are forwarded to it
+        self.response_cache = self._initialize_response_cache() if use_cache and not self.daemon else None
+    
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from config.yaml."""
-        config_path = BASE_DIR / "config.yaml"
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return load_config()
     
-    def _initialize_ai_client(self):
-        """Initialize the appropriate AI client based on configuration."""
-        provider = self.config.get('ai_provider', 'openai')
+    def _connect_daemon(self) -> Optional["DaemonClient"]:
+        """Get a client for the mentor daemon if one is running."""
+        daemon_config = self.config.get('daemon', {})
+        if not daemon_config.get('enabled', True):
+            return None
+        from mentor_daemon import DaemonClient
         
-        if provider == 'openai' and OPENAI_AVAILABLE:
-            api_key = os.getenv('OPENAI_API_KEY')
-            if not api_key:
-                console.print("[yellow]Warning: OPENAI_API_KEY not set. AI features will be limited.[/yellow]")
-                return None
-            return OpenAI(api_key=api_key)
+        client = DaemonClient(daemon_config.get('socket', '.cache/mentor.sock'))
+        return client if client.ping() else None
+    
+    @property
+    def curriculum_index(self) -> CurriculumIndex:
+        """Curriculum index, refreshed on first use."""
+        if self._curriculum_index is None:
+            self._curriculum_index = load_curriculum_index(self.config)
+        return self._curriculum_index
+    
+    @property
+    def retriever(self) -> "Retriever":
+        """Retriever over curriculum chunks, created on first use."""
+        if self._retriever is None:
+            from retrieval import Retriever
+            from search_index import SearchIndex
+            
+            search_index = SearchIndex(self.curriculum_index)
+            search_index.refresh()
+            self._retriever = Retriever(
+                self.curriculum_index,
+                search_index,
+                chunk_tokens=self.config.get('retrieval', {}).get('chunk_tokens', 300)
+            )
+        return self._retriever
+    
+    def grounded_prompt(self, question: str, week: Optional[int] = None, day: Optional[int] = None) -> str:
+        """Prepend the course material most relevant to a question to it.
+
+        The excerpts change with every question, so they go in the final user
+        message: the system prompt and earlier turns then stay a stable prefix
+        that providers can serve from their prompt cache.
+        """
+        retrieval_config = self.config.get('retrieval', {})
+        if not retrieval_config.get('enabled', True):
+            return question
         
-        elif provider == 'anthropic' and ANTHROPIC_AVAILABLE:
-            api_key = os.getenv('ANTHROPIC_API_KEY')
-            if not api_key:
-                console.print("[yellow]Warning: ANTHROPIC_API_KEY not set. AI features will be limited.[/yellow]")
-                return None
-            return Anthropic(api_key=api_key)
+        context = self.retriever.build_context(
+            question, retrieval_config.get('context_tokens', 1200), week, day
+        )
+        if not context:
+            return question
+        return (
+            "Ground your answer in these excerpts from the course material where they apply, "
+            "and say which day or section to revisit:\n\n"
+            f"{context}\n\n"
+            f"Question: {question}"
+        )
+    
+    @property
+    def router(self) -> Optional[ProviderRouter]:
+        """Provider router, created on first use so commands that never call it stay fast."""
+        if not self._router_initialized:
+            self._router = self._initialize_router()
+            self._router_initialized = True
+        return self._router
+    
+    @router.setter
+    def router(self, router: Optional[ProviderRouter]):
+        self._router = router
+        self._router_initialized = True
+    
+    def _initialize_router(self) -> Optional[ProviderRouter]:
+        """Set up the configured AI provider and its fallbacks."""
+        from dotenv import load_dotenv
         
-        else:
-            console.print(f"[yellow]AI provider '{provider}' not available. Running in demo mode.[/yellow]")
+        # Load environment variables
+        load_dotenv()
+        provider = self.config.get('ai_provider', 'openai')
+        
+        try:
+            router = create_router(self.config)
+        except ProviderError as e:
+            self.diagnostics.print(f"[yellow]Warning: {e}. AI features will be limited.[/yellow]")
+            return None
+        
+        if router.primary.name != provider:
+            self.diagnostics.print(f"[yellow]Warning: AI provider '{provider}' not available, using '{router.primary.name}'.[/yellow]")
+        return router
+    
+    @property
+    def prefetcher(self) -> Optional["Prefetcher"]:
+        """Background prefetcher, or None when prefetching is off or there is no AI provider."""
+        prefetch_config = self.config.get('prefetch', {})
+        if self._prefetcher is None and prefetch_config.get('enabled', True) and (self.daemon or self.router):
+            from prefetch import Prefetcher
+            
+            self._prefetcher = Prefetcher.from_config(prefetch_config)
+        return self._prefetcher
+    
+    def _initialize_response_cache(self) -> Optional[ResponseCache]:
+        """Initialize the on-disk response cache based on configuration."""
+        cache_config = self.config.get('response_cache', {})
+        if not cache_config.get('enabled', True):
+            return None
+        return ResponseCache.from_config(cache_config)
+    
+    @property
+    def question_cache(self) -> Optional[QuestionCache]:
+        """Index of answered `ask` questions, loaded on first use; None when disabled or bypassed."""
+        if not self._question_cache_initialized:
+            cache_config = self.config.get('question_cache', {})
+            if self.use_cache and cache_config.get('enabled', True):
+                self._question_cache = QuestionCache.from_config(cache_config)
+            self._question_cache_initialized = True
+        return self._question_cache
+    
+    def _question_scope(self) -> str:
+        """Only reuse answers from the same provider and model."""
+        return f"{self.config.get('ai_provider', 'openai')}/{self.model_name()}"
+    
+    def similar_answer(self, question: str) -> Optional[Dict[str, Any]]:
+        """Find the answer to an earlier question that rewords this one, recording the hit."""
+        if not self.question_cache:
             return None
+        start = time.perf_counter()
+        match = self.question_cache.lookup(question, self._question_scope())
+        if match:
+            self.metrics.record(
+                command=self.command,
+                provider=self.config.get('ai_provider', 'openai'),
+                model=self.model_name(),
+                cached=True,
+                total_ms=round((time.perf_counter() - start) * 1000, 1)
+            )
+        return match
     
-    def get_ai_response(self, prompt: str, system_prompt: str = None) -> str:
-        """Get response from AI provider."""
-        if not self.ai_client:
+    def remember_answer(self, question: str, answer: str, metrics: Dict[str, Any]):
+        """Index a question's answer if a provider (or the response cache) gave it."""
+        answered = metrics.get("cached") or (metrics.get("provider") and not metrics.get("error"))
+        if self.question_cache and answer and answered:
+            self.question_cache.add(question, answer, self._question_scope())
+    
+    def model_name(self) -> str:
+        """Get the model name configured for the active provider."""
+        provider = self.config.get('ai_provider', 'openai')
+        if provider == 'anthropic':
+            return self.config.get('anthropic_model', 'claude-3-sonnet-20240229')
+        if provider == 'ollama':
+            return self.config.get('ollama_model', 'llama2')
+        return self.config.get('openai_model', 'gpt-4')
+    
+    def cache_key(self, prompt: str, system_prompt: Optional[str], use_cache: bool = True,
+                  history: Optional[List[Dict[str, str]]] = None) -> Optional[str]:
+        """Build the response cache key for a request, if caching is enabled."""
+        if not self.response_cache or not use_cache:
+            return None
+        return ResponseCache.make_key(
+            self.config.get('ai_provider', 'openai'),
+            self.model_name(),
+            system_prompt,
+            json.dumps(history + [{"role": "user", "content": prompt}]) if history else prompt,
+            self.config.get('temperature', 0.7),
+            self.config.get('max_tokens', 2000)
+        )
+    
+    @staticmethod
+    def _build_messages(prompt: str, history: Optional[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+        """Build the conversation messages for a request."""
+        return list(history or []) + [{"role": "user", "content": prompt}]
+    
+    def cached_response(self, cache_key: Optional[str], command: Optional[str]) -> Optional[str]:
+        """Look up a cached response, recording the hit."""
+        if not cache_key:
+            return None
+        start = time.perf_counter()
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            self.metrics.record(
+                command=command or self.command,
+                provider=self.config.get('ai_provider', 'openai'),
+                model=self.model_name(),
+                cached=True,
+                total_ms=round((time.perf_counter() - start) * 1000, 1)
+            )
+        return cached
+    
+    def get_ai_response(self, prompt: str, system_prompt: str = None, use_cache: bool = True,
+                        history: Optional[List[Dict[str, str]]] = None, command: Optional[str] = None,
+                        metrics: Optional[Dict[str, Any]] = None) -> str:
+        """Get response from AI provider.
+        
+        `history` holds earlier user/assistant messages of the conversation;
+        `command` overrides the agent's command in recorded metrics. If
+        `metrics` is given, it is filled with the call's recorded metrics.
+        """
+        if self.daemon:
+            return "".join(self.stream_ai_response(prompt, system_prompt, use_cache, history, command, metrics))
+        
+        if not self.router:
             return self._get_fallback_response(prompt)
         
-        provider = self.config.get('ai_provider', 'openai')
+        call_metrics: Dict[str, Any] = metrics if metrics is not None else {}
+        cache_key = self.cache_key(prompt, system_prompt, use_cache, history)
+        cached = self.cached_response(cache_key, command)
+        if cached is not None:
+            call_metrics["cached"] = True
+            return cached
         
         try:
-            if provider == 'openai':
-                messages = []
-                if system_prompt:
-                    messages.append({"role": "system", "content": system_prompt})
-                messages.append({"role": "user", "content": prompt})
-                
-                response = self.ai_client.chat.completions.create(
-                    model=self.config.get('openai_model', 'gpt-4'),
-                    messages=messages,
-                    temperature=0.7,
-                    max_tokens=2000
-                )
-                return response.choices[0].message.content
+            response = self.router.complete(
+                system_prompt,
+                self._build_messages(prompt, history),
+                temperature=self.config.get('temperature', 0.7),
+                max_tokens=self.config.get('max_tokens', 2000),
+                metrics=call_metrics
+            )
+        except ProviderError as e:
+            self.diagnostics.print(f"[red]Error getting AI response: {e}[/red]")
+            return self._get_fallback_response(prompt)
+        finally:
+            self.metrics.record(command=command or self.command, cached=False, **call_metrics)
+        
+        if cache_key and response:
+            self.response_cache.set(cache_key, response)
+        return response
+    
+    def stream_ai_response(self, prompt: str, system_prompt: str = None, use_cache: bool = True,
+                           history: Optional[List[Dict[str, str]]] = None,
+                           command: Optional[str] = None,
+                           metrics: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Stream response chunks from AI provider as they arrive.
+
+        If `metrics` is given, it is filled with the call's recorded metrics
+        once the stream is exhausted.
+        """
+        if self.daemon:
+            from mentor_daemon import DaemonError
             
-            elif provider == 'anthropic':
-                response = self.ai_client.messages.create(
-                    model=self.config.get('anthropic_model', 'claude-3-sonnet-20240229'),
-                    system=system_prompt or "You are a helpful cloud engineering mentor.",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=2000
-                )
-                return response.content[0].text
+            received = False
+            try:
+                # The daemon records the call's metrics
+                for chunk in self.daemon.stream(prompt, system_prompt, use_cache=use_cache and self.use_cache,
+                                                history=history, command=command or self.command,
+                                                metrics=metrics):
+                    received = True
+                    yield chunk
+                return
+            except DaemonError as e:
+                self.diagnostics.print(f"[yellow]Mentor daemon unavailable ({e}), answering locally.[/yellow]")
+                self.daemon = None
+                if received:
+                    return
+                if self.use_cache:
+                    self.response_cache = self._initialize_response_cache()
         
-        except Exception as e:
-            console.print(f"[red]Error getting AI response: {e}[/red]")
-            return self._get_fallback_response(prompt)
+        if not self.router:
+            yield self._get_fallback_response(prompt)
+            return
+        
+        call_metrics: Dict[str, Any] = metrics if metrics is not None else {}
+        cache_key = self.cache_key(prompt, system_prompt, use_cache, history)
+        cached = self.cached_response(cache_key, command)
+        if cached is not None:
+            call_metrics["cached"] = True
+            yield cached
+            return
+        
+        chunks = []
+        try:
+            for text in self.router.stream(
+                system_prompt,
+                self._build_messages(prompt, history),
+                temperature=self.config.get('temperature', 0.7),
+                max_tokens=self.config.get('max_tokens', 2000),
+                metrics=call_metrics
+            ):
+                chunks.append(text)
+                yield text
+        except ProviderError as e:
+            self.diagnostics.print(f"[red]Error getting AI response: {e}[/red]")
+            if not chunks:
+                yield self._get_fallback_response(prompt)
+            return
+        finally:
+            self.metrics.record(command=command or self.command, cached=False, **call_metrics)
+        
+        if cache_key and chunks:
+            self.response_cache.set(cache_key, "".join(chunks))
+    
+    def grade_answers(self, system_prompt: str, prompt: str) -> Optional[str]:
+        """Get a grading reply at temperature 0, or None on failure.
+        
+        Used as the assessment engine's `complete` callback, which may call
+        it from several threads; check `router` on the calling thread first.
+        """
+        cache_key = self.cache_key(prompt, system_prompt)
+        cached = self.cached_response(cache_key, "grade")
+        if cached is not None:
+            return cached
+        
+        call_metrics: Dict[str, Any] = {}
+        try:
+            response = self.router.complete(
+                system_prompt,
+                [{"role": "user", "content": prompt}],
+                temperature=0,
+                max_tokens=self.config.get('max_tokens', 2000),
+                metrics=call_metrics
+            )
+        except ProviderError:
+            return None
+        finally:
+            if call_metrics:
+                self.metrics.record(command="grade", cached=False, **call_metrics)
+        
+        if cache_key and response:
+            self.response_cache.set(cache_key, response)
+        return response
+    
+    def prefetch_response(self, prompt: str, system_prompt: Optional[str] = None) -> Optional[str]:
+        """Get a fresh response for the prefetcher, or None on failure.
+        
+        Runs on a background thread, so errors aren't printed over the
+        learner's session.
+        """
+        if self.daemon:
+            from mentor_daemon import DaemonError
+            
+            try:
+                response = "".join(self.daemon.stream(prompt, system_prompt, use_cache=False, command="prefetch"))
+            except DaemonError:
+                return None
+            return None if response == self._get_fallback_response(prompt) else response
+        
+        if not self.router:
+            return None
+        call_metrics: Dict[str, Any] = {}
+        try:
+            return self.router.complete(
+                system_prompt,
+                self._build_messages(prompt, None),
+                temperature=self.config.get('temperature', 0.7),
+                max_tokens=self.config.get('max_tokens', 2000),
+                metrics=call_metrics
+            )
+        except ProviderError:
+            return None
+        finally:
+            self.metrics.record(command="prefetch", cached=False, **call_metrics)
+    
+    def display_ai_response(self, prompt: str, system_prompt: str = None, status: str = "Thinking...",
+                            history: Optional[List[Dict[str, str]]] = None,
+                            metrics: Optional[Dict[str, Any]] = None) -> str:
+        """Render an AI response progressively and return the full text."""
+        from rich.live import Live
+        from rich.markdown import Markdown
+        
+        if not self.config.get('stream_responses', True):
+            with console.status(f"[bold green]{status}", spinner="dots"):
+                response = self.get_ai_response(prompt, system_prompt, history=history, metrics=metrics)
+            console.print(Markdown(response))
+            return response
+        
+        chunks = self.stream_ai_response(prompt, system_prompt, history=history, metrics=metrics)
+        
+        # Keep the spinner until the first token arrives
+        with console.status(f"[bold green]{status}", spinner="dots"):
+            response = next(chunks, "")
+        
+        # Re-parsing Markdown is the expensive part, so only rebuild it
+        # as often as Live actually repaints
+        refresh_per_second = 10
+        last_render = time.monotonic()
+        with Live(Markdown(response), console=console, refresh_per_second=refresh_per_second,
+                  vertical_overflow="visible") as live:
+            for chunk in chunks:
+                response += chunk
+                now = time.monotonic()
+                if now - last_render >= 1 / refresh_per_second:
+                    live.update(Markdown(response))
+                    last_render = now
+            live.update(Markdown(response))
+        
+        return response
     
     def _get_fallback_response(self, prompt: str) -> str:
         """Provide fallback responses when AI is not available."""
@@ -169,37 +575,81 @@ class MentorAgent:
         )
         console.print(welcome_panel)
     
-    def load_curriculum_day(self, week: int, day: int) -> Optional[str]:
-        """Load curriculum content for a specific day."""
-        curriculum_file = BASE_DIR / "curriculum" / f"week{week}" / f"day{day}.md"
-        
-        if curriculum_file.exists():
-            with open(curriculum_file, 'r', encoding='utf-8') as f:
-                return f.read()
-        return None
-    
     def start_learning_session(self):
         """Start a new learning session."""
         progress = self.progress_tracker.get_progress()
-        current_week = progress.get('current_week', 1)
-        current_day = progress.get('current_day', 1)
+        current_week = progress.current_week
+        current_day = progress.current_day
         
         console.print(f"\n[bold cyan]📅 Current Progress: Week {current_week}, Day {current_day}[/bold cyan]\n")
         
-        # Load curriculum for current day
-        curriculum_content = self.load_curriculum_day(current_week, current_day)
+        # Show curriculum for current day, rendered once per content change
+        entry = self.curriculum_index.get_day(current_week, current_day)
         
-        if curriculum_content:
-            console.print(Panel(Markdown(curriculum_content), title=f"Week {current_week} - Day {current_day}", border_style="green"))
+        if entry:
+            print_indexed_markdown(self.curriculum_index, entry["path"], title=f"Week {current_week} - Day {current_day}")
         else:
             console.print(f"[yellow]Curriculum content for Week {current_week}, Day {current_day} is being prepared...[/yellow]")
             self._show_day_outline(current_week, current_day)
         
+        if self.config.get('prefetch', {}).get('session_primer', False):
+            self._show_session_primer(current_week, current_day)
+            # Tomorrow's primer is prepared while today's session runs
+            next_day = self._next_day(current_week, current_day)
+            if next_day:
+                self._prefetch_session_primer(*next_day)
+        
         # Interactive session
         self._run_interactive_session(current_week, current_day)
     
+    def _next_day(self, week: int, day: int) -> Optional[tuple]:
+        """Get the (week, day) that advance_to_next_day moves to, or None after the last day."""
+        total_weeks = self.config.get('total_weeks', 8)
+        if day < self.config.get('days_per_week', 5):
+            return week, day + 1
+        return (week + 1, 1) if week < total_weeks else None
+    
+    def _session_primer_request(self, week: int, day: int) -> tuple:
+        """Build the prefetch key and prompt for a day's session primer."""
+        entry = self.curriculum_index.get_day(week, day)
+        if entry:
+            # Level 3 headings name the topics; level 2 ones are the session blocks
+            sections = [section["heading"] for section in entry["sections"] if section["level"] == 3]
+            key = f"primer:week{week}_day{day}:{entry['sha256'][:16]}"
+            title = entry["title"]
+        else:
+            sections, key, title = [], f"primer:week{week}_day{day}:outline", "the day's topics"
+        prompt = PRIMER_PROMPT.format(
+            week=week, day=day, title=title, sections=", ".join(sections) or "see the daily outline"
+        )
+        return key, prompt
+    
+    def _prefetch_session_primer(self, week: int, day: int):
+        """Prepare a day's session primer in the background."""
+        if not self.prefetcher:
+            return
+        key, prompt = self._session_primer_request(week, day)
+        self.prefetcher.submit(key, lambda: self.prefetch_response(prompt, PRIMER_SYSTEM_PROMPT))
+    
+    def _show_session_primer(self, week: int, day: int):
+        """Show the day's primer, instantly if it was prefetched."""
+        from rich.markdown import Markdown
+        
+        key, prompt = self._session_primer_request(week, day)
+        primer = self.prefetcher.store.get(key) if self.prefetcher else None
+        console.print("\n[bold magenta]🤖 Today's Primer[/bold magenta]\n")
+        if primer:
+            console.print(Markdown(primer))
+        else:
+            primer = self.display_ai_response(prompt, PRIMER_SYSTEM_PROMPT, status="Preparing today's primer...")
+            if self.prefetcher and primer != self._get_fallback_response(prompt):
+                self.prefetcher.store.put(key, primer)
+        console.print()
+    
     def _show_day_outline(self, week: int, day: int):
         """Show a general outline when specific content isn't available."""
+        from rich.markdown import Markdown
+        
         outline = f"""
 ## Week {week}, Day {day}
 
@@ -222,16 +672,78 @@ class MentorAgent:
         """
         console.print(Markdown(outline))
     
+    def _summarize_conversation(self, summary: str, turns: List[Dict[str, Any]], max_tokens: int) -> str:
+        """Fold conversation turns into the running summary with the AI provider."""
+        if not self.daemon and not self.router:
+            raise RuntimeError("No AI provider available for summarization")
+        from conversation import SUMMARY_PROMPT, format_turns
+        
+        prompt = SUMMARY_PROMPT.format(
+            words=max_tokens * 3 // 4,
+            summary=summary or "(none yet)",
+            turns=format_turns(turns)
+        )
+        response = self.get_ai_response(
+            prompt, "You summarize tutoring conversations.", use_cache=False, command="summary"
+        )
+        if not response or response == self._get_fallback_response(prompt):
+            raise RuntimeError("Summarization failed")
+        return response.strip()
+    
+    def conversation_memory(self, week: int, day: int, learner_id: Optional[str] = None) -> "ConversationMemory":
+        """Load the saved conversation for a day, in a directory of its own per learner when one is given."""
+        from conversation import ConversationMemory
+        
+        conversation_config = self.config.get('conversation', {})
+        sessions_dir = Path(conversation_config.get('sessions_dir', 'progress/sessions'))
+        if learner_id:
+            sessions_dir = sessions_dir / learner_id
+        return ConversationMemory(
+            session_file=sessions_dir / f"week{week}_day{day}.json",
+            history_tokens=conversation_config.get('history_tokens', 1500),
+            summary_tokens=conversation_config.get('summary_tokens', 300),
+            keep_turns=conversation_config.get('keep_turns', 2),
+            summarizer=self._summarize_conversation
+        )
+    
+    def session_request(self, memory: "ConversationMemory", question: str, week: int, day: int) -> Dict[str, Any]:
+        """Build the request for a session question, with the prompt's size by part.
+
+        Instructions, summary and history only grow between compactions, so
+        they form a prefix the provider can cache; the excerpts for this
+        question go in the final message.
+        """
+        from retrieval import estimate_tokens
+        
+        system_prompt = SESSION_SYSTEM_PROMPT.format(week=week, day=day)
+        summary_context = memory.system_context()
+        grounded_question = self.grounded_prompt(question, week, day)
+        history = memory.history_messages()
+        
+        prompt_tokens = {
+            "instructions": estimate_tokens(system_prompt),
+            "summary": estimate_tokens(summary_context),
+            "material": estimate_tokens(grounded_question) - estimate_tokens(question),
+            "history": sum(estimate_tokens(message["content"]) for message in history),
+            "question": estimate_tokens(question)
+        }
+        prompt_tokens["total"] = sum(prompt_tokens.values())
+        return {
+            "prompt": grounded_question,
+            "system_prompt": f"{system_prompt}\n\n{summary_context}" if summary_context else system_prompt,
+            "history": history,
+            "prompt_tokens": prompt_tokens
+        }
+    
     def _run_interactive_session(self, week: int, day: int):
         """Run an interactive learning session with the AI mentor."""
         console.print("\n[bold green]💬 Interactive Session Started[/bold green]")
         console.print("Ask me anything about today's topics, or type 'done' to finish.\n")
         
-        system_prompt = f"""You are an expert cloud platform engineering mentor. 
-You are teaching Week {week}, Day {day} of an 8-week bootcamp. 
-Be encouraging, provide clear explanations with examples, and guide the student 
-through concepts progressively. If they struggle, offer simpler explanations or analogies.
-Focus on practical, hands-on learning."""
+        memory = self.conversation_memory(week, day)
+        show_token_usage = self.config.get('conversation', {}).get('show_token_usage', True)
+        if memory.total_turns:
+            console.print(f"[dim]Resuming today's conversation ({memory.total_turns} earlier questions).[/dim]\n")
         
         while True:
             question = Prompt.ask("[bold cyan]You[/bold cyan]")
@@ -239,14 +751,33 @@ Focus on practical, hands-on learning."""
             if question.lower() in ['done', 'exit', 'quit']:
                 break
             
-            console.print("\n[bold magenta]🤖 Mentor[/bold magenta]: ", end="")
+            # Summarization of older turns runs while the learner is typing
+            memory.wait()
+            request = self.session_request(memory, question, week, day)
+            prompt_tokens = request["prompt_tokens"]
             
-            with console.status("[bold green]Thinking...", spinner="dots"):
-                response = self.get_ai_response(question, system_prompt)
+            console.print("\n[bold magenta]🤖 Mentor[/bold magenta]: ")
             
-            console.print(Markdown(response))
+            call_metrics: Dict[str, Any] = {}
+            answer = self.display_ai_response(request["prompt"], request["system_prompt"],
+                                              history=request["history"], metrics=call_metrics)
+            memory.add_turn(question, answer, prompt_tokens)
+            memory.compact_in_background()
+            
+            if show_token_usage:
+                usage = (
+                    f"Prompt ≈ {prompt_tokens['total']} tokens "
+                    f"(summary {prompt_tokens['summary']}, history {prompt_tokens['history']}, "
+                    f"material {prompt_tokens['material']}, question {prompt_tokens['question']})"
+                )
+                if call_metrics.get("cached_tokens"):
+                    usage += (f"; {call_metrics['cached_tokens']} of {call_metrics['prompt_tokens']} "
+                              "read from the provider's prompt cache")
+                console.print(f"[dim]{usage}[/dim]")
             console.print()
         
+        memory.wait()
+        
         # Mark day as completed
         if Confirm.ask("\n[bold green]Did you complete today's learning?[/bold green]"):
             self.progress_tracker.complete_day(week, day)
@@ -260,14 +791,14 @@ Focus on practical, hands-on learning."""
 # CLI Commands
 
 @app.command()
-def start():
+def start(no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the response cache")):
     """Start the bootcamp or continue from where you left off."""
-    agent = MentorAgent()
+    agent = MentorAgent(use_cache=not no_cache, command="session")
     agent.display_welcome()
     
     progress = agent.progress_tracker.get_progress()
     
-    if not progress.get('started'):
+    if not progress.started:
         console.print("\n[bold cyan]Let's get you started![/bold cyan]\n")
         name = Prompt.ask("What's your name?")
         agent.progress_tracker.initialize_progress(name)
@@ -277,30 +808,84 @@ def start():
 
 
 @app.command()
-def ask(question: str):
+def ask(question: str,
+        no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the response and question caches")):
     """Ask the AI mentor a question about any topic."""
-    agent = MentorAgent()
+    agent = MentorAgent(use_cache=not no_cache, command="ask")
     
     console.print(f"\n[bold cyan]Question:[/bold cyan] {question}\n")
     console.print("[bold magenta]🤖 Mentor:[/bold magenta]\n")
     
-    with console.status("[bold green]Thinking...", spinner="dots"):
-        system_prompt = """You are an expert cloud platform engineering mentor. 
-Provide clear, practical answers with examples. If relevant, include commands, 
-code snippets, or step-by-step instructions."""
-        response = agent.get_ai_response(question, system_prompt)
+    match = agent.similar_answer(question)
+    if match:
+        from rich.markdown import Markdown
+        
+        console.print(Markdown(match["answer"]))
+        console.print(f"\n[dim]Answered from an earlier question, \"{match['question']}\" "
+                      f"({match['similarity']:.0%} similar). Use --no-cache for a fresh answer.[/dim]")
+        console.print()
+        return
     
-    console.print(Markdown(response))
+    progress = agent.progress_tracker.get_progress()
+    prompt = agent.grounded_prompt(question, progress.current_week, progress.current_day)
+    metrics: Dict[str, Any] = {}
+    answer = agent.display_ai_response(prompt, ASK_SYSTEM_PROMPT, metrics=metrics)
+    agent.remember_answer(question, answer, metrics)
     console.print()
 
 
+@app.command()
+def batch(
+    input_file: str = typer.Argument("-", help="JSONL file of questions, or '-' for stdin"),
+    output: str = typer.Option("-", "--output", "-o", help="Where to write JSONL answers ('-' for stdout)"),
+    concurrency: int = typer.Option(0, help="Maximum requests in flight (default from config.yaml)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the response cache")
+):
+    """Answer many questions concurrently from a JSONL file or stdin."""
+    from batch_runner import run_batch
+    
+    agent = MentorAgent(use_cache=not no_cache, connect_daemon=False, command="batch")
+    batch_config = agent.config.get('batch', {})
+    stderr = Console(stderr=True)
+    agent.diagnostics = stderr
+    
+    input_stream = sys.stdin if input_file == "-" else open(input_file, 'r', encoding='utf-8')
+    output_stream = sys.stdout if output == "-" else open(output, 'w', encoding='utf-8')
+    try:
+        stats = run_batch(
+            agent, input_stream, output_stream,
+            system_prompt=ASK_SYSTEM_PROMPT,
+            concurrency=concurrency or batch_config.get('concurrency', 8),
+            max_retries=batch_config.get('max_retries', 5)
+        )
+    except ValueError as e:
+        stderr.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    
+    answered = stats['answered'] + stats['cached']
+    if not stats['failed']:
+        summary = f"[bold green]✅ {stats['total']} questions:[/bold green]"
+    else:
+        style = "bold yellow" if answered else "bold red"
+        summary = f"[{style}]{stats['total']} questions:[/{style}]"
+    stderr.print(f"{summary} {stats['answered']} answered, {stats['cached']} from cache, "
+                 f"{stats['failed']} failed, {stats['retries']} retries")
+    if stats['failed'] or (stats['total'] and not answered):
+        raise typer.Exit(1)
+
+
 @app.command()
 def progress():
     """View your learning progress and statistics."""
-    tracker = ProgressTracker()
+    tracker = create_progress_tracker(load_config())
     progress_data = tracker.get_progress()
     
-    if not progress_data.get('started'):
+    if not progress_data.started:
         console.print("[yellow]You haven't started the bootcamp yet. Run 'python mentor_agent.py start' to begin![/yellow]")
         return
     
@@ -309,11 +894,11 @@ def progress():
     table.add_column("Metric", style="cyan", no_wrap=True)
     table.add_column("Value", style="green")
     
-    table.add_row("Current Week", str(progress_data.get('current_week', 1)))
-    table.add_row("Current Day", str(progress_data.get('current_day', 1)))
-    table.add_row("Total Days Completed", str(progress_data.get('days_completed', 0)))
-    table.add_row("Current Streak", f"{progress_data.get('streak', 0)} days")
-    table.add_row("Started On", progress_data.get('start_date', 'N/A'))
+    table.add_row("Current Week", str(progress_data.current_week))
+    table.add_row("Current Day", str(progress_data.current_day))
+    table.add_row("Total Days Completed", str(progress_data.days_completed))
+    table.add_row("Current Streak", f"{progress_data.streak} days")
+    table.add_row("Started On", progress_data.start_date or 'N/A')
     
     console.print(table)
     
@@ -323,40 +908,216 @@ def progress():
     weeks_table.add_column("Status", style="green")
     
     for week in range(1, 9):
-        completed = progress_data.get('completed_weeks', {}).get(str(week), False)
-        status = "✅ Completed" if completed else "⏳ In Progress" if week == progress_data.get('current_week') else "🔒 Locked"
+        completed = week in progress_data.completed_weeks
+        status = "✅ Completed" if completed else "⏳ In Progress" if week == progress_data.current_week else "🔒 Locked"
         weeks_table.add_row(f"Week {week}", status)
     
     console.print(weeks_table)
 
 
+def _read_assessment_answers(assessment: Dict[str, Any]) -> Dict[str, str]:
+    """Ask each assessment question in the terminal."""
+    answers = {}
+    for question in assessment["questions"]:
+        if question["kind"] == "choice":
+            answers[question["id"]] = Prompt.ask(
+                f"[cyan]{question['title']}[/cyan] {question['prompt']}", choices=list(question["options"])
+            )
+            continue
+        
+        what = "commands" if question["kind"] == "command" else "answer"
+        console.print(f"\n[bold cyan]{question['title']}[/bold cyan] ({question['points']} points)")
+        console.print(f"[dim]Type your {what}, then an empty line to finish.[/dim]")
+        lines = []
+        while True:
+            line = console.input("  ")
+            if not line.strip():
+                break
+            lines.append(line)
+        answers[question["id"]] = "\n".join(lines)
+    return answers
+
+
+def _print_grades(assessment: Dict[str, Any], result: Dict[str, Any]):
+    """Show per-question points and the overall score."""
+    titles = {question["id"]: question["title"] for question in assessment["questions"]}
+    table = Table(title=f"📝 {assessment['title']}: Results", border_style="cyan")
+    table.add_column("Question", style="cyan")
+    table.add_column("Points", justify="right")
+    table.add_column("Feedback")
+    for question_id, graded in result["questions"].items():
+        style = "green" if graded["points"] == graded["max_points"] else "yellow" if graded["points"] else "red"
+        feedback = graded["feedback"]
+        if graded["graded_by"] == "keywords":
+            feedback += " [dim](estimated from the answer key)[/dim]"
+        table.add_row(titles[question_id], f"[{style}]{graded['points']:g} / {graded['max_points']}[/{style}]",
+                      feedback)
+    console.print(table)
+    verdict = "[bold green]Passed[/bold green]" if result["passed"] else "[bold yellow]Not passed yet[/bold yellow]"
+    bonus = " with the bonus" if any(question["bonus"] for question in assessment["questions"]) else ""
+    console.print(f"\nScore: [bold]{result['score']:g}%[/bold] "
+                  f"({result['earned']:g} of {result['total']} points{bonus}, passing is {assessment['passing_score']}%). {verdict}")
+
+
 @app.command()
-def assess(week: int = typer.Option(1, help="Week number for assessment")):
+def assess(
+    week: int = typer.Option(1, help="Week number for assessment"),
+    submission: Optional[str] = typer.Option(None, "--submission", "-s",
+                                             help="Grade a saved submission file instead of answering here"),
+    template: bool = typer.Option(False, "--template", help="Print an empty submission file to fill in")
+):
     """Take a weekly assessment to test your knowledge."""
-    assessment_file = BASE_DIR / "assessments" / f"week{week}_assessment.md"
+    from assessment_engine import load_assessment, parse_submission, submission_template, grade_submission
     
-    if not assessment_file.exists():
+    config = load_config()
+    assessment = load_assessment(BASE_DIR, week)
+    if not assessment:
         console.print(f"[yellow]Assessment for Week {week} is being prepared...[/yellow]")
         return
     
-    console.print(f"\n[bold cyan]📝 Week {week} Assessment[/bold cyan]\n")
+    if template:
+        # Plain stdout, so the template can be redirected to a file
+        print(submission_template(assessment))
+        return
+    
+    if submission:
+        try:
+            answers = parse_submission(Path(submission).read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            console.print(f"[red]Could not read {submission}: {e}[/red]")
+            raise typer.Exit(1)
+    else:
+        index = load_curriculum_index(config)
+        console.print(f"\n[bold cyan]📝 Week {week} Assessment[/bold cyan]\n")
+        print_indexed_markdown(index, index.get_assessment(week)["path"])
+        
+        if not assessment["gradable"]:
+            # No answer key yet: the learner marks their own work
+            console.print("\n[bold green]Complete the assessment and check your answers.[/bold green]")
+            if Confirm.ask("\nWould you like to record your score?"):
+                score = IntPrompt.ask("Your score (0-100)")
+                create_progress_tracker(config).complete_week_assessment(week, max(0, min(score, 100)))
+                console.print("[bold green]✅ Score recorded.[/bold green]")
+            return
+        
+        if not Confirm.ask("\nReady to answer the questions here?", default=True):
+            console.print(f"[dim]Or save your answers in a file (python mentor_agent.py assess --week {week} "
+                          f"--template > answers.md) and grade it with --submission answers.md.[/dim]")
+            return
+        answers = _read_assessment_answers(assessment)
     
-    with open(assessment_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-        console.print(Markdown(content))
+    if not assessment["gradable"]:
+        console.print(f"[yellow]Week {week} has no answer key yet, so submissions can't be graded.[/yellow]")
+        raise typer.Exit(1)
     
-    console.print("\n[bold green]Complete the assessment and check your answers.[/bold green]")
+    agent = MentorAgent(connect_daemon=False, command="assess")
+    ai_grading = config.get('assessments', {}).get('ai_grading', True) and agent.router
+    with console.status("[bold green]Grading...", spinner="dots"):
+        result = grade_submission(assessment, answers, agent.grade_answers if ai_grading else None)
+    _print_grades(assessment, result)
     
-    if Confirm.ask("\nDid you pass the assessment (score >= 70%)?"):
-        tracker = ProgressTracker()
-        tracker.complete_week_assessment(week, 100)  # Simplified for now
+    create_progress_tracker(config).complete_week_assessment(week, result["score"])
+    if result["passed"]:
         console.print("[bold green]✅ Congratulations! Assessment completed.[/bold green]")
+    else:
+        console.print("[yellow]Score recorded. Review the feedback above and try again when you're ready.[/yellow]")
 
 
 @app.command()
-def standup():
+def grade(
+    directory: str = typer.Argument(..., help="Directory of submission files, one per learner (searched recursively)"),
+    week: int = typer.Option(1, help="Week of the assessment"),
+    output: str = typer.Option("", "--output", "-o",
+                               help="CSV file for the grades (default reports/week<N>_grades.csv)"),
+    record: bool = typer.Option(False, "--record", help="Record each score in the cohort database"),
+    workers: int = typer.Option(0, help="Processes parsing and checking submissions (default from config.yaml)"),
+    concurrency: int = typer.Option(0, help="Submissions graded by the AI at once (default from config.yaml)"),
+    no_ai: bool = typer.Option(False, "--no-ai", help="Score written answers with the answer key's checks only")
+):
+    """Grade a whole cohort's assessment submissions and optionally record the scores."""
+    import csv
+    from assessment_engine import load_assessment, grade_submissions
+    
+    config = load_config()
+    assessment_config = config.get('assessments', {})
+    assessment = load_assessment(BASE_DIR, week)
+    if not assessment or not assessment["gradable"]:
+        console.print(f"[red]Week {week} has no assessment with an answer key to grade against.[/red]")
+        raise typer.Exit(1)
+    if not Path(directory).is_dir():
+        console.print(f"[red]No such directory: {directory}[/red]")
+        raise typer.Exit(1)
+    if record and config.get('progress_backend') != 'sqlite':
+        console.print("[yellow]Recording cohort scores needs progress_backend: \"sqlite\" in config.yaml.[/yellow]")
+        raise typer.Exit(1)
+    
+    agent = MentorAgent(connect_daemon=False, command="grade")
+    ai_grading = not no_ai and assessment_config.get('ai_grading', True) and agent.router
+    start_time = time.perf_counter()
+    with console.status("[bold green]Grading submissions...", spinner="dots"):
+        results = grade_submissions(
+            assessment, Path(directory),
+            complete=agent.grade_answers if ai_grading else None,
+            workers=workers or assessment_config.get('workers') or None,
+            concurrency=concurrency or assessment_config.get('concurrency', 8)
+        )
+    elapsed = time.perf_counter() - start_time
+    graded = [result for result in results if "error" not in result]
+    
+    output_file = Path(output or f"reports/week{week}_grades.csv")
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    question_ids = [question["id"] for question in assessment["questions"]]
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["learner_id", "score", "passed", "earned", "total"] + question_ids + ["error"])
+        for result in results:
+            if "error" in result:
+                writer.writerow([result["learner_id"]] + [""] * (4 + len(question_ids)) + [result["error"]])
+                continue
+            writer.writerow(
+                [result["learner_id"], f"{result['score']:g}", result["passed"], f"{result['earned']:g}",
+                 result["total"]]
+                + [f"{result['questions'][question_id]['points']:g}" for question_id in question_ids] + [""]
+            )
+    
+    recorded = unknown = 0
+    if record:
+        database = open_database(Path(config.get('progress_db', 'progress/cohort.sqlite')))
+        for result in graded:
+            if not database.storage_for(result["learner_id"]).exists():
+                unknown += 1
+                continue
+            tracker = create_progress_tracker(dict(config, learner_id=result["learner_id"]))
+            tracker.complete_week_assessment(week, result["score"])
+            recorded += 1
+    
+    table = Table(title=f"📝 Week {week} Grades", border_style="cyan")
+    table.add_column("Metric", style="cyan", no_wrap=True)
+    table.add_column("Value", style="green")
+    table.add_row("Submissions", str(len(results)))
+    if graded:
+        passed = sum(result["passed"] for result in graded)
+        table.add_row("Mean Score", f"{sum(result['score'] for result in graded) / len(graded):.1f}%")
+        table.add_row("Passed", f"{passed} ({passed / len(graded):.0%})")
+    ai_graded = sum(
+        any(item["graded_by"] == "ai" for item in result["questions"].values()) for result in graded
+    )
+    table.add_row("Written Answers Graded By", f"AI for {ai_graded}, answer key checks for {len(graded) - ai_graded}")
+    table.add_row("Time", f"{elapsed:.2f} s")
+    console.print(table)
+    
+    if len(results) > len(graded):
+        console.print(f"[yellow]{len(results) - len(graded)} files could not be read; see the CSV.[/yellow]")
+    if record:
+        console.print(f"[green]✅ Recorded {recorded} scores.[/green]"
+                      + (f" [yellow]{unknown} learners aren't in the cohort database.[/yellow]" if unknown else ""))
+    console.print(f"[green]✅ Wrote {output_file}[/green]")
+
+
+@app.command()
+def standup(no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the response cache")):
     """Daily standup - reflect on your progress and set goals."""
-    agent = MentorAgent()
+    agent = MentorAgent(use_cache=not no_cache, command="standup")
     
     console.print("\n[bold cyan]📅 Daily Standup[/bold cyan]\n")
     
@@ -366,39 +1127,37 @@ def standup():
     
     console.print("\n[bold magenta]🤖 Mentor Feedback:[/bold magenta]\n")
     
-    prompt = f"""
-Daily Standup Summary:
-- Yesterday: {yesterday}
-- Today's Focus: {today}
-- Blockers: {blockers}
+    prompt = STANDUP_PROMPT.format(yesterday=yesterday, today=today, blockers=blockers)
+    agent.display_ai_response(prompt, status="Analyzing...")
+
+
+def _interview_pool(topic: str) -> str:
+    """Prefetch key prefix for a topic's ready questions, tied to the exact prompt that generates them."""
+    prompt = INTERVIEW_QUESTION_PROMPT.format(topic=topic)
+    return f"interview:{topic}:{hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]}:"
 
-Provide encouraging feedback and actionable advice for today's learning.
-    """
-    
-    with console.status("[bold green]Analyzing...", spinner="dots"):
-        response = agent.get_ai_response(prompt)
-    
-    console.print(Markdown(response))
+
+def _prefetch_interview_questions(agent: MentorAgent, topics: List[str]):
+    """Top up the pool of ready interview questions for each topic."""
+    if not agent.prefetcher:
+        return
+    per_topic = agent.config.get('prefetch', {}).get('interview_questions_per_topic', 1)
+    for topic in topics:
+        prefix = _interview_pool(topic)
+        missing = per_topic - len(agent.prefetcher.store.keys(prefix)) - len(agent.prefetcher.pending(prefix))
+        prompt = INTERVIEW_QUESTION_PROMPT.format(topic=topic)
+        for _ in range(missing):
+            agent.prefetcher.submit(f"{prefix}{time.time_ns()}", functools.partial(agent.prefetch_response, prompt))
 
 
 @app.command()
-def interview():
+def interview(no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the response cache")):
     """Practice platform engineering interview questions."""
-    agent = MentorAgent()
+    agent = MentorAgent(use_cache=not no_cache, command="interview")
     
     console.print("\n[bold cyan]🎯 Interview Practice[/bold cyan]\n")
     
-    topics = [
-        "Linux and system administration",
-        "Docker and containerization",
-        "Kubernetes orchestration",
-        "CI/CD pipelines",
-        "Infrastructure as Code (Terraform)",
-        "Cloud platforms (AWS/Azure/GCP)",
-        "Monitoring and observability",
-        "Security best practices"
-    ]
-    
+    topics = INTERVIEW_TOPICS
     console.print("[bold green]Choose a topic:[/bold green]\n")
     for i, topic in enumerate(topics, 1):
         console.print(f"  {i}. {topic}")
@@ -408,49 +1167,405 @@ def interview():
     
     console.print(f"\n[bold magenta]🤖 Interviewer:[/bold magenta]\n")
     
-    prompt = f"Generate a realistic platform engineering interview question about {topic}. Make it practical and scenario-based."
-    
-    with console.status("[bold green]Preparing question...", spinner="dots"):
-        question = agent.get_ai_response(prompt)
+    prompt = INTERVIEW_QUESTION_PROMPT.format(topic=topic)
+    question = None
+    if agent.prefetcher:
+        prefix = _interview_pool(topic)
+        if not agent.prefetcher.store.keys(prefix) and agent.prefetcher.pending(prefix):
+            with console.status("[bold green]Preparing question...", spinner="dots"):
+                agent.prefetcher.wait(prefix, timeout=agent.config.get('providers', {}).get('timeout', 120))
+        question = agent.prefetcher.store.take(prefix)
     
-    console.print(Markdown(question))
+    if question:
+        from rich.markdown import Markdown
+        
+        console.print(Markdown(question))
+    else:
+        question = agent.display_ai_response(prompt, status="Preparing question...")
+    # The next question on this topic is prepared while the learner answers
+    _prefetch_interview_questions(agent, [topic])
     console.print("\n[bold cyan]Take your time to answer...[/bold cyan]\n")
     
     answer = Prompt.ask("Your answer")
     
     console.print("\n[bold magenta]🤖 Feedback:[/bold magenta]\n")
     
-    feedback_prompt = f"""
-Interview Question: {question}
-Candidate's Answer: {answer}
+    feedback_prompt = INTERVIEW_FEEDBACK_PROMPT.format(question=question, answer=answer)
+    agent.display_ai_response(feedback_prompt, status="Evaluating...")
 
-Provide constructive feedback on this answer. Highlight strengths and areas for improvement.
-    """
+
+@app.command()
+def resources(topic: str = typer.Option("", help="Specific topic to find resources for")):
+    """Get curated learning resources for a topic."""
+    if topic:
+        from rich.markdown import Markdown
+        
+        results = load_search_index(load_config()).search(topic, limit=5, kinds=["resources"])
+        if not results:
+            console.print(f"[yellow]No resources found for '{topic}'. Try `search` to look through the curriculum.[/yellow]")
+            return
+        
+        for result in results:
+            location = " › ".join(result["trail"] + [result["heading"]])
+            console.print(Panel(Markdown(result["text"]), title=location, subtitle=result["path"], border_style="cyan"))
+        return
     
-    with console.status("[bold green]Evaluating...", spinner="dots"):
-        feedback = agent.get_ai_response(feedback_prompt)
+    index = load_curriculum_index(load_config())
     
-    console.print(Markdown(feedback))
+    if not print_indexed_markdown(index, "resources/links.md"):
+        console.print("[yellow]Resources are being curated... Check back soon![/yellow]")
 
 
 @app.command()
-def resources(topic: str = typer.Option("", help="Specific topic to find resources for")):
-    """Get curated learning resources for a topic."""
-    resources_file = BASE_DIR / "resources" / "links.md"
+def search(
+    query: str,
+    limit: int = typer.Option(10, help="Maximum number of results"),
+    kind: str = typer.Option("", help="Only search one area: curriculum, assessments, exercises, resources or docs")
+):
+    """Search the curriculum, assessments, exercises, resources and docs."""
+    search_index = load_search_index(load_config())
+    
+    start_time = time.perf_counter()
+    results = search_index.search(query, limit=limit, kinds=[kind] if kind else None)
+    elapsed = time.perf_counter() - start_time
+    
+    if not results:
+        console.print(f"[yellow]No matches for '{query}'.[/yellow]")
+        return
+    
+    table = Table(title=f"🔎 {query}", border_style="cyan", show_lines=True)
+    table.add_column("Where", style="cyan", overflow="fold")
+    table.add_column("Section", style="green")
+    table.add_column("Snippet")
+    
+    for result in results:
+        section = " › ".join(result["trail"] + [result["heading"]])
+        table.add_row(f"{result['path']}:{result['line']}", section, result["snippet"])
+    
+    console.print(table)
+    console.print(f"[dim]{len(results)} results in {elapsed * 1000:.1f} ms[/dim]")
+
+
+@app.command(name="index")
+def index_command(rebuild: bool = typer.Option(False, "--rebuild", help="Discard cached content and reprocess every file")):
+    """Build the curriculum index and show what it contains."""
+    index = CurriculumIndex(BASE_DIR, Path(load_config().get('curriculum_cache', '.cache/curriculum')))
+    if rebuild:
+        index.clear_cache()
+    
+    start_time = time.perf_counter()
+    reprocessed = index.refresh(force=rebuild)
+    elapsed = time.perf_counter() - start_time
+    
+    table = Table(title="📚 Curriculum Index", border_style="cyan")
+    table.add_column("File", style="cyan")
+    table.add_column("Title", style="green")
+    table.add_column("Sections", justify="right")
+    
+    for path, entry in sorted(index.files.items()):
+        marker = " [yellow]*[/yellow]" if path in reprocessed else ""
+        table.add_row(path + marker, entry["title"], str(len(entry["sections"])))
+    
+    console.print(table)
+    console.print(f"[dim]{len(index.files)} files indexed, {len(reprocessed)} reprocessed (*) in {elapsed * 1000:.0f} ms[/dim]")
+
+
+@app.command()
+def cache(clear: bool = typer.Option(False, "--clear", help="Remove all cached responses and questions")):
+    """Show response and question cache statistics."""
+    config = load_config()
+    response_cache = ResponseCache.from_config(config.get('response_cache', {}))
+    question_cache = QuestionCache.from_config(config.get('question_cache', {}))
+    
+    if clear:
+        response_cache.clear()
+        question_cache.clear()
+        console.print("[bold green]✅ Response and question caches cleared.[/bold green]")
+        return
+    
+    for title, stats in (("🗄️  Response Cache", response_cache.stats()),
+                         ("❓ Question Cache", question_cache.stats())):
+        table = Table(title=title, border_style="cyan")
+        table.add_column("Metric", style="cyan", no_wrap=True)
+        table.add_column("Value", style="green")
+        
+        table.add_row("Entries", f"{stats['entries']} / {stats['max_entries']}")
+        table.add_row("Hits", str(stats['hits']))
+        table.add_row("Misses", str(stats['misses']))
+        table.add_row("Hit Rate", f"{stats['hit_rate']:.0%}")
+        
+        console.print(table)
+
+
+@app.command()
+def stats(
+    days: int = typer.Option(7, help="Only include calls from the last N days (0 for all)"),
+    clear: bool = typer.Option(False, "--clear", help="Remove all recorded metrics")
+):
+    """Show AI call latency percentiles and token spend per command and model."""
+    from metrics import MetricsRecorder, summarize
+    
+    recorder = MetricsRecorder.from_config(load_config().get('metrics', {}))
+    
+    if clear:
+        recorder.clear()
+        console.print("[bold green]✅ Metrics cleared.[/bold green]")
+        return
+    
+    since = time.time() - days * 86400 if days else None
+    records = list(recorder.read(since))
+    if not records:
+        console.print("[yellow]No AI calls recorded yet. Metrics are written to "
+                      f"{recorder.metrics_file} as you use the mentor.[/yellow]")
+        return
+    
+    for group_by, title in (("command", "⏱️  AI Calls by Command"), ("model", "🤖 AI Calls by Model")):
+        table = Table(title=title, border_style="cyan")
+        table.add_column(group_by.title(), style="cyan", no_wrap=True)
+        table.add_column("Calls", justify="right")
+        table.add_column("Cached", justify="right")
+        table.add_column("Errors", justify="right")
+        table.add_column("p50", justify="right", style="green")
+        table.add_column("p95", justify="right", style="yellow")
+        table.add_column("p99", justify="right", style="red")
+        table.add_column("1st Token", justify="right")
+        table.add_column("Tokens In", justify="right")
+        table.add_column("Tokens Out", justify="right")
+        for key, summary in summarize(records, group_by).items():
+            table.add_row(
+                key,
+                str(summary['calls']),
+                f"{summary['cached'] / summary['calls']:.0%}",
+                str(summary['errors']),
+                f"{summary['p50_ms']:.0f}ms",
+                f"{summary['p95_ms']:.0f}ms",
+                f"{summary['p99_ms']:.0f}ms",
+                f"{summary['first_token_p50_ms']:.0f}ms",
+                f"{summary['prompt_tokens']:,}",
+                f"{summary['completion_tokens']:,}"
+            )
+        console.print(table)
+    
+    calls = [record for record in records if not record.get("cached")]
+    prompt_tokens = sum(record.get("prompt_tokens") or 0 for record in calls)
+    cached_tokens = sum(record.get("cached_tokens") or 0 for record in calls)
+    if cached_tokens:
+        console.print(f"Prompt cache: {cached_tokens:,} of {prompt_tokens:,} prompt tokens "
+                      f"({cached_tokens / prompt_tokens:.0%}) were served from the provider's cache")
+    
+    period = f"the last {days} days" if days else "all time"
+    console.print(f"[dim]{len(records)} calls over {period}, from {recorder.metrics_file}[/dim]")
+
+
+@app.command()
+def cohort(
+    leaderboard: int = typer.Option(10, help="Number of learners to show on the streak leaderboard"),
+    stuck_week: int = typer.Option(0, help="Show learners stuck on this week"),
+    idle_days: int = typer.Option(3, help="Days without activity before a learner counts as stuck"),
+    award_badges: bool = typer.Option(False, "--award-badges", help="Evaluate every badge rule for every learner")
+):
+    """Cohort overview: streak leaderboard and learners who are stuck."""
+    config = load_config()
+    if config.get('progress_backend') != 'sqlite':
+        console.print("[yellow]Cohort queries need progress_backend: \"sqlite\" in config.yaml.[/yellow]")
+        return
+    
+    database = open_database(Path(config.get('progress_db', 'progress/cohort.sqlite')))
+    
+    if award_badges:
+        awarded = award_cohort_badges(database, load_achievements(config))
+        table = Table(title="🏆 Badges Awarded", border_style="green")
+        table.add_column("Learner", style="cyan")
+        table.add_column("New Badges")
+        for learner_id, badges in awarded.items():
+            table.add_row(learner_id, ", ".join(badges))
+        console.print(table)
+        console.print(f"[dim]{sum(len(badges) for badges in awarded.values())} badges awarded to "
+                      f"{len(awarded)} learners.[/dim]")
+        return
+    
+    if stuck_week:
+        table = Table(title=f"🧗 Stuck on Week {stuck_week} ({idle_days}+ days idle)", border_style="yellow")
+        table.add_column("Learner", style="cyan")
+        table.add_column("Name")
+        table.add_column("Day", justify="right")
+        table.add_column("Last Active", style="yellow")
+        for row in database.stuck_learners(stuck_week, idle_days):
+            table.add_row(row['learner_id'], row['user_name'], str(row['current_day']),
+                          row['last_activity_date'] or "never")
+        console.print(table)
+        return
+    
+    table = Table(title="🔥 Streak Leaderboard", border_style="cyan")
+    table.add_column("#", justify="right")
+    table.add_column("Learner", style="cyan")
+    table.add_column("Name")
+    table.add_column("Streak", style="green", justify="right")
+    table.add_column("Days Completed", justify="right")
+    table.add_column("Position")
+    for rank, row in enumerate(database.streak_leaderboard(leaderboard), 1):
+        table.add_row(str(rank), row['learner_id'], row['user_name'], f"{row['streak']} days",
+                      str(row['days_completed']), f"Week {row['current_week']}, Day {row['current_day']}")
+    console.print(table)
+
+
+@app.command(name="cohort-report")
+def cohort_report(
+    directory: str = typer.Argument(..., help="Directory of learners' progress files (searched recursively)"),
+    output: str = typer.Option("reports/cohort", "--output", "-o", help="Directory to write the report to"),
+    formats: str = typer.Option("md,csv", "--format", help="Comma-separated: md, csv, parquet"),
+    workers: int = typer.Option(0, help="Processes parsing progress files (default: CPU count)")
+):
+    """Funnels, streaks, pass rates and skills across many learners' progress files."""
+    try:
+        from cohort_report import load_cohort, analyze, write_report
+    except ModuleNotFoundError as e:
+        if e.name != "numpy":
+            raise
+        console.print("[red]The cohort report needs NumPy: pip install numpy[/red]")
+        raise typer.Exit(1)
+    
+    requested = [name.strip() for name in formats.split(",") if name.strip()]
+    unknown = set(requested) - {"md", "csv", "parquet"}
+    if unknown:
+        console.print(f"[red]Unknown format: {', '.join(sorted(unknown))}[/red]")
+        raise typer.Exit(1)
+    if not Path(directory).is_dir():
+        console.print(f"[red]No such directory: {directory}[/red]")
+        raise typer.Exit(1)
+    
+    config = load_config()
+    with console.status("[bold green]Loading progress files...", spinner="dots"):
+        cohort = load_cohort(Path(directory), config.get('total_weeks', 8), config.get('days_per_week', 5),
+                             workers=workers or None)
+        analysis = analyze(cohort, passing_score=config.get('passing_score', 70))
+    
+    try:
+        written = write_report(cohort, analysis, Path(output), requested)
+    except ModuleNotFoundError as e:
+        if e.name != "pyarrow":
+            raise
+        console.print("[red]Parquet output needs pyarrow: pip install pyarrow[/red]")
+        raise typer.Exit(1)
+    
+    overview = analysis['overview']
+    table = Table(title="👥 Cohort Completion", border_style="cyan")
+    table.add_column("Week", justify="right", style="cyan")
+    table.add_column("Completed", justify="right")
+    table.add_column("Assessment Pass Rate", justify="right", style="green")
+    table.add_column("Mean Score", justify="right")
+    for week, assessment in zip(analysis['weeks'], analysis['assessments']):
+        table.add_row(str(week['week']), f"{week['learners']} ({week['rate']:.0%})",
+                      f"{assessment['pass_rate']:.0%} of {assessment['attempts']}",
+                      f"{assessment['mean_score']:.1f}")
+    console.print(table)
+    console.print(f"{overview['learners']} learners, {overview['started']} started, "
+                  f"{overview['active']} active in the last week")
+    if analysis['errors']:
+        console.print(f"[yellow]{len(analysis['errors'])} files could not be read; see the report.[/yellow]")
+    for path in written:
+        console.print(f"[green]✅ Wrote {path}[/green]")
+
+
+@app.command()
+def daemon(
+    action: str = typer.Argument("status", help="start, stop or status"),
+    detach: bool = typer.Option(False, "--detach", help="Start the daemon in the background")
+):
+    """Run a local daemon that keeps AI connections warm between commands."""
+    import subprocess
+    
+    from mentor_daemon import DaemonClient, DaemonError, MentorDaemon
+    
+    socket_path = load_config().get('daemon', {}).get('socket', '.cache/mentor.sock')
+    client = DaemonClient(socket_path, timeout=5)
+    status = client.ping()
+    
+    if action == "status":
+        if status:
+            console.print(f"[bold green]✅ Daemon running[/bold green] (pid {status['pid']}, "
+                          f"provider {status['provider']}, up {status['uptime']:.0f}s, "
+                          f"{status['requests_served']} requests served)")
+        else:
+            console.print("[yellow]Daemon is not running. Start it with 'python mentor_agent.py daemon start'.[/yellow]")
+    
+    elif action == "start":
+        if status:
+            console.print(f"[yellow]Daemon already running (pid {status['pid']}).[/yellow]")
+            return
+        
+        if detach:
+            subprocess.Popen(
+                [sys.executable, str(Path(__file__).resolve()), "daemon", "start"],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+            for _ in range(100):
+                time.sleep(0.1)
+                status = client.ping()
+                if status:
+                    console.print(f"[bold green]✅ Daemon started (pid {status['pid']}).[/bold green]")
+                    return
+            console.print("[red]Daemon did not start; run it in the foreground to see errors.[/red]")
+            raise typer.Exit(1)
+        
+        console.print(f"[bold green]Mentor daemon listening on {socket_path}[/bold green] (Ctrl+C to stop)")
+        try:
+            MentorDaemon(lambda: MentorAgent(connect_daemon=False), socket_path).serve_forever()
+        except DaemonError as e:
+            console.print(f"[red]{e}[/red]")
+            raise typer.Exit(1)
+        except KeyboardInterrupt:
+            pass
+    
+    elif action == "stop":
+        if not status:
+            console.print("[yellow]Daemon is not running.[/yellow]")
+            return
+        client.shutdown()
+        console.print("[bold green]✅ Daemon stopped.[/bold green]")
     
-    if resources_file.exists():
-        with open(resources_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            console.print(Markdown(content))
     else:
-        console.print("[yellow]Resources are being curated... Check back soon![/yellow]")
+        console.print(f"[red]Unknown action '{action}'. Use start, stop or status.[/red]")
+        raise typer.Exit(1)
+
+
+@app.command()
+def serve(
+    host: Optional[str] = typer.Option(None, help="Address to listen on (default: web.host in config.yaml)"),
+    port: Optional[int] = typer.Option(None, help="Port to listen on (default: web.port in config.yaml)")
+):
+    """Serve the mentor over HTTP to a whole cohort, streaming answers as they are written."""
+    import importlib.util
+    
+    config = load_config()
+    if config.get('progress_backend') != 'sqlite':
+        console.print("[yellow]Serving a cohort needs progress_backend: \"sqlite\" in config.yaml.[/yellow]")
+        raise typer.Exit(1)
+    if importlib.util.find_spec("uvicorn") is None:
+        console.print("[red]The web server needs uvicorn: pip install uvicorn[/red]")
+        raise typer.Exit(1)
+    
+    import uvicorn
+    from web_server import MentorWebApp
+    
+    web_config = config.get('web', {})
+    host = host or web_config.get('host', '127.0.0.1')
+    port = port or web_config.get('port', 8000)
+    web_app = MentorWebApp(
+        lambda: MentorAgent(connect_daemon=False, command="web"),
+        lambda learner_id: create_progress_tracker(dict(config, learner_id=learner_id)),
+        web_config
+    )
+    console.print(f"[bold green]Mentor web server listening on http://{host}:{port}[/bold green] (Ctrl+C to stop)")
+    uvicorn.run(web_app, host=host, port=port, lifespan="on", log_level="warning")
 
 
 @app.command()
 def reset():
     """Reset your progress (use with caution!)."""
     if Confirm.ask("[bold red]⚠️  Are you sure you want to reset all progress?[/bold red]"):
-        tracker = ProgressTracker()
+        tracker = create_progress_tracker(load_config())
         tracker.reset_progress()
         console.print("[bold green]✅ Progress reset. Start fresh with 'python mentor_agent.py start'[/bold green]")
 
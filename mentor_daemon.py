@@ -0,0 +1,176 @@
+"""
+Mentor Daemon for Cloud Engineer Bootcamp
+
+A long-lived local process that keeps the AI client (and its HTTP
+connection pool), configuration and response cache warm, and answers
+requests from CLI invocations over a Unix socket.
+
+Protocol: one JSON request per connection, answered with newline-delimited
+JSON messages.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Callable
+
+DAEMON_SUPPORTED = hasattr(socket, "AF_UNIX")
+
+
+class DaemonError(Exception):
+    """Raised when the daemon can't be reached or reports a failure."""
+
+
+class DaemonClient:
+    """Client side of the mentor daemon protocol."""
+    
+    def __init__(self, socket_path: str, timeout: float = 300):
+        """Initialize the daemon client."""
+        self.socket_path = str(socket_path)
+        self.timeout = timeout
+    
+    def _request(self, request: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Send a request and yield each message of the reply."""
+        if not DAEMON_SUPPORTED:
+            raise DaemonError("Unix sockets are not supported on this platform")
+        
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+            sock.sendall(json.dumps(request).encode('utf-8') + b"\n")
+            with sock.makefile('r', encoding='utf-8') as reply:
+                for line in reply:
+                    message = json.loads(line)
+                    if "error" in message:
+                        raise DaemonError(message["error"])
+                    yield message
+        except OSError as e:
+            raise DaemonError(str(e)) from e
+        finally:
+            sock.close()
+    
+    def ping(self) -> Optional[Dict[str, Any]]:
+        """Get daemon status, or None if it isn't running."""
+        if not DAEMON_SUPPORTED or not os.path.exists(self.socket_path):
+            return None
+        try:
+            return next(self._request({"op": "ping"}), None)
+        except DaemonError:
+            return None
+    
+    def stream(self, prompt: str, system_prompt: Optional[str] = None, use_cache: bool = True,
+               history: Optional[List[Dict[str, str]]] = None, command: str = "",
+               metrics: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Stream an AI response generated by the daemon.
+
+        If `metrics` is given, it is filled with the metrics the daemon
+        recorded for the call.
+        """
+        request = {
+            "op": "stream",
+            "prompt": prompt,
+            "system_prompt": system_prompt,
+            "use_cache": use_cache,
+            "history": history,
+            "command": command
+        }
+        for message in self._request(request):
+            if "chunk" in message:
+                yield message["chunk"]
+            elif metrics is not None and "metrics" in message:
+                metrics.update(message["metrics"])
+    
+    def shutdown(self):
+        """Ask the daemon to exit."""
+        for _ in self._request({"op": "shutdown"}):
+            pass
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles one client connection."""
+    
+    def handle(self):
+        daemon: "MentorDaemon" = self.server.mentor_daemon
+        try:
+            request = json.loads(self.rfile.readline())
+            for message in daemon.dispatch(request):
+                self.wfile.write(json.dumps(message).encode('utf-8') + b"\n")
+                self.wfile.flush()
+        except BrokenPipeError:
+            # Client went away (e.g. Ctrl+C during streaming)
+            pass
+        except Exception as e:
+            self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8') + b"\n")
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class MentorDaemon:
+    """Serves AI responses from a warm MentorAgent."""
+    
+    def __init__(self, agent_factory: Callable[[], Any], socket_path: str):
+        """Initialize the daemon with a factory for the agent it serves."""
+        self.agent = agent_factory()
+        self.socket_path = Path(socket_path)
+        self.started_at = time.time()
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._server = None
+        
+        # Build the provider clients now so the first request doesn't pay for it
+        self.agent.router
+    
+    def dispatch(self, request: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Handle one request, yielding reply messages."""
+        with self._lock:
+            self.requests_served += 1
+        op = request.get("op")
+        
+        if op == "ping":
+            yield {
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started_at,
+                "requests_served": self.requests_served,
+                "provider": self.agent.config.get('ai_provider', 'openai')
+            }
+        elif op == "stream":
+            call_metrics: Dict[str, Any] = {}
+            for chunk in self.agent.stream_ai_response(
+                request["prompt"], request.get("system_prompt"), use_cache=request.get("use_cache", True),
+                history=request.get("history"), command=request.get("command") or "daemon", metrics=call_metrics
+            ):
+                yield {"chunk": chunk}
+            yield {"done": True, "metrics": call_metrics}
+        elif op == "shutdown":
+            yield {"done": True}
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+        else:
+            yield {"error": f"Unknown operation: {op}"}
+    
+    def serve_forever(self):
+        """Listen on the socket until shut down."""
+        if not DAEMON_SUPPORTED:
+            raise DaemonError("Unix sockets are not supported on this platform")
+        
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if DaemonClient(str(self.socket_path)).ping():
+                raise DaemonError(f"A daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+        
+        self._server = _UnixServer(str(self.socket_path), _RequestHandler)
+        self._server.mentor_daemon = self
+        os.chmod(self.socket_path, 0o600)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
@@ -0,0 +1,107 @@
+"""
+Metrics for Cloud Engineer Bootcamp
+
+Records one JSON line per AI call (timings, token usage, cache hits and the
+command that made it) and summarizes them into latency percentiles and token
+spend.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Get a percentile with linear interpolation between closest ranks."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class MetricsRecorder:
+    """Appends AI call records to a JSONL file."""
+    
+    def __init__(self, metrics_file: str = ".cache/metrics.jsonl", enabled: bool = True):
+        """Initialize the recorder."""
+        self.metrics_file = Path(metrics_file)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, metrics_config: Dict[str, Any]) -> "MetricsRecorder":
+        """Create a recorder from the `metrics` section of config.yaml."""
+        return cls(
+            metrics_file=metrics_config.get('path', '.cache/metrics.jsonl'),
+            enabled=metrics_config.get('enabled', True)
+        )
+    
+    def record(self, **fields):
+        """Append one record, stamped with the current time."""
+        if not self.enabled:
+            return
+        line = json.dumps(dict(ts=round(time.time(), 3), **fields), ensure_ascii=False) + "\n"
+        with self._lock:
+            self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+            # One write per record on an O_APPEND descriptor keeps lines from
+            # concurrent processes intact
+            fd = os.open(self.metrics_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, line.encode('utf-8'))
+            finally:
+                os.close(fd)
+    
+    def read(self, since: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Yield records, optionally only those newer than `since` (epoch seconds)."""
+        if not self.metrics_file.exists():
+            return
+        with open(self.metrics_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted write
+                    continue
+                if since is None or record.get("ts", 0) >= since:
+                    yield record
+    
+    def clear(self):
+        """Remove all records."""
+        with self._lock:
+            if self.metrics_file.exists():
+                self.metrics_file.unlink()
+
+
+def summarize(records: List[Dict[str, Any]], group_by: str) -> Dict[str, Dict[str, Any]]:
+    """Summarize records per value of `group_by` (e.g. "command" or "model").
+
+    Latency percentiles only include calls that reached a provider; cache hits
+    are counted separately.
+    """
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(record.get(group_by) or "-", []).append(record)
+    
+    summary = {}
+    for key, group in sorted(groups.items()):
+        calls = [record for record in group if not record.get("cached")]
+        totals = [record["total_ms"] for record in calls if record.get("total_ms") is not None]
+        first_tokens = [record["first_token_ms"] for record in calls if record.get("first_token_ms") is not None]
+        summary[key] = {
+            "calls": len(group),
+            "cached": len(group) - len(calls),
+            "errors": sum(1 for record in calls if record.get("error")),
+            "p50_ms": percentile(totals, 0.50),
+            "p95_ms": percentile(totals, 0.95),
+            "p99_ms": percentile(totals, 0.99),
+            "first_token_p50_ms": percentile(first_tokens, 0.50),
+            "prompt_tokens": sum(record.get("prompt_tokens") or 0 for record in calls),
+            "completion_tokens": sum(record.get("completion_tokens") or 0 for record in calls),
+        }
+    return summary
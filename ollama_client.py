@@ -0,0 +1,189 @@
+"""
+Ollama Client for Cloud Engineer Bootcamp
+
+A small client for the Ollama chat API (and compatible local servers) built on
+http.client. Connections are kept alive and pooled so consecutive requests
+skip the TCP handshake, and streamed replies are yielded as they arrive.
+"""
+
+import http.client
+import json
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_HOST = "http://localhost:11434"
+
+
+class OllamaError(Exception):
+    """Raised when the Ollama server can't be reached or returns an error."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class OllamaClient:
+    """Keep-alive client for an Ollama-compatible /api/chat endpoint."""
+    
+    def __init__(self, host: str = DEFAULT_HOST, timeout: float = 300, max_idle: int = 4):
+        """Initialize the client.
+
+        Up to `max_idle` idle connections are kept open for reuse.
+        """
+        if "://" not in host:
+            host = f"http://{host}"
+        parts = urlsplit(host)
+        self.host = host
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._https = parts.scheme == "https"
+        self._address = (parts.hostname or "localhost", parts.port or (443 if self._https else 11434))
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+    
+    def _acquire(self) -> http.client.HTTPConnection:
+        """Take an idle connection or open a new one."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        connection_class = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return connection_class(*self._address, timeout=self.timeout)
+    
+    def _release(self, connection: http.client.HTTPConnection):
+        """Return a connection whose response was fully read to the pool."""
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(connection)
+                return
+        connection.close()
+    
+    def _post(self, path: str, payload: Dict[str, Any], timeout: Optional[float] = None):
+        """Send a POST and return the open connection and its response.
+
+        A request on a reused connection that the server has since closed is
+        retried once on a fresh connection. `timeout` overrides the client's
+        socket timeout for this request.
+        """
+        body = json.dumps(payload).encode('utf-8')
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        
+        for attempt in range(2):
+            connection = self._acquire()
+            reused = connection.sock is not None
+            connection.timeout = timeout or self.timeout
+            if reused:
+                connection.sock.settimeout(connection.timeout)
+            try:
+                connection.request("POST", path, body=body, headers=headers)
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                connection.close()
+                if reused and attempt == 0:
+                    continue
+                raise OllamaError(f"Ollama server at {self.host} closed the connection: {e}") from e
+            except OSError as e:
+                connection.close()
+                raise OllamaError(f"Could not reach Ollama server at {self.host}: {e}") from e
+            
+            if response.status != 200:
+                detail = response.read().decode('utf-8', 'replace')
+                self._finish(connection, response)
+                try:
+                    detail = json.loads(detail).get("error", detail)
+                except ValueError:
+                    pass
+                raise OllamaError(f"Ollama returned {response.status}: {detail}", response.status)
+            return connection, response
+    
+    def _finish(self, connection: http.client.HTTPConnection, response: http.client.HTTPResponse):
+        """Pool the connection if the server allows it, otherwise close it."""
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(connection)
+    
+    @staticmethod
+    def _payload(model: str, messages: List[Dict[str, str]], stream: bool,
+                 temperature: Optional[float], max_tokens: Optional[int]) -> Dict[str, Any]:
+        """Build a chat request body."""
+        options = {}
+        if temperature is not None:
+            options["temperature"] = temperature
+        if max_tokens is not None:
+            options["num_predict"] = max_tokens
+        return {"model": model, "messages": messages, "stream": stream, "options": options}
+    
+    def chat(self, model: str, messages: List[Dict[str, str]], temperature: Optional[float] = None,
+             max_tokens: Optional[int] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Get a complete chat response."""
+        connection, response = self._post(
+            "/api/chat", self._payload(model, messages, False, temperature, max_tokens), timeout
+        )
+        try:
+            result = json.loads(response.read())
+        except (OSError, ValueError) as e:
+            connection.close()
+            raise OllamaError(f"Invalid response from Ollama: {e}") from e
+        self._finish(connection, response)
+        return result
+    
+    def chat_stream(self, model: str, messages: List[Dict[str, str]], temperature: Optional[float] = None,
+                    max_tokens: Optional[int] = None, final: Optional[Dict[str, Any]] = None,
+                    timeout: Optional[float] = None) -> Iterator[str]:
+        """Stream a chat response, yielding content as it arrives.
+
+        If `final` is given, it gets `connected_at` (time.monotonic()) when
+        the response starts, and the last message's fields (token counts and
+        timings) once the stream ends.
+        """
+        connection, response = self._post(
+            "/api/chat", self._payload(model, messages, True, temperature, max_tokens), timeout
+        )
+        if final is not None:
+            final["connected_at"] = time.monotonic()
+        completed = False
+        try:
+            for line in response:
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                if "error" in message:
+                    raise OllamaError(message["error"])
+                content = message.get("message", {}).get("content")
+                if content:
+                    yield content
+                if message.get("done"):
+                    if final is not None:
+                        final.update({key: value for key, value in message.items() if key != "message"})
+                    completed = True
+            # Drain the terminating chunk so the connection can be reused
+            response.read()
+        except (OSError, ValueError) as e:
+            raise OllamaError(f"Stream from Ollama was interrupted: {e}") from e
+        finally:
+            if completed and response.isclosed():
+                self._finish(connection, response)
+            else:
+                connection.close()
+    
+    def list_models(self) -> List[str]:
+        """List the models available on the server."""
+        connection = self._acquire()
+        try:
+            connection.request("GET", "/api/tags")
+            response = connection.getresponse()
+            data = json.loads(response.read())
+        except (OSError, ValueError) as e:
+            connection.close()
+            raise OllamaError(f"Could not reach Ollama server at {self.host}: {e}") from e
+        self._finish(connection, response)
+        return [model["name"] for model in data.get("models", [])]
+    
+    def close(self):
+        """Close pooled connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
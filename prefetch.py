@@ -0,0 +1,222 @@
+"""
+Prefetch for Cloud Engineer Bootcamp
+
+Prepares likely next AI responses on background threads while the learner is
+reading or typing: the next day's session primer and a ready interview
+question per topic. Results are kept in a small store on disk, bounded in
+size and with expiry, so they survive until the command that needs them.
+"""
+
+import atexit
+import contextlib
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
+
+from progress_storage import FileLock, atomic_write_json
+
+
+class PrefetchStore:
+    """Bounded, expiring key-value store of prefetched responses."""
+    
+    def __init__(self, store_file: Optional[str] = ".cache/prefetch.json", max_entries: int = 64,
+                 ttl_hours: float = 72):
+        """Initialize the store and load saved entries. With no file, entries live in memory only."""
+        self.store_file = Path(store_file) if store_file else None
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_hours * 3600
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._file_lock = FileLock(self.store_file.with_name(self.store_file.name + ".lock")) if self.store_file else None
+        self._load()
+    
+    @classmethod
+    def from_config(cls, prefetch_config: Dict[str, Any]) -> "PrefetchStore":
+        """Create a store from the `prefetch` section of config.yaml."""
+        return cls(
+            store_file=prefetch_config.get('path', '.cache/prefetch.json'),
+            max_entries=prefetch_config.get('max_entries', 64),
+            ttl_hours=prefetch_config.get('ttl_hours', 72)
+        )
+    
+    def _load(self):
+        """Replace the entries with the saved ones, dropping expired ones."""
+        if not self.store_file or not self.store_file.exists():
+            return
+        try:
+            with open(self.store_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        self._entries = OrderedDict(
+            (key, (stored_at, value)) for key, (stored_at, value) in saved.get("entries", {}).items()
+            if now - stored_at < self.ttl_seconds
+        )
+    
+    @contextlib.contextmanager
+    def _update(self):
+        """Hold the file lock around a read-modify-write of the saved entries (lock held).
+        
+        Entries are re-read first, so changes made by other processes since this
+        store was loaded are kept rather than overwritten.
+        """
+        if not self.store_file:
+            yield
+            return
+        self.store_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._file_lock:
+            self._load()
+            yield
+    
+    def _save(self):
+        """Write entries to disk (lock and file lock held)."""
+        if self.store_file:
+            atomic_write_json(self.store_file, {"entries": dict(self._entries)})
+    
+    def _expire(self):
+        """Drop expired entries (lock held)."""
+        cutoff = time.time() - self.ttl_seconds
+        for key in [key for key, (stored_at, _) in self._entries.items() if stored_at < cutoff]:
+            del self._entries[key]
+    
+    def put(self, key: str, value: str):
+        """Store a value, evicting the oldest entries beyond max_entries."""
+        with self._lock, self._update():
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time(), value)
+            self._expire()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get an unexpired value without removing it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry[0] < self.ttl_seconds:
+                return entry[1]
+            return None
+    
+    def take(self, prefix: str) -> Optional[str]:
+        """Remove and return the oldest unexpired value whose key starts with `prefix`."""
+        with self._lock, self._update():
+            self._expire()
+            for key, (_, value) in self._entries.items():
+                if key.startswith(prefix):
+                    del self._entries[key]
+                    self._save()
+                    return value
+            return None
+    
+    def keys(self, prefix: str = "") -> List[str]:
+        """List unexpired keys starting with `prefix`."""
+        with self._lock:
+            self._expire()
+            return [key for key in self._entries if key.startswith(prefix)]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._entries)
+
+
+class Prefetcher:
+    """Runs speculative requests on background threads and stores their results.
+
+    Each command may start at most `max_requests` of them. At exit, requests
+    already in flight get `exit_wait_seconds` to finish and be stored, and
+    queued ones that haven't started are dropped.
+    """
+    
+    def __init__(self, store: PrefetchStore, workers: int = 2, max_requests: int = 2,
+                 exit_wait_seconds: float = 5.0):
+        """Initialize the prefetcher; worker threads start on the first submit."""
+        self.store = store
+        self.workers = workers
+        self.max_requests = max_requests
+        self.exit_wait_seconds = exit_wait_seconds
+        self._queue: "queue.Queue[Tuple[str, Callable[[], Optional[str]]]]" = queue.Queue()
+        self._pending: Set[str] = set()
+        self._submitted = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._threads: List[threading.Thread] = []
+    
+    @classmethod
+    def from_config(cls, prefetch_config: Dict[str, Any]) -> "Prefetcher":
+        """Create a prefetcher and its store from the `prefetch` section of config.yaml."""
+        return cls(
+            PrefetchStore.from_config(prefetch_config),
+            workers=prefetch_config.get('workers', 2),
+            max_requests=prefetch_config.get('max_requests', 2),
+            exit_wait_seconds=prefetch_config.get('exit_wait_seconds', 5)
+        )
+    
+    def submit(self, key: str, fetch: Callable[[], Optional[str]]) -> bool:
+        """Queue `fetch` unless `key` is already stored or pending, or the request cap is reached.
+        
+        Returns whether it was queued.
+        """
+        with self._lock:
+            if self._closed or self._submitted >= self.max_requests:
+                return False
+            if key in self._pending or self.store.get(key) is not None:
+                return False
+            self._pending.add(key)
+            self._submitted += 1
+            if not self._threads:
+                atexit.register(self.close)
+            if len(self._threads) < self.workers:
+                # Daemon threads, so a request that outlasts close() can't keep the CLI from exiting
+                thread = threading.Thread(target=self._work, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        self._queue.put((key, fetch))
+        return True
+    
+    def _work(self):
+        """Run queued fetches, storing non-empty results."""
+        while True:
+            key, fetch = self._queue.get()
+            try:
+                with self._lock:
+                    if self._closed:
+                        continue
+                result = fetch()
+                if result:
+                    self.store.put(key, result)
+            except Exception:
+                # Speculative work: a failure just means no head start
+                pass
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+                    self._done.notify_all()
+    
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stop starting queued requests and wait for those in flight. Returns False on timeout."""
+        with self._lock:
+            self._closed = True
+        return self.wait(timeout=self.exit_wait_seconds if timeout is None else timeout)
+    
+    def pending(self, prefix: str = "") -> List[str]:
+        """List keys still being fetched."""
+        with self._lock:
+            return [key for key in self._pending if key.startswith(prefix)]
+    
+    def wait(self, prefix: str = "", timeout: Optional[float] = None) -> bool:
+        """Wait until no key starting with `prefix` is pending. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while any(key.startswith(prefix) for key in self._pending):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._done.wait(remaining)
+        return True
@@ -0,0 +1,367 @@
+"""
+Progress Model for Cloud Engineer Bootcamp
+
+Typed records for a learner's progress, keyed by integer week and (week, day)
+instead of strings like "week1_day3", and the codec that stores them: a
+compact JSON document (through orjson when it's installed) with a schema
+version, so documents written by older versions are migrated on load.
+"""
+
+import contextlib
+import functools
+import gc
+import json
+from typing import Callable, Dict, Any, Iterator, List, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SCHEMA_VERSION = 2
+
+SCALAR_FIELDS = (
+    "started", "user_name", "start_date", "current_week", "current_day",
+    "days_completed", "streak", "last_activity_date", "total_hours"
+)
+
+
+def day_key(week: int, day: int) -> str:
+    """Get the key change events and the cohort database use for a day."""
+    return f"week{week}_day{day}"
+
+
+# Every load parses each stored day key, and there are only as many distinct
+# keys as days in the curriculum
+@functools.lru_cache(maxsize=None)
+def parse_day_key(key: str) -> Tuple[int, int]:
+    """Turn "week1_day3" into (1, 3)."""
+    week, separator, day = key.removeprefix("week").partition("_day")
+    if not separator:
+        raise ValueError(f"Invalid day key: {key!r}")
+    return int(week), int(day)
+
+
+def week_key(week: int) -> str:
+    """Get the key change events use for a week's assessment."""
+    return f"week{week}"
+
+
+def parse_week_key(key: Any) -> int:
+    """Turn "week1" (assessments) or "1" (completed weeks) into 1."""
+    return int(str(key).removeprefix("week"))
+
+
+@contextlib.contextmanager
+def gc_paused() -> Iterator[None]:
+    """Pause the cyclic garbage collector while building a large document.
+
+    Every record allocated counts towards a collection, so without this a
+    big load spends a third of its time scanning objects that can't form
+    cycles.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class _Record:
+    """Base for small records stored as rows of their slot values."""
+    
+    __slots__ = ()
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "_Record":
+        """Build a record from its change-event form."""
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the change-event form of the record."""
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def to_row(self) -> List[Any]:
+        return [getattr(self, name) for name in self.__slots__]
+    
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and other.to_row() == self.to_row()
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class CompletedDay(_Record):
+    """A completed curriculum day."""
+    
+    __slots__ = ("completed_date", "hours_spent")
+    
+    def __init__(self, completed_date: str = "", hours_spent: float = 0):
+        self.completed_date = completed_date
+        self.hours_spent = hours_spent
+
+
+class Note(_Record):
+    """A learner's note on a day."""
+    
+    __slots__ = ("note", "date")
+    
+    def __init__(self, note: str = "", date: str = ""):
+        self.note = note
+        self.date = date
+
+
+class AssessmentResult(_Record):
+    """The latest result of a weekly assessment."""
+    
+    __slots__ = ("score", "date", "passed")
+    
+    def __init__(self, score: float = 0, date: str = "", passed: bool = False):
+        self.score = score
+        self.date = date
+        self.passed = passed
+
+
+class PortfolioProject(_Record):
+    """A project added to the learner's portfolio."""
+    
+    __slots__ = ("name", "description", "technologies", "repository", "completed_date")
+    
+    def __init__(self, name: str = "", description: str = "", technologies: Optional[List[str]] = None,
+                 repository: str = "", completed_date: str = ""):
+        self.name = name
+        self.description = description
+        self.technologies = list(technologies or [])
+        self.repository = repository
+        self.completed_date = completed_date
+
+
+class Progress:
+    """A learner's progress document. A new instance is a learner who hasn't started."""
+    
+    __slots__ = SCALAR_FIELDS + (
+        "completed_weeks", "completed_days", "assessment_scores", "skills",
+        "badges", "portfolio_projects", "notes", "version"
+    )
+    
+    def __init__(self, started: bool = False, user_name: str = "", start_date: str = "",
+                 current_week: int = 1, current_day: int = 1, days_completed: int = 0, streak: int = 0,
+                 last_activity_date: str = "", total_hours: float = 0,
+                 completed_weeks: Optional[Set[int]] = None,
+                 completed_days: Optional[Dict[Tuple[int, int], CompletedDay]] = None,
+                 assessment_scores: Optional[Dict[int, AssessmentResult]] = None,
+                 skills: Optional[Dict[str, float]] = None, badges: Optional[List[str]] = None,
+                 portfolio_projects: Optional[List[PortfolioProject]] = None,
+                 notes: Optional[Dict[Tuple[int, int], Note]] = None, version: int = 0):
+        self.started = started
+        self.user_name = user_name
+        self.start_date = start_date
+        self.current_week = current_week
+        self.current_day = current_day
+        self.days_completed = days_completed
+        self.streak = streak
+        self.last_activity_date = last_activity_date
+        self.total_hours = total_hours
+        self.completed_weeks: Set[int] = completed_weeks if completed_weeks is not None else set()
+        self.completed_days: Dict[Tuple[int, int], CompletedDay] = (
+            completed_days if completed_days is not None else {}
+        )
+        self.assessment_scores: Dict[int, AssessmentResult] = (
+            assessment_scores if assessment_scores is not None else {}
+        )
+        self.skills: Dict[str, float] = skills if skills is not None else {}
+        self.badges: List[str] = badges if badges is not None else []
+        self.portfolio_projects: List[PortfolioProject] = (
+            portfolio_projects if portfolio_projects is not None else []
+        )
+        self.notes: Dict[Tuple[int, int], Note] = notes if notes is not None else {}
+        self.version = version
+    
+    @classmethod
+    def from_document(cls, document: Dict[str, Any]) -> "Progress":
+        """Build progress from a document in the current schema."""
+        return cls(
+            **{field: document[field] for field in SCALAR_FIELDS if field in document},
+            completed_weeks=set(document["completed_weeks"]),
+            completed_days={
+                (week, day): CompletedDay(completed_date, hours_spent)
+                for week, day, completed_date, hours_spent in document["completed_days"]
+            },
+            assessment_scores={
+                week: AssessmentResult(score, date, passed)
+                for week, score, date, passed in document["assessment_scores"]
+            },
+            skills=document["skills"],
+            badges=document["badges"],
+            portfolio_projects=[PortfolioProject(*row) for row in document["portfolio_projects"]],
+            notes={(week, day): Note(note, date) for week, day, note, date in document["notes"]},
+            version=document.get("version", 0)
+        )
+    
+    def to_document(self) -> Dict[str, Any]:
+        """Get the stored form: records become rows, keys become integers."""
+        document: Dict[str, Any] = {"schema_version": SCHEMA_VERSION, "version": self.version}
+        for field in SCALAR_FIELDS:
+            document[field] = getattr(self, field)
+        document["completed_weeks"] = sorted(self.completed_weeks)
+        document["completed_days"] = [[*key, *day.to_row()] for key, day in self.completed_days.items()]
+        document["assessment_scores"] = [[week, *result.to_row()] for week, result in self.assessment_scores.items()]
+        document["skills"] = self.skills
+        document["badges"] = self.badges
+        document["portfolio_projects"] = [project.to_row() for project in self.portfolio_projects]
+        document["notes"] = [[*key, *note.to_row()] for key, note in self.notes.items()]
+        return document
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the document in the form change events use, with string keys."""
+        progress: Dict[str, Any] = {field: getattr(self, field) for field in SCALAR_FIELDS}
+        progress["completed_weeks"] = {str(week): True for week in sorted(self.completed_weeks)}
+        progress["completed_days"] = {day_key(*key): day.to_dict() for key, day in self.completed_days.items()}
+        progress["assessment_scores"] = {
+            week_key(week): result.to_dict() for week, result in self.assessment_scores.items()
+        }
+        progress["skills"] = dict(self.skills)
+        progress["badges"] = list(self.badges)
+        progress["portfolio_projects"] = [project.to_dict() for project in self.portfolio_projects]
+        progress["notes"] = {day_key(*key): note.to_dict() for key, note in self.notes.items()}
+        progress["version"] = self.version
+        return progress
+    
+    def apply(self, change: Dict[str, Any]):
+        """Apply a change event (see progress_storage.set_change) in place."""
+        path = change["path"]
+        value = change["value"]
+        field = path[0]
+        
+        if change["op"] == "append":
+            if field != "portfolio_projects":
+                raise ValueError(f"Cannot append to {field}")
+            self.portfolio_projects.append(PortfolioProject.from_dict(value))
+            return
+        if change["op"] != "set":
+            raise ValueError(f"Unknown change operation: {change['op']}")
+        
+        if field in SCALAR_FIELDS or field == "version":
+            setattr(self, field, value)
+            return
+        
+        # Setting a whole collection replaces it; setting one key updates an entry
+        if len(path) == 1:
+            if field == "skills":
+                self.skills = dict(value)
+            elif field == "badges":
+                self.badges = list(value)
+            elif field == "portfolio_projects":
+                self.portfolio_projects = [PortfolioProject.from_dict(project) for project in value]
+            elif field in ("completed_weeks", "completed_days", "assessment_scores", "notes"):
+                getattr(self, field).clear()
+                for key, item in value.items():
+                    self.apply({"op": "set", "path": [field, key], "value": item})
+            else:
+                raise ValueError(f"Unknown progress field: {field}")
+            return
+        
+        key = path[1]
+        if field == "completed_days":
+            self.completed_days[parse_day_key(key)] = CompletedDay.from_dict(value)
+        elif field == "notes":
+            self.notes[parse_day_key(key)] = Note.from_dict(value)
+        elif field == "assessment_scores":
+            self.assessment_scores[parse_week_key(key)] = AssessmentResult.from_dict(value)
+        elif field == "completed_weeks":
+            if value:
+                self.completed_weeks.add(parse_week_key(key))
+            else:
+                self.completed_weeks.discard(parse_week_key(key))
+        elif field == "skills":
+            self.skills[key] = value
+        elif field == "badges":
+            if key not in self.badges:
+                self.badges.append(key)
+        else:
+            raise ValueError(f"Unknown progress field: {field}")
+    
+    def __repr__(self) -> str:
+        return (f"Progress(user_name={self.user_name!r}, week={self.current_week}, day={self.current_day}, "
+                f"days_completed={self.days_completed}, version={self.version})")
+
+
+def _migrate_v1(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema 1: collections of dicts keyed by strings like "week1_day3"."""
+    document = dict(document)
+    document["completed_weeks"] = sorted(
+        parse_week_key(week) for week, done in (document.get("completed_weeks") or {}).items() if done
+    )
+    document["completed_days"] = [
+        [*parse_day_key(key), *CompletedDay.from_dict(day).to_row()]
+        for key, day in (document.get("completed_days") or {}).items()
+    ]
+    document["assessment_scores"] = [
+        [parse_week_key(key), *AssessmentResult.from_dict(result).to_row()]
+        for key, result in (document.get("assessment_scores") or {}).items()
+    ]
+    document["skills"] = document.get("skills") or {}
+    document["badges"] = document.get("badges") or []
+    document["portfolio_projects"] = [
+        PortfolioProject.from_dict(project).to_row() for project in document.get("portfolio_projects") or []
+    ]
+    document["notes"] = [
+        [*parse_day_key(key), *Note.from_dict(note).to_row()]
+        for key, note in (document.get("notes") or {}).items()
+    ]
+    document["schema_version"] = 2
+    return document
+
+
+# Forward migrations: each takes a document of the keyed schema to the next one
+MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    1: _migrate_v1,
+}
+
+
+def migrate(document: Any) -> Dict[str, Any]:
+    """Bring a stored document up to the current schema.
+
+    Documents without a schema_version are schema 1, the original
+    indented JSON with string keys.
+    """
+    if not isinstance(document, dict):
+        raise ValueError("not a progress document")
+    schema = document.get("schema_version", 1)
+    if schema > SCHEMA_VERSION:
+        raise ValueError(f"progress schema {schema} is newer than this version supports ({SCHEMA_VERSION})")
+    while schema < SCHEMA_VERSION:
+        document = MIGRATIONS[schema](document)
+        schema = document["schema_version"]
+    return document
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize to compact JSON."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode(progress: Progress, version: Optional[int] = None) -> bytes:
+    """Serialize progress in the current schema, optionally stamped with another version."""
+    document = progress.to_document()
+    if version is not None:
+        document["version"] = version
+    return dumps(document)
+
+
+def decode(data: bytes) -> Progress:
+    """Parse stored progress of any schema."""
+    with gc_paused():
+        return Progress.from_document(migrate(loads(data)))
@@ -0,0 +1,715 @@
+"""
+Progress Storage for Cloud Engineer Bootcamp
+
+Storage backends that persist the progress document, either as a single
+JSON file, as an append-only event log compacted into JSON snapshots, or
+as rows in a SQLite database shared by a whole cohort of learners. Files are
+written in the compact schema of progress_model and older ones are migrated
+as they are read.
+"""
+
+import getpass
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from progress_model import (
+    Progress, CompletedDay, Note, AssessmentResult, PortfolioProject,
+    dumps, loads, encode, decode, gc_paused, parse_day_key, parse_week_key
+)
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no advisory locks, optimistic version checks still apply
+    fcntl = None
+
+
+class VersionConflictError(Exception):
+    """Raised when the stored document changed since it was read."""
+
+
+class FileLock:
+    """Reentrant advisory lock held on a sidecar `.lock` file."""
+    
+    def __init__(self, path: Path):
+        """Initialize the lock."""
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+    
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            self._file = open(self.path, 'a')
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        self._depth += 1
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+
+def set_change(path: List[str], value: Any) -> Dict[str, Any]:
+    """Build a change event that sets the value at a path."""
+    return {"op": "set", "path": path, "value": value}
+
+
+def append_change(path: List[str], value: Any) -> Dict[str, Any]:
+    """Build a change event that appends a value to the list at a path."""
+    return {"op": "append", "path": path, "value": value}
+
+
+def _fsync_directory(directory: Path):
+    """Flush a directory entry so a rename survives a crash."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _file_stamp(path: Path) -> Optional[tuple]:
+    """Get the (inode, mtime, size) of a file, or None if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """Write to a temporary file, fsync it and rename it over the target."""
+    # A temporary file of its own, so two processes saving at once can't interleave their writes
+    with tempfile.NamedTemporaryFile('wb', dir=path.parent, prefix=path.name + ".", suffix=".tmp",
+                                     delete=False) as f:
+        try:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, path)
+    _fsync_directory(path.parent)
+
+
+def atomic_write_json(path: Path, data: Dict[str, Any]):
+    """Atomically write indented JSON."""
+    atomic_write_bytes(path, json.dumps(data, indent=2).encode('utf-8'))
+
+
+class ProgressStorage:
+    """Interface for progress storage backends."""
+    
+    def exists(self) -> bool:
+        """Check whether a progress document has been stored."""
+        raise NotImplementedError
+    
+    def load(self) -> Progress:
+        """Load the full progress document."""
+        raise NotImplementedError
+    
+    def change_token(self) -> Optional[Any]:
+        """Get a cheap value that changes whenever the stored document does.
+        
+        Returning None disables read caching for the backend.
+        """
+        return None
+    
+    def append(self, changes: List[Dict[str, Any]], expected_version: Optional[int] = None) -> Optional[Any]:
+        """Persist a batch of change events and bump the document version.
+        
+        Raises VersionConflictError if expected_version is given and the
+        stored document has moved past it. Returns the change token of the
+        document as written, taken before any other writer could follow.
+        """
+        raise NotImplementedError
+    
+    def replace(self, progress: Progress) -> Optional[Any]:
+        """Replace the stored document entirely and return its change token.
+        
+        The stored version moves past both the current one and the
+        document's, so writes still based on the old document conflict;
+        `progress.version` is set to it.
+        """
+        raise NotImplementedError
+    
+    def initialize(self, progress: Progress):
+        """Store a document unless one already exists."""
+        raise NotImplementedError
+
+
+class JsonFileStorage(ProgressStorage):
+    """Stores the whole progress document in a single JSON file."""
+    
+    def __init__(self, progress_file: Path):
+        """Initialize JSON file storage."""
+        self.progress_file = Path(progress_file)
+        self.lock = FileLock(self.progress_file.with_name(self.progress_file.name + ".lock"))
+    
+    def exists(self) -> bool:
+        """Check whether the progress file exists."""
+        return self.progress_file.exists()
+    
+    def change_token(self) -> Optional[Any]:
+        """Identify the file version by inode, mtime and size."""
+        return _file_stamp(self.progress_file)
+    
+    def load(self) -> Progress:
+        """Load progress from the JSON file."""
+        with open(self.progress_file, 'rb') as f:
+            return decode(f.read())
+    
+    def append(self, changes: List[Dict[str, Any]], expected_version: Optional[int] = None) -> Optional[Any]:
+        """Apply changes and rewrite the whole file."""
+        with self.lock:
+            progress = self.load()
+            version = progress.version
+            if expected_version is not None and version != expected_version:
+                raise VersionConflictError(f"expected version {expected_version}, found {version}")
+            
+            for change in changes:
+                progress.apply(change)
+            progress.version = version + 1
+            atomic_write_bytes(self.progress_file, encode(progress))
+            return self.change_token()
+    
+    def replace(self, progress: Progress) -> Optional[Any]:
+        """Atomically rewrite the JSON file."""
+        with self.lock:
+            current = self.load().version if self.exists() else 0
+            progress.version = max(progress.version, current) + 1
+            atomic_write_bytes(self.progress_file, encode(progress))
+            return self.change_token()
+    
+    def initialize(self, progress: Progress):
+        """Write the file unless another process created it first."""
+        with self.lock:
+            if not self.exists():
+                atomic_write_bytes(self.progress_file, encode(progress))
+
+
+class EventLogStorage(ProgressStorage):
+    """Appends change events to a log and periodically compacts them into a snapshot.
+
+    The snapshot is the regular `user_progress.json` document, so existing
+    progress files are picked up as-is (and migrated on the next compaction). Each log record carries the document
+    version it produces; records at or below the snapshot's version are skipped
+    on replay, which makes a crash between writing a snapshot and truncating
+    the log harmless.
+    """
+    
+    def __init__(self, snapshot_file: Path, compact_every: int = 100):
+        """Initialize event log storage."""
+        self.snapshot_file = Path(snapshot_file)
+        self.log_file = self.snapshot_file.with_suffix(".log")
+        self.lock = FileLock(self.snapshot_file.with_suffix(".lock"))
+        self.compact_every = compact_every
+        self._version = None
+        self._token = None
+        self._log_records = 0
+        self._log_good_offset = 0
+    
+    def exists(self) -> bool:
+        """Check whether a snapshot exists."""
+        return self.snapshot_file.exists()
+    
+    def change_token(self) -> Optional[Any]:
+        """Identify the snapshot and log versions by inode, mtime and size."""
+        return _file_stamp(self.snapshot_file), _file_stamp(self.log_file)
+    
+    def load(self) -> Progress:
+        """Load the snapshot and replay logged events on top of it.
+        
+        Reads don't take the lock, so the load is retried if a compaction
+        swapped the snapshot and truncated the log while we were reading.
+        """
+        while True:
+            token = self.change_token()
+            with open(self.snapshot_file, 'rb') as f:
+                progress = decode(f.read())
+            
+            self._log_records = 0
+            self._log_good_offset = 0
+            if self.log_file.exists():
+                self._replay_log(progress)
+            
+            if self.change_token() == token:
+                break
+        
+        self._version = progress.version
+        self._token = token
+        return progress
+    
+    def _replay_log(self, progress: Progress):
+        """Apply complete log records newer than the snapshot."""
+        with open(self.log_file, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = loads(line)
+                except ValueError:
+                    break
+                self._log_good_offset += len(line)
+                self._log_records += 1
+                
+                if record["version"] <= progress.version:
+                    continue
+                for change in record["changes"]:
+                    progress.apply(change)
+                progress.version = record["version"]
+    
+    def _refresh(self):
+        """Reload state if another process wrote since our last load (lock held)."""
+        if self._version is None or self.change_token() != self._token:
+            self.load()
+        
+        # Under the lock a partial last line can't be an append in progress,
+        # only the leftover of a crash; cut it off so the next record starts
+        # on a clean line
+        if self.log_file.exists() and self._log_good_offset < self.log_file.stat().st_size:
+            with open(self.log_file, 'r+b') as f:
+                f.truncate(self._log_good_offset)
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def append(self, changes: List[Dict[str, Any]], expected_version: Optional[int] = None) -> Optional[Any]:
+        """Append one record to the log and compact when it grows too long."""
+        with self.lock:
+            self._refresh()
+            if expected_version is not None and self._version != expected_version:
+                raise VersionConflictError(f"expected version {expected_version}, found {self._version}")
+            
+            record = {"version": self._version + 1, "changes": changes}
+            line = dumps(record) + b"\n"
+            with open(self.log_file, 'ab') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            
+            self._version += 1
+            self._log_records += 1
+            self._log_good_offset += len(line)
+            self._token = self.change_token()
+            
+            if self._log_records >= self.compact_every:
+                self.compact()
+            return self._token
+    
+    def compact(self):
+        """Fold the log into a new snapshot and truncate it."""
+        with self.lock:
+            # The document doesn't change, so neither does its version
+            progress = self.load()
+            self._write_snapshot(progress, progress.version)
+    
+    def replace(self, progress: Progress) -> Optional[Any]:
+        """Write a new snapshot and start an empty log."""
+        with self.lock:
+            if self.exists():
+                self._refresh()
+            progress.version = max(progress.version, self._version or 0) + 1
+            self._write_snapshot(progress, progress.version)
+            return self._token
+    
+    def _write_snapshot(self, progress: Progress, version: int):
+        """Write a snapshot at `version` and start an empty log (lock held)."""
+        atomic_write_bytes(self.snapshot_file, encode(progress, version=version))
+        
+        with open(self.log_file, 'w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        
+        self._version = version
+        self._log_records = 0
+        self._log_good_offset = 0
+        self._token = self.change_token()
+    
+    def initialize(self, progress: Progress):
+        """Write the first snapshot unless another process created it first."""
+        with self.lock:
+            if not self.exists():
+                self._write_snapshot(progress, progress.version)
+
+
+LEARNER_FIELDS = [
+    "started", "user_name", "start_date", "current_week", "current_day",
+    "days_completed", "streak", "last_activity_date", "total_hours", "version"
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS learners (
+    learner_id TEXT PRIMARY KEY,
+    started INTEGER NOT NULL DEFAULT 0,
+    user_name TEXT NOT NULL DEFAULT '',
+    start_date TEXT NOT NULL DEFAULT '',
+    current_week INTEGER NOT NULL DEFAULT 1,
+    current_day INTEGER NOT NULL DEFAULT 1,
+    days_completed INTEGER NOT NULL DEFAULT 0,
+    streak INTEGER NOT NULL DEFAULT 0,
+    last_activity_date TEXT NOT NULL DEFAULT '',
+    total_hours REAL NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_learners_streak ON learners (streak DESC);
+CREATE INDEX IF NOT EXISTS idx_learners_week_activity ON learners (current_week, last_activity_date);
+
+CREATE TABLE IF NOT EXISTS completed_days (
+    learner_id TEXT NOT NULL,
+    day_key TEXT NOT NULL,
+    completed_date TEXT NOT NULL,
+    hours_spent REAL NOT NULL,
+    PRIMARY KEY (learner_id, day_key)
+);
+CREATE TABLE IF NOT EXISTS completed_weeks (
+    learner_id TEXT NOT NULL,
+    week TEXT NOT NULL,
+    PRIMARY KEY (learner_id, week)
+);
+CREATE TABLE IF NOT EXISTS assessment_scores (
+    learner_id TEXT NOT NULL,
+    week_key TEXT NOT NULL,
+    score REAL NOT NULL,
+    date TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    PRIMARY KEY (learner_id, week_key)
+);
+CREATE TABLE IF NOT EXISTS skills (
+    learner_id TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    level REAL NOT NULL,
+    PRIMARY KEY (learner_id, skill)
+);
+CREATE TABLE IF NOT EXISTS badges (
+    learner_id TEXT NOT NULL,
+    badge TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (learner_id, badge)
+);
+CREATE TABLE IF NOT EXISTS notes (
+    learner_id TEXT NOT NULL,
+    day_key TEXT NOT NULL,
+    note TEXT NOT NULL,
+    date TEXT NOT NULL,
+    PRIMARY KEY (learner_id, day_key)
+);
+CREATE TABLE IF NOT EXISTS portfolio_projects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    learner_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    technologies TEXT NOT NULL,
+    repository TEXT NOT NULL,
+    completed_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_portfolio_projects_learner ON portfolio_projects (learner_id);
+"""
+
+
+class ProgressDatabase:
+    """SQLite database holding the progress of many learners."""
+    
+    def __init__(self, db_file: Path):
+        """Open the database and make sure the schema exists."""
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_file), timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.RLock()
+        self.write_count = 0
+    
+    def storage_for(self, learner_id: str) -> "SqliteStorage":
+        """Get a storage backend bound to one learner."""
+        return SqliteStorage(self, learner_id)
+    
+    def learner_ids(self) -> List[str]:
+        """List all learners in the database."""
+        return [row[0] for row in self.conn.execute("SELECT learner_id FROM learners ORDER BY learner_id")]
+    
+    def streak_leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the learners with the longest current streaks."""
+        rows = self.conn.execute(
+            "SELECT learner_id, user_name, streak, days_completed, current_week, current_day "
+            "FROM learners WHERE started = 1 ORDER BY streak DESC LIMIT ?",
+            (limit,)
+        )
+        return [dict(row) for row in rows]
+    
+    def stuck_learners(self, week: int, idle_days: int = 3) -> List[Dict[str, Any]]:
+        """Get learners on a week who haven't been active for a number of days."""
+        cutoff = str(date.today() - timedelta(days=idle_days))
+        rows = self.conn.execute(
+            "SELECT learner_id, user_name, current_day, last_activity_date, days_completed "
+            "FROM learners WHERE current_week = ? AND last_activity_date <= ? AND started = 1 "
+            "ORDER BY last_activity_date",
+            (week, cutoff)
+        )
+        return [dict(row) for row in rows]
+
+
+class SqliteStorage(ProgressStorage):
+    """Stores one learner's progress as rows in a shared SQLite database."""
+    
+    def __init__(self, database: ProgressDatabase, learner_id: str):
+        """Initialize SQLite storage for a learner."""
+        self.database = database
+        self.conn = database.conn
+        self.learner_id = learner_id
+    
+    def exists(self) -> bool:
+        """Check whether the learner has a row."""
+        row = self.conn.execute(
+            "SELECT 1 FROM learners WHERE learner_id = ?", (self.learner_id,)
+        ).fetchone()
+        return row is not None
+    
+    def change_token(self) -> Optional[Any]:
+        """Combine SQLite's data_version, which changes when other connections
+        commit, with a counter of commits made through this connection."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0], self.database.write_count
+    
+    def load(self) -> Progress:
+        """Assemble the learner's progress document from all tables."""
+        with self.database.lock:
+            # One read transaction so all tables come from the same snapshot
+            self.conn.execute("BEGIN")
+            try:
+                with gc_paused():
+                    return self._load()
+            finally:
+                self.conn.commit()
+    
+    def _load(self) -> Progress:
+        """Read the learner's rows (database lock held)."""
+        learner_id = (self.learner_id,)
+        row = self.conn.execute("SELECT * FROM learners WHERE learner_id = ?", learner_id).fetchone()
+        
+        progress = Progress(**{field: row[field] for field in LEARNER_FIELDS})
+        progress.started = bool(progress.started)
+        progress.completed_weeks = {
+            parse_week_key(r["week"])
+            for r in self.conn.execute("SELECT week FROM completed_weeks WHERE learner_id = ?", learner_id)
+        }
+        progress.completed_days = {
+            parse_day_key(key): CompletedDay(completed_date, hours_spent)
+            for key, completed_date, hours_spent in self.conn.execute(
+                "SELECT day_key, completed_date, hours_spent FROM completed_days WHERE learner_id = ?", learner_id
+            )
+        }
+        progress.assessment_scores = {
+            parse_week_key(r["week_key"]): AssessmentResult(r["score"], r["date"], bool(r["passed"]))
+            for r in self.conn.execute("SELECT * FROM assessment_scores WHERE learner_id = ?", learner_id)
+        }
+        progress.skills = {
+            r["skill"]: r["level"]
+            for r in self.conn.execute("SELECT skill, level FROM skills WHERE learner_id = ?", learner_id)
+        }
+        progress.badges = [
+            r["badge"]
+            for r in self.conn.execute(
+                "SELECT badge FROM badges WHERE learner_id = ? ORDER BY position", learner_id
+            )
+        ]
+        progress.portfolio_projects = [
+            PortfolioProject(r["name"], r["description"], json.loads(r["technologies"]), r["repository"],
+                             r["completed_date"])
+            for r in self.conn.execute(
+                "SELECT * FROM portfolio_projects WHERE learner_id = ? ORDER BY id", learner_id
+            )
+        ]
+        progress.notes = {
+            parse_day_key(key): Note(note, date)
+            for key, note, date in self.conn.execute(
+                "SELECT day_key, note, date FROM notes WHERE learner_id = ?", learner_id
+            )
+        }
+        return progress
+    
+    def append(self, changes: List[Dict[str, Any]], expected_version: Optional[int] = None) -> Optional[Any]:
+        """Apply change events as row-level updates in one transaction."""
+        with self.database.lock, self.conn:
+            # Take the write lock up front so the version check and the
+            # updates can't interleave with another writer
+            self.conn.execute("BEGIN IMMEDIATE")
+            version = self.conn.execute(
+                "SELECT version FROM learners WHERE learner_id = ?", (self.learner_id,)
+            ).fetchone()[0]
+            if expected_version is not None and version != expected_version:
+                raise VersionConflictError(f"expected version {expected_version}, found {version}")
+            
+            for change in changes:
+                self._apply(change)
+            self.conn.execute(
+                "UPDATE learners SET version = version + 1 WHERE learner_id = ?", (self.learner_id,)
+            )
+            self.database.write_count += 1
+            # Inside the write transaction no other connection can commit, so
+            # data_version is still the one that follows this commit
+            token = self.change_token()
+        return token
+    
+    def replace(self, progress: Progress) -> Optional[Any]:
+        """Rewrite all rows belonging to the learner."""
+        with self.database.lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            current = self.conn.execute(
+                "SELECT version FROM learners WHERE learner_id = ?", (self.learner_id,)
+            ).fetchone()
+            progress.version = max(progress.version, current[0] if current else 0) + 1
+            self._replace_rows(progress, progress.version)
+            token = self.change_token()
+        return token
+    
+    def initialize(self, progress: Progress):
+        """Insert the learner unless another process created the row first."""
+        with self.database.lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            if not self.exists():
+                self._replace_rows(progress, progress.version)
+    
+    def _replace_rows(self, progress: Progress, version: int):
+        """Delete and re-insert the learner's rows at `version` (transaction held)."""
+        progress = progress.to_dict()
+        for table in ("learners", "completed_days", "completed_weeks", "assessment_scores",
+                      "skills", "badges", "notes", "portfolio_projects"):
+            self.conn.execute(f"DELETE FROM {table} WHERE learner_id = ?", (self.learner_id,))
+        
+        self.conn.execute("INSERT INTO learners (learner_id) VALUES (?)", (self.learner_id,))
+        for field in LEARNER_FIELDS:
+            if field in progress and field != "version":
+                self._apply(set_change([field], progress[field]))
+        for collection in ("completed_days", "completed_weeks", "assessment_scores",
+                           "skills", "badges", "notes"):
+            self._apply(set_change([collection], progress.get(collection) or {}))
+        for project in progress.get("portfolio_projects", []):
+            self._apply(append_change(["portfolio_projects"], project))
+        
+        self.conn.execute("UPDATE learners SET version = ? WHERE learner_id = ?", (version, self.learner_id))
+        self.database.write_count += 1
+    
+    def _apply(self, change: Dict[str, Any]):
+        """Translate one change event into SQL."""
+        path = change["path"]
+        value = change["value"]
+        field = path[0]
+        
+        if change["op"] == "append":
+            if field != "portfolio_projects":
+                raise ValueError(f"Cannot append to {field}")
+            self.conn.execute(
+                "INSERT INTO portfolio_projects "
+                "(learner_id, name, description, technologies, repository, completed_date) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.learner_id, value["name"], value["description"], json.dumps(value["technologies"]),
+                 value.get("repository", ""), value["completed_date"])
+            )
+            return
+        
+        if field in LEARNER_FIELDS:
+            self.conn.execute(
+                f"UPDATE learners SET {field} = ? WHERE learner_id = ?", (value, self.learner_id)
+            )
+            return
+        
+        # Setting a whole collection replaces its rows; setting one key upserts a row
+        if len(path) == 1:
+            table = "portfolio_projects" if field == "portfolio_projects" else field
+            self.conn.execute(f"DELETE FROM {table} WHERE learner_id = ?", (self.learner_id,))
+            if field == "badges":
+                items = [(badge, badge) for badge in value]
+            elif field == "portfolio_projects":
+                for project in value:
+                    self._apply(append_change(["portfolio_projects"], project))
+                return
+            else:
+                items = value.items()
+            for key, item in items:
+                self._apply(set_change([field, key], item))
+            return
+        
+        key = path[1]
+        if field == "completed_days":
+            self.conn.execute(
+                "INSERT OR REPLACE INTO completed_days VALUES (?, ?, ?, ?)",
+                (self.learner_id, key, value["completed_date"], value["hours_spent"])
+            )
+        elif field == "completed_weeks":
+            if value:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO completed_weeks VALUES (?, ?)", (self.learner_id, key)
+                )
+            else:
+                self.conn.execute(
+                    "DELETE FROM completed_weeks WHERE learner_id = ? AND week = ?", (self.learner_id, key)
+                )
+        elif field == "assessment_scores":
+            self.conn.execute(
+                "INSERT OR REPLACE INTO assessment_scores VALUES (?, ?, ?, ?, ?)",
+                (self.learner_id, key, value["score"], value["date"], int(value["passed"]))
+            )
+        elif field == "skills":
+            self.conn.execute(
+                "INSERT OR REPLACE INTO skills VALUES (?, ?, ?)", (self.learner_id, key, value)
+            )
+        elif field == "badges":
+            self.conn.execute(
+                "INSERT OR IGNORE INTO badges VALUES (?, ?, "
+                "(SELECT COUNT(*) FROM badges WHERE learner_id = ?))",
+                (self.learner_id, key, self.learner_id)
+            )
+        elif field == "notes":
+            self.conn.execute(
+                "INSERT OR REPLACE INTO notes VALUES (?, ?, ?, ?)",
+                (self.learner_id, key, value["note"], value["date"])
+            )
+        else:
+            raise ValueError(f"Unknown progress field: {field}")
+
+
+_databases: Dict[str, ProgressDatabase] = {}
+
+
+def open_database(db_file: Path) -> ProgressDatabase:
+    """Open a progress database, reusing the connection within a process."""
+    key = str(Path(db_file).resolve())
+    if key not in _databases:
+        _databases[key] = ProgressDatabase(db_file)
+    return _databases[key]
+
+
+def default_learner_id() -> str:
+    """Pick a learner id when none is configured."""
+    return os.getenv("BOOTCAMP_LEARNER_ID") or getpass.getuser()
+
+
+def create_storage(backend: str, progress_file: Path, **options) -> ProgressStorage:
+    """Create a storage backend by name."""
+    if backend == "json":
+        return JsonFileStorage(progress_file)
+    if backend == "eventlog":
+        return EventLogStorage(progress_file, compact_every=options.get("compact_every", 100))
+    if backend == "sqlite":
+        database = open_database(options.get("db_file") or Path(progress_file).with_name("cohort.sqlite"))
+        return database.storage_for(options.get("learner_id") or default_learner_id())
+    raise ValueError(f"Unknown progress backend: {backend}")
@@ -4,155 +4,207 @@ Progress Tracker for Cloud Engineer Bootcamp
 Tracks user progress, completion status, streaks, and skill development.
 """
 
-import json
+import functools
+import random
+import time
 from datetime import datetime, date
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from achievements import AchievementEngine
+from progress_model import Progress, CompletedDay, Note, AssessmentResult, PortfolioProject, day_key, week_key
+from progress_storage import (
+    ProgressStorage, VersionConflictError, create_storage, set_change, append_change
+)
+
+
+def _retry_on_conflict(method):
+    """Re-run a read-modify-write mutator when another writer got there first.
+
+    Mutators change the cached document in place, so it is dropped whenever
+    one fails before its changes are stored.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return method(self, *args, **kwargs)
+            except VersionConflictError:
+                self._invalidate_cache()
+                if attempt == self.max_retries:
+                    raise
+                # Jittered backoff so competing writers don't retry in lockstep
+                time.sleep(random.uniform(0, 0.005 * 2 ** min(attempt, 6)))
+            except BaseException:
+                self._invalidate_cache()
+                raise
+    return wrapper
 
 
 class ProgressTracker:
     """Manages user progress throughout the bootcamp."""
     
-    def __init__(self, progress_file: str = "progress/user_progress.json"):
+    def __init__(self, progress_file: str = "progress/user_progress.json",
+                 backend: str = "eventlog", storage: Optional[ProgressStorage] = None,
+                 max_retries: int = 20, achievements: Optional[AchievementEngine] = None,
+                 **storage_options):
         """Initialize progress tracker."""
         self.progress_file = Path(progress_file)
         self.progress_file.parent.mkdir(parents=True, exist_ok=True)
+        self.storage = storage or create_storage(backend, self.progress_file, **storage_options)
+        self.achievements = achievements or AchievementEngine()
+        self.max_retries = max_retries
+        self.parse_count = 0
+        self._cache = None
+        self._cache_token = None
         self._ensure_progress_file()
     
     def _ensure_progress_file(self):
         """Ensure progress file exists with default structure."""
-        if not self.progress_file.exists():
-            default_progress = {
-                "started": False,
-                "user_name": "",
-                "start_date": "",
-                "current_week": 1,
-                "current_day": 1,
-                "days_completed": 0,
-                "streak": 0,
-                "last_activity_date": "",
-                "completed_weeks": {},
-                "completed_days": {},
-                "assessment_scores": {},
-                "skills": {},
-                "badges": [],
-                "portfolio_projects": [],
-                "total_hours": 0,
-                "notes": {}
-            }
-            self._save_progress(default_progress)
+        if not self.storage.exists():
+            self.storage.initialize(Progress())
+    
+    def _load_progress(self) -> Progress:
+        """Load progress from storage, reusing the cached copy if it's still current.
+        
+        The returned document is shared between callers and must be treated
+        as read-only outside of the mutators below.
+        """
+        token = self.storage.change_token()
+        if self._cache is not None and token is not None and token == self._cache_token:
+            return self._cache
+        
+        self._cache = self.storage.load()
+        self._cache_token = token
+        self.parse_count += 1
+        return self._cache
+    
+    def _invalidate_cache(self):
+        """Drop the cached document, which may hold changes that weren't stored."""
+        self._cache = None
+        self._cache_token = None
     
-    def _load_progress(self) -> Dict[str, Any]:
-        """Load progress from JSON file."""
-        with open(self.progress_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    def _save_progress(self, progress: Progress):
+        """Replace the stored progress document."""
+        try:
+            token = self.storage.replace(progress)
+        except BaseException:
+            self._invalidate_cache()
+            raise
+        self._cache = progress
+        self._cache_token = token
     
-    def _save_progress(self, progress: Dict[str, Any]):
-        """Save progress to JSON file."""
-        with open(self.progress_file, 'w', encoding='utf-8') as f:
-            json.dump(progress, f, indent=2)
+    def _record_changes(self, progress: Progress, changes: List[Dict[str, Any]]):
+        """Persist only the fields touched by a mutation of `progress`.
+        
+        `progress` must already hold the changes; once they are stored it
+        stays cached as the current document, so the next call doesn't
+        parse it again. Raises VersionConflictError if the stored document
+        changed after `progress` was loaded; mutators are wrapped in
+        _retry_on_conflict so they re-run against the fresh document.
+        """
+        token = self.storage.append(changes, expected_version=progress.version)
+        progress.version += 1
+        self._cache = progress
+        self._cache_token = token
     
+    @_retry_on_conflict
     def initialize_progress(self, user_name: str):
         """Initialize progress for a new user."""
         progress = self._load_progress()
-        progress.update({
-            "started": True,
-            "user_name": user_name,
-            "start_date": str(date.today()),
-            "last_activity_date": str(date.today()),
-            "streak": 1
-        })
-        self._save_progress(progress)
+        progress.started = True
+        progress.user_name = user_name
+        progress.start_date = str(date.today())
+        progress.last_activity_date = str(date.today())
+        progress.streak = 1
+        self._record_changes(progress, [
+            set_change(["started"], progress.started),
+            set_change(["user_name"], progress.user_name),
+            set_change(["start_date"], progress.start_date),
+            set_change(["last_activity_date"], progress.last_activity_date),
+            set_change(["streak"], progress.streak)
+        ])
     
-    def get_progress(self) -> Dict[str, Any]:
+    def get_progress(self) -> Progress:
         """Get current progress."""
         return self._load_progress()
     
+    @_retry_on_conflict
     def complete_day(self, week: int, day: int, hours_spent: float = 6.0):
         """Mark a day as completed."""
         progress = self._load_progress()
         
-        day_key = f"week{week}_day{day}"
-        if day_key not in progress.get("completed_days", {}):
-            progress["days_completed"] = progress.get("days_completed", 0) + 1
+        changed = ["completed_days", "total_hours"]
+        if (week, day) not in progress.completed_days:
+            progress.days_completed += 1
+            changed.append("days_completed")
         
-        progress["completed_days"][day_key] = {
-            "completed_date": str(date.today()),
-            "hours_spent": hours_spent
-        }
+        completed = CompletedDay(str(date.today()), hours_spent)
+        progress.completed_days[(week, day)] = completed
+        progress.total_hours += hours_spent
         
-        progress["total_hours"] = progress.get("total_hours", 0) + hours_spent
-        progress["last_activity_date"] = str(date.today())
-        
-        # Update streak
+        # Update streak, from the last activity before today's
+        streak = progress.streak
         self._update_streak(progress)
+        if progress.streak != streak:
+            changed.append("streak")
+        progress.last_activity_date = str(date.today())
         
-        # Check for badges
-        self._check_and_award_badges(progress)
-        
-        self._save_progress(progress)
+        changes = [
+            set_change(["completed_days", day_key(week, day)], completed.to_dict()),
+            set_change(["days_completed"], progress.days_completed),
+            set_change(["total_hours"], progress.total_hours),
+            set_change(["last_activity_date"], progress.last_activity_date),
+            set_change(["streak"], progress.streak)
+        ]
+        # Only rules depending on the fields that changed are evaluated
+        changes += self._award_badges(progress, changed)
+        self._record_changes(progress, changes)
     
+    @_retry_on_conflict
     def advance_to_next_day(self):
         """Advance to the next day in the curriculum."""
         progress = self._load_progress()
         
-        current_day = progress.get("current_day", 1)
-        current_week = progress.get("current_week", 1)
-        
-        if current_day < 5:
-            progress["current_day"] = current_day + 1
+        if progress.current_day < 5:
+            progress.current_day += 1
         else:
-            progress["current_day"] = 1
-            progress["current_week"] = min(current_week + 1, 8)
+            progress.current_day = 1
+            progress.current_week = min(progress.current_week + 1, 8)
         
-        self._save_progress(progress)
+        self._record_changes(progress, [
+            set_change(["current_day"], progress.current_day),
+            set_change(["current_week"], progress.current_week)
+        ])
     
+    @_retry_on_conflict
     def complete_week_assessment(self, week: int, score: float):
         """Record week assessment completion and score."""
         progress = self._load_progress()
         
-        progress["assessment_scores"][f"week{week}"] = {
-            "score": score,
-            "date": str(date.today()),
-            "passed": score >= 70
-        }
+        result = AssessmentResult(score, str(date.today()), score >= 70)
+        progress.assessment_scores[week] = result
+        changes = [set_change(["assessment_scores", week_key(week)], result.to_dict())]
         
-        if score >= 70:
-            progress["completed_weeks"][str(week)] = True
+        changed = ["assessment_scores"]
+        if result.passed:
+            progress.completed_weeks.add(week)
             # Award skill points based on week
-            self._update_skills(progress, week, score)
+            self.achievements.update_skills(progress, week, score)
+            changes.append(set_change(["completed_weeks", str(week)], True))
+            changes.append(set_change(["skills"], progress.skills))
+            changed.append("completed_weeks")
         
-        self._save_progress(progress)
+        changes += self._award_badges(progress, changed)
+        self._record_changes(progress, changes)
     
-    def _update_skills(self, progress: Dict[str, Any], week: int, score: float):
-        """Update skill proficiency based on completed week."""
-        skills_by_week = {
-            1: ["Linux", "Command Line"],
-            2: ["Networking", "Scripting", "Git"],
-            3: ["Docker", "Containerization"],
-            4: ["Kubernetes", "Orchestration"],
-            5: ["CI/CD", "GitHub Actions"],
-            6: ["Terraform", "IaC", "GitOps"],
-            7: ["Cloud Platforms", "AWS/Azure/GCP"],
-            8: ["Monitoring", "Security", "Production"]
-        }
-        
-        if "skills" not in progress:
-            progress["skills"] = {}
-        
-        for skill in skills_by_week.get(week, []):
-            current_level = progress["skills"].get(skill, 0)
-            # Increase skill level based on assessment score
-            increase = (score / 100) * 20  # Max 20 points per week
-            progress["skills"][skill] = min(current_level + increase, 100)
-    
-    def _update_streak(self, progress: Dict[str, Any]):
+    def _update_streak(self, progress: Progress):
         """Update learning streak."""
         today = date.today()
-        last_activity = progress.get("last_activity_date", "")
+        last_activity = progress.last_activity_date
         
         if not last_activity:
-            progress["streak"] = 1
+            progress.streak = 1
             return
         
         last_date = date.fromisoformat(last_activity)
@@ -163,128 +215,77 @@ class ProgressTracker:
             pass
         elif days_diff == 1:
             # Consecutive day, increase streak
-            progress["streak"] = progress.get("streak", 0) + 1
+            progress.streak += 1
         else:
             # Streak broken
-            progress["streak"] = 1
+            progress.streak = 1
     
-    def _check_and_award_badges(self, progress: Dict[str, Any]):
-        """Check and award achievement badges."""
-        badges = progress.get("badges", [])
-        days_completed = progress.get("days_completed", 0)
-        streak = progress.get("streak", 0)
-        
-        badge_criteria = {
-            "First Step": ("Complete your first day", lambda p: p["days_completed"] >= 1),
-            "Week Warrior": ("Complete a full week", lambda p: p["days_completed"] >= 5),
-            "Month Master": ("Complete 20 days", lambda p: p["days_completed"] >= 20),
-            "Streak Starter": ("Maintain a 3-day streak", lambda p: p["streak"] >= 3),
-            "Streak Master": ("Maintain a 7-day streak", lambda p: p["streak"] >= 7),
-            "Dedication": ("Maintain a 14-day streak", lambda p: p["streak"] >= 14),
-            "Foundation Expert": ("Complete Week 2", lambda p: p["completed_weeks"].get("2", False)),
-            "Container Captain": ("Complete Week 4", lambda p: p["completed_weeks"].get("4", False)),
-            "Pipeline Pro": ("Complete Week 6", lambda p: p["completed_weeks"].get("6", False)),
-            "Cloud Champion": ("Complete Week 8", lambda p: p["completed_weeks"].get("8", False)),
-        }
-        
-        for badge_name, (description, criteria) in badge_criteria.items():
-            if badge_name not in badges and criteria(progress):
-                badges.append(badge_name)
-                progress["badges"] = badges
+    def _award_badges(self, progress: Progress, changed: List[str]) -> List[Dict[str, Any]]:
+        """Award badges affected by the `changed` fields and return the change events."""
+        if not self.achievements.award_badges(progress, changed):
+            return []
+        return [set_change(["badges"], progress.badges)]
     
+    @_retry_on_conflict
     def add_portfolio_project(self, project_name: str, description: str, 
                              technologies: List[str], repository: str = ""):
         """Add a portfolio project to tracking."""
         progress = self._load_progress()
         
-        project = {
-            "name": project_name,
-            "description": description,
-            "technologies": technologies,
-            "repository": repository,
-            "completed_date": str(date.today())
-        }
-        
-        if "portfolio_projects" not in progress:
-            progress["portfolio_projects"] = []
-        
-        progress["portfolio_projects"].append(project)
-        self._save_progress(progress)
+        project = PortfolioProject(project_name, description, technologies, repository, str(date.today()))
+        progress.portfolio_projects.append(project)
+        changes = [append_change(["portfolio_projects"], project.to_dict())]
+        changes += self._award_badges(progress, ["portfolio_projects"])
+        self._record_changes(progress, changes)
     
+    @_retry_on_conflict
     def add_note(self, week: int, day: int, note: str):
         """Add a note for a specific day."""
         progress = self._load_progress()
         
-        if "notes" not in progress:
-            progress["notes"] = {}
-        
-        day_key = f"week{week}_day{day}"
-        progress["notes"][day_key] = {
-            "note": note,
-            "date": str(date.today())
-        }
-        
-        self._save_progress(progress)
+        progress.notes[(week, day)] = Note(note, str(date.today()))
+        changes = [set_change(["notes", day_key(week, day)], progress.notes[(week, day)].to_dict())]
+        changes += self._award_badges(progress, ["notes"])
+        self._record_changes(progress, changes)
     
     def get_skill_summary(self) -> Dict[str, float]:
         """Get summary of skill proficiency levels."""
-        progress = self._load_progress()
-        return progress.get("skills", {})
+        return self._load_progress().skills
     
     def get_badges(self) -> List[str]:
         """Get list of earned badges."""
-        progress = self._load_progress()
-        return progress.get("badges", [])
+        return self._load_progress().badges
     
     def reset_progress(self):
         """Reset all progress (use with caution!)."""
-        default_progress = {
-            "started": False,
-            "user_name": "",
-            "start_date": "",
-            "current_week": 1,
-            "current_day": 1,
-            "days_completed": 0,
-            "streak": 0,
-            "last_activity_date": "",
-            "completed_weeks": {},
-            "completed_days": {},
-            "assessment_scores": {},
-            "skills": {},
-            "badges": [],
-            "portfolio_projects": [],
-            "total_hours": 0,
-            "notes": {}
-        }
-        self._save_progress(default_progress)
+        self._save_progress(Progress())
     
     def export_progress_report(self) -> str:
         """Export a formatted progress report."""
         progress = self._load_progress()
         
         report = f"""
-# Progress Report for {progress.get('user_name', 'Student')}
+# Progress Report for {progress.user_name or 'Student'}
 
 ## Overview
-- Started: {progress.get('start_date', 'N/A')}
-- Current Position: Week {progress.get('current_week', 1)}, Day {progress.get('current_day', 1)}
-- Days Completed: {progress.get('days_completed', 0)}/40
-- Total Hours: {progress.get('total_hours', 0)}
-- Current Streak: {progress.get('streak', 0)} days
+- Started: {progress.start_date or 'N/A'}
+- Current Position: Week {progress.current_week}, Day {progress.current_day}
+- Days Completed: {progress.days_completed}/40
+- Total Hours: {progress.total_hours}
+- Current Streak: {progress.streak} days
 
 ## Skills Proficiency
 """
-        skills = progress.get('skills', {})
-        for skill, level in sorted(skills.items(), key=lambda x: x[1], reverse=True):
+        for skill, level in sorted(progress.skills.items(), key=lambda x: x[1], reverse=True):
             report += f"- {skill}: {level:.1f}%\n"
         
         report += "\n## Badges Earned\n"
-        for badge in progress.get('badges', []):
+        for badge in progress.badges:
             report += f"- 🏆 {badge}\n"
         
         report += "\n## Portfolio Projects\n"
-        for project in progress.get('portfolio_projects', []):
-            report += f"- **{project['name']}**: {project['description']}\n"
-            report += f"  Technologies: {', '.join(project['technologies'])}\n"
+        for project in progress.portfolio_projects:
+            report += f"- **{project.name}**: {project.description}\n"
+            report += f"  Technologies: {', '.join(project.technologies)}\n"
         
         return report
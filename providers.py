@@ -0,0 +1,494 @@
+"""
+AI Providers for Cloud Engineer Bootcamp
+
+A common interface over the OpenAI, Anthropic and Ollama clients, and a
+router that gives every call a deadline, retries transient failures with
+jittered backoff, fails over to the next configured provider and can hedge a
+slow request by starting it on a second provider.
+
+Requests are laid out as a stable prefix (system prompt, then earlier turns)
+followed by the new question, so providers can serve the prefix from their
+prompt cache: OpenAI does so automatically, Anthropic at the `cache_control`
+breakpoints set here.
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful cloud engineering mentor."
+
+
+class ProviderError(Exception):
+    """Raised when no provider could answer a request."""
+    
+    def __init__(self, message: str, retryable: bool = False, emitted: bool = False,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        # True once part of the answer was already passed to the caller
+        self.emitted = emitted
+        self.retry_after = retry_after
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Get the wait time a provider asked for, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether an error is a rate limit, timeout or transient server failure."""
+    if isinstance(error, ProviderError):
+        return error.retryable
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    # Connection errors and timeouts from the SDKs and Ollama carry no status code
+    return isinstance(error, (TimeoutError, ConnectionError)) or type(error).__name__ in (
+        "APIConnectionError", "APITimeoutError", "OllamaError"
+    )
+
+
+class Provider:
+    """Interface for AI providers."""
+    
+    name = ""
+    
+    def __init__(self, model: str):
+        self.model = model
+    
+    def stream(self, system_prompt: Optional[str], messages: List[Dict[str, str]], temperature: float,
+               max_tokens: int, timeout: float, usage: Dict[str, Any]) -> Iterator[str]:
+        """Stream a chat completion, yielding text as it arrives.
+
+        Implementations set `usage["connected_at"]` (time.monotonic()) once the
+        provider has started responding, and `prompt_tokens`, `completion_tokens`
+        and `cached_tokens` (the part of the prompt read from the provider's
+        prompt cache) from the provider's usage fields when it reports them.
+        """
+        raise NotImplementedError
+
+
+class OpenAIProvider(Provider):
+    """OpenAI chat completions."""
+    
+    name = "openai"
+    
+    def __init__(self, model: str, api_key: str):
+        from openai import OpenAI
+        
+        super().__init__(model)
+        # The router does the retrying, so it can fail over instead
+        self.client = OpenAI(api_key=api_key, max_retries=0)
+    
+    def stream(self, system_prompt, messages, temperature, max_tokens, timeout, usage):
+        if system_prompt:
+            messages = [{"role": "system", "content": system_prompt}] + messages
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},
+            timeout=timeout
+        )
+        usage["connected_at"] = time.monotonic()
+        with stream:
+            for chunk in stream:
+                if chunk.usage:
+                    usage["prompt_tokens"] = chunk.usage.prompt_tokens
+                    usage["completion_tokens"] = chunk.usage.completion_tokens
+                    # Prompts from 1024 tokens up are cached automatically
+                    details = getattr(chunk.usage, "prompt_tokens_details", None)
+                    usage["cached_tokens"] = getattr(details, "cached_tokens", None)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+
+class AnthropicProvider(Provider):
+    """Anthropic messages."""
+    
+    name = "anthropic"
+    
+    def __init__(self, model: str, api_key: str, prompt_caching: bool = True):
+        from anthropic import Anthropic
+        
+        super().__init__(model)
+        self.client = Anthropic(api_key=api_key, max_retries=0)
+        self.prompt_caching = prompt_caching
+    
+    @staticmethod
+    def _cacheable(system_prompt: str,
+                   messages: List[Dict[str, str]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Mark the end of the system prompt and of the earlier turns as cache breakpoints."""
+        cache_control = {"type": "ephemeral"}
+        system = [{"type": "text", "text": system_prompt, "cache_control": cache_control}]
+        if len(messages) > 1:
+            last_turn = messages[-2]
+            messages = messages[:-2] + [
+                {"role": last_turn["role"],
+                 "content": [{"type": "text", "text": last_turn["content"], "cache_control": cache_control}]},
+                messages[-1]
+            ]
+        return system, messages
+    
+    def stream(self, system_prompt, messages, temperature, max_tokens, timeout, usage):
+        system = system_prompt or DEFAULT_SYSTEM_PROMPT
+        if self.prompt_caching:
+            system, messages = self._cacheable(system, messages)
+        with self.client.messages.stream(
+            model=self.model,
+            system=system,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout
+        ) as stream:
+            usage["connected_at"] = time.monotonic()
+            yield from stream.text_stream
+            final = stream.get_final_message()
+            # input_tokens only counts the part after the last cache breakpoint
+            cache_read = getattr(final.usage, "cache_read_input_tokens", None) or 0
+            cache_write = getattr(final.usage, "cache_creation_input_tokens", None) or 0
+            usage["prompt_tokens"] = final.usage.input_tokens + cache_read + cache_write
+            usage["completion_tokens"] = final.usage.output_tokens
+            usage["cached_tokens"] = cache_read
+
+
+class OllamaProvider(Provider):
+    """Local models served by Ollama."""
+    
+    name = "ollama"
+    
+    def __init__(self, model: str, host: str):
+        from ollama_client import OllamaClient
+        
+        super().__init__(model)
+        self.client = OllamaClient(host)
+    
+    def stream(self, system_prompt, messages, temperature, max_tokens, timeout, usage):
+        if system_prompt:
+            messages = [{"role": "system", "content": system_prompt}] + messages
+        final: Dict[str, Any] = {}
+        yield from self.client.chat_stream(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            final=final,
+            timeout=timeout
+        )
+        usage["connected_at"] = final.get("connected_at")
+        usage["prompt_tokens"] = final.get("prompt_eval_count")
+        usage["completion_tokens"] = final.get("eval_count")
+        # Ollama reuses its KV cache for a repeated prefix without reporting
+        # it; the bundled mock server reports the simulated count
+        usage["cached_tokens"] = final.get("cached_tokens")
+
+
+def create_provider(name: str, config: Dict[str, Any]) -> Provider:
+    """Create a provider from config.yaml settings.
+
+    Raises ProviderError when the provider's SDK or API key is missing.
+    """
+    import importlib.util
+    
+    if name == 'openai':
+        if importlib.util.find_spec("openai") is None:
+            raise ProviderError("the openai package is not installed")
+        if not os.getenv('OPENAI_API_KEY'):
+            raise ProviderError("OPENAI_API_KEY not set")
+        return OpenAIProvider(config.get('openai_model', 'gpt-4'), os.getenv('OPENAI_API_KEY'))
+    
+    if name == 'anthropic':
+        if importlib.util.find_spec("anthropic") is None:
+            raise ProviderError("the anthropic package is not installed")
+        if not os.getenv('ANTHROPIC_API_KEY'):
+            raise ProviderError("ANTHROPIC_API_KEY not set")
+        return AnthropicProvider(
+            config.get('anthropic_model', 'claude-3-sonnet-20240229'), os.getenv('ANTHROPIC_API_KEY'),
+            prompt_caching=config.get('providers', {}).get('prompt_caching', True)
+        )
+    
+    if name == 'ollama':
+        from ollama_client import DEFAULT_HOST
+        
+        # Connections are only opened on the first request
+        return OllamaProvider(
+            config.get('ollama_model', 'llama2'),
+            os.getenv('OLLAMA_HOST') or config.get('ollama_host', DEFAULT_HOST)
+        )
+    
+    raise ProviderError(f"unknown provider '{name}'")
+
+
+class _Attempt:
+    """One provider call running on a background thread."""
+    
+    def __init__(self, provider: Provider, request: Dict[str, Any], events: queue.Queue):
+        self.provider = provider
+        self.request = request
+        self.events = events
+        self.usage: Dict[str, Any] = {}
+        self.cancelled = threading.Event()
+    
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+    
+    def _run(self):
+        try:
+            stream = self.provider.stream(**self.request, usage=self.usage)
+            for chunk in stream:
+                if self.cancelled.is_set():
+                    # Closing the generator closes the underlying HTTP response
+                    stream.close()
+                    return
+                self.events.put((self, "chunk", chunk))
+            self.events.put((self, "done", None))
+        except Exception as e:
+            self.events.put((self, "error", e))
+    
+    def cancel(self):
+        self.cancelled.set()
+
+
+class ProviderRouter:
+    """Routes calls across providers with deadlines, retries, failover and hedging."""
+    
+    def __init__(self, providers: List[Provider], timeout: float = 120, max_retries: int = 2,
+                 hedge_after: Optional[float] = None, backoff: float = 0.5):
+        """Initialize the router.
+
+        `providers` are tried in order: the first is the primary, the rest
+        take over when it fails. With `hedge_after` set, the next provider is
+        also started when no text has arrived after that many seconds, and
+        whichever answers first wins. `timeout` bounds each call, retries
+        included.
+        """
+        if not providers:
+            raise ValueError("at least one provider is required")
+        self.providers = providers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.hedge_after = hedge_after
+        self.backoff = backoff
+        self.stats = {"calls": 0, "retries": 0, "hedges": 0, "failovers": 0}
+        self._stats_lock = threading.Lock()
+    
+    @property
+    def primary(self) -> Provider:
+        """The provider every call starts with."""
+        return self.providers[0]
+    
+    def _count(self, stat: str):
+        with self._stats_lock:
+            self.stats[stat] += 1
+    
+    def stream(self, system_prompt: Optional[str], messages: List[Dict[str, str]],
+               temperature: float = 0.7, max_tokens: int = 2000,
+               metrics: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Stream a response from the first provider able to give one.
+
+        Retries only happen before any text has been yielded; a failure after
+        that raises ProviderError with `emitted` set. If `metrics` is given,
+        it is filled with the answering provider and model, token counts,
+        retry/hedge/failover counts and connect, first token and total times
+        in milliseconds, plus `cached_tokens` when the provider reports a
+        prompt cache hit.
+        """
+        self._count("calls")
+        start = time.monotonic()
+        deadline = start + self.timeout
+        request = {
+            "system_prompt": system_prompt,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        metrics = metrics if metrics is not None else {}
+        metrics.update(retries=0, hedges=0, failovers=0)
+        first_token_at = None
+        
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    if self.hedge_after and len(self.providers) > 1:
+                        chunks = self._hedged_stream(request, deadline, metrics)
+                    else:
+                        chunks = self._sequential_stream(request, deadline, metrics)
+                    for chunk in chunks:
+                        if first_token_at is None:
+                            first_token_at = time.monotonic()
+                        yield chunk
+                    return
+                except ProviderError as e:
+                    remaining = deadline - time.monotonic()
+                    if e.emitted or not e.retryable or attempt == self.max_retries or remaining <= 0:
+                        metrics["error"] = str(e)
+                        raise
+                    self._count("retries")
+                    metrics["retries"] += 1
+                    delay = e.retry_after or self.backoff * 2 ** attempt
+                    time.sleep(min(remaining, delay * random.uniform(1.0, 1.5)))
+        finally:
+            connected_at = metrics.pop("connected_at", None)
+            metrics["connect_ms"] = round((connected_at - start) * 1000, 1) if connected_at else None
+            metrics["first_token_ms"] = round((first_token_at - start) * 1000, 1) if first_token_at else None
+            metrics["total_ms"] = round((time.monotonic() - start) * 1000, 1)
+    
+    def complete(self, system_prompt: Optional[str], messages: List[Dict[str, str]],
+                 temperature: float = 0.7, max_tokens: int = 2000,
+                 metrics: Optional[Dict[str, Any]] = None) -> str:
+        """Get a complete response."""
+        return "".join(self.stream(system_prompt, messages, temperature, max_tokens, metrics))
+    
+    @staticmethod
+    def _record_winner(metrics: Dict[str, Any], provider: Provider, usage: Dict[str, Any]):
+        """Copy the answering provider's details into the call metrics."""
+        metrics.update(provider=provider.name, model=provider.model)
+        for key in ("connected_at", "prompt_tokens", "completion_tokens", "cached_tokens"):
+            metrics[key] = usage.get(key)
+    
+    def _sequential_stream(self, request: Dict[str, Any], deadline: float,
+                           metrics: Dict[str, Any]) -> Iterator[str]:
+        """Run one round without hedging: each provider in turn, on the caller's thread."""
+        errors: List[Exception] = []
+        for index, provider in enumerate(self.providers):
+            if index:
+                self._count("failovers")
+                metrics["failovers"] += 1
+            emitted = False
+            usage: Dict[str, Any] = {}
+            try:
+                for chunk in provider.stream(**request, timeout=max(0.1, deadline - time.monotonic()), usage=usage):
+                    emitted = True
+                    yield chunk
+                    if time.monotonic() >= deadline:
+                        raise ProviderError(f"no complete response within {self.timeout:g}s", emitted=True)
+                self._record_winner(metrics, provider, usage)
+                return
+            except ProviderError:
+                raise
+            except Exception as e:
+                if emitted:
+                    raise ProviderError(f"{provider.name}: {e}", emitted=True) from e
+                errors.append(e)
+            if time.monotonic() >= deadline:
+                break
+        
+        raise ProviderError(
+            "; ".join(f"{provider.name}: {e}" for provider, e in zip(self.providers, errors)),
+            retryable=any(is_retryable(e) for e in errors),
+            retry_after=max(retry_after(e) or 0 for e in errors) or None
+        ) from errors[-1]
+    
+    def _hedged_stream(self, request: Dict[str, Any], deadline: float,
+                       metrics: Dict[str, Any]) -> Iterator[str]:
+        """Run one round: the primary, plus failover and hedged calls to later providers."""
+        events: queue.Queue = queue.Queue()
+        attempts: List[_Attempt] = []
+        finished = set()
+        errors: List[Exception] = []
+        winner: Optional[_Attempt] = None
+        hedge_at = time.monotonic() + self.hedge_after if self.hedge_after else None
+        
+        def launch():
+            attempt = _Attempt(
+                self.providers[len(attempts)],
+                dict(request, timeout=max(0.1, deadline - time.monotonic())),
+                events
+            )
+            attempts.append(attempt)
+            attempt.start()
+        
+        launch()
+        try:
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    raise ProviderError(
+                        f"no response within {self.timeout:g}s", retryable=winner is None, emitted=winner is not None
+                    )
+                wait = deadline - now
+                can_hedge = winner is None and hedge_at is not None and len(attempts) < len(self.providers)
+                if can_hedge:
+                    wait = min(wait, max(0.0, hedge_at - now))
+                
+                try:
+                    attempt, kind, payload = events.get(timeout=wait)
+                except queue.Empty:
+                    if can_hedge and time.monotonic() >= hedge_at:
+                        self._count("hedges")
+                        metrics["hedges"] += 1
+                        launch()
+                        hedge_at = time.monotonic() + self.hedge_after
+                    continue
+                
+                if winner is not None and attempt is not winner:
+                    continue
+                
+                if kind == "error":
+                    if attempt is winner:
+                        raise ProviderError(f"{attempt.provider.name}: {payload}", emitted=True) from payload
+                    finished.add(attempt)
+                    errors.append(payload)
+                    if len(attempts) < len(self.providers):
+                        self._count("failovers")
+                        metrics["failovers"] += 1
+                        launch()
+                    elif len(finished) == len(attempts):
+                        raise ProviderError(
+                            "; ".join(f"{a.provider.name}: {e}" for a, e in zip(attempts, errors)),
+                            retryable=any(is_retryable(e) for e in errors),
+                            retry_after=max(retry_after(e) or 0 for e in errors) or None
+                        ) from errors[-1]
+                    continue
+                
+                if winner is None:
+                    winner = attempt
+                    for other in attempts:
+                        if other is not winner:
+                            other.cancel()
+                if kind == "done":
+                    self._record_winner(metrics, attempt.provider, attempt.usage)
+                    return
+                yield payload
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+
+def create_router(config: Dict[str, Any], max_retries: Optional[int] = None) -> ProviderRouter:
+    """Create a router for ai_provider and the fallbacks configured in config.yaml.
+
+    Raises ProviderError if none of them is usable; the message lists why.
+    """
+    router_config = config.get('providers', {})
+    names = [config.get('ai_provider', 'openai')]
+    names += [name for name in router_config.get('fallback', []) if name not in names]
+    
+    providers, problems = [], []
+    for name in names:
+        try:
+            providers.append(create_provider(name, config))
+        except ProviderError as e:
+            problems.append(f"{name}: {e}")
+    if not providers:
+        raise ProviderError("; ".join(problems))
+    
+    hedge_after_ms = router_config.get('hedge_after_ms', 0)
+    return ProviderRouter(
+        providers,
+        timeout=router_config.get('timeout', 120),
+        max_retries=router_config.get('max_retries', 2) if max_retries is None else max_retries,
+        hedge_after=hedge_after_ms / 1000 if hedge_after_ms else None
+    )
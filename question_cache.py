@@ -0,0 +1,356 @@
+"""
+Question Cache for Cloud Engineer Bootcamp
+
+Answers `ask` questions that reword an earlier one ("what is an inode" and
+"explain inodes") from the earlier answer. Questions are normalized and
+shingled, MinHash signatures are indexed with locality-sensitive hashing to
+find candidates, and a candidate is only used after an exact similarity
+check and a check that the two questions don't contradict each other. The index is saved to disk with its signatures and LSH buckets, so
+loading it is a single JSON parse.
+"""
+
+import array
+import atexit
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from progress_model import dumps, loads
+from progress_storage import atomic_write_bytes
+
+FORMAT_VERSION = 1
+
+# Words that change how a question is phrased but not what it asks
+STOP_WORDS = frozenset("""
+a about actually again am an and any are as at be can could define definition describe did do does doing
+explain explanation for give got hey hi i in into is it its just know me mean meaning means my of on or
+please quick quickly really should show simple simply so some tell than that the their them there these
+this to understand us was we were what whats which who would you your
+""".split())
+
+# Never dropped: "why is my instance not reachable" asks the opposite of "why is my instance reachable"
+NEGATIONS = frozenset("""
+aint arent cannot cant couldnt didnt doesnt dont hasnt havent isnt never no none nor not shouldnt wasnt
+werent without wont wouldnt
+""".split())
+
+# Pairs of words that ask opposite things while sharing most of their letters or context
+OPPOSITES = frozenset(frozenset(pair.split("/")) for pair in """
+add/remove allow/deny create/delete decrease/increase decrypt/encrypt disable/enable download/upload export/import
+inbound/outbound max/min maximum/minimum private/public pull/push read/write start/stop
+""".split())
+# Prefixes that turn a word into its opposite ("install" / "uninstall", "enable" / "disable")
+NEGATING_PREFIXES = ("un", "dis", "de", "non")
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _stem(word: str) -> str:
+    """Reduce plurals to their singular so "inodes" and "inode" match."""
+    if len(word) <= 3 or not word.isalpha() or word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("sses", "xes", "ches", "shes")):
+        # "processes" -> "process", "boxes" -> "box"
+        return word[:-2]
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, drop filler words and reduce plurals."""
+    words = [word.strip("./-") for word in _TOKEN.findall(question.lower().replace("'", ""))]
+    # Filler words are dropped before stemming, which would turn "does" into "doe"
+    kept = [word for word in words if word and (word not in STOP_WORDS or word in NEGATIONS)]
+    # A question made only of filler words is still a question
+    return " ".join(_stem(word) for word in (kept or words) if word)
+
+
+def shingles(normalized: str, size: int = 3) -> Set[str]:
+    """Character shingles of a normalized question, including word boundaries."""
+    padded = f" {normalized} "
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+def jaccard(first: Set[str], second: Set[str]) -> float:
+    """Exact Jaccard similarity of two shingle sets."""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+def _opposite(first: str, second: str) -> bool:
+    """Whether two words ask opposite things."""
+    return frozenset((first, second)) in OPPOSITES or any(
+        first == prefix + second or second == prefix + first for prefix in NEGATING_PREFIXES
+    )
+
+
+def _markers(words: Set[str]) -> Set[str]:
+    """Negations and words containing digits, which must match exactly."""
+    return {word for word in words if word in NEGATIONS or any(c.isdigit() for c in word)}
+
+
+def contradicts(first: str, second: str) -> bool:
+    """Whether two normalized questions differ in a way no similarity score should paper over.
+
+    Shingles alone score "install nginx" and "uninstall nginx", "chmod 755"
+    and "chmod 644", or "instance not reachable" and "instance reachable"
+    as near duplicates, so numbers and negations must match and neither
+    question may use a word whose opposite the other one uses.
+    """
+    first_words, second_words = set(first.split()), set(second.split())
+    if _markers(first_words) != _markers(second_words):
+        return True
+    return any(_opposite(a, b) for a in first_words - second_words for b in second_words - first_words)
+
+
+class MinHasher:
+    """Computes MinHash signatures with a fixed family of hash permutations."""
+    
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        """Initialize `num_perm` permutations from `seed`, so signatures are stable across runs."""
+        self.num_perm = num_perm
+        generator = random.Random(seed)
+        self._permutations = [
+            (generator.randrange(1, _MERSENNE_PRIME), generator.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+    
+    def signature(self, items: Set[str]) -> str:
+        """Get the signature of a set of shingles, as hex."""
+        hashes = [
+            int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), "little")
+            for item in items
+        ]
+        return array.array("I", (
+            min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in hashes) if hashes else _MAX_HASH
+            for a, b in self._permutations
+        )).tobytes().hex()
+
+
+class QuestionCache:
+    """LSH index of answered questions, saved to disk."""
+    
+    def __init__(self, index_file: Optional[str] = ".cache/questions.json", threshold: float = 0.7,
+                 max_entries: int = 2000, ttl_hours: float = 168, num_perm: int = 64, bands: int = 16):
+        """Initialize the cache and load the saved index. With no file, the index lives in memory only.
+
+        An answer is reused when the Jaccard similarity of two normalized
+        questions' shingles is at least `threshold` and they don't
+        contradict each other. `num_perm` must be a multiple of `bands`;
+        more bands find more candidates.
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.index_file = Path(index_file) if index_file else None
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_hours * 3600
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        # LSH finds most pairs above about (1/bands)^(1/rows) similarity (0.5
+        # by default); a lower threshold compares a question with every entry
+        self.scan_all = threshold < (1 / bands) ** (1 / self.rows)
+        # normalized question -> entry, least recently used first
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # One dict per band: band of a signature -> normalized questions
+        self._buckets: List[Dict[str, List[str]]] = [{} for _ in range(bands)]
+        self._counters = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        # Lookups only reorder entries and count; that is saved with the next
+        # added answer or when the process exits
+        self._dirty = False
+        self._write_lock = threading.Lock()
+        self._generation = 0
+        self._written = 0
+        self._load()
+        if self.index_file:
+            atexit.register(self.flush)
+    
+    @classmethod
+    def from_config(cls, cache_config: Dict[str, Any]) -> "QuestionCache":
+        """Create a cache from the `question_cache` section of config.yaml."""
+        return cls(
+            index_file=cache_config.get('path', '.cache/questions.json'),
+            threshold=cache_config.get('threshold', 0.7),
+            max_entries=cache_config.get('max_entries', 2000),
+            ttl_hours=cache_config.get('ttl_hours', 168),
+            num_perm=cache_config.get('num_perm', 64),
+            bands=cache_config.get('bands', 16)
+        )
+    
+    def _band_keys(self, signature: str) -> List[str]:
+        """Split a signature into one bucket key per band."""
+        # Eight hex digits per 32-bit hash
+        width = self.rows * 8
+        return [signature[band * width:(band + 1) * width] for band in range(self.bands)]
+    
+    def _index(self, key: str, entry: Dict[str, Any]):
+        """Add an entry to the buckets (lock held)."""
+        for buckets, band_key in zip(self._buckets, self._band_keys(entry["signature"])):
+            buckets.setdefault(band_key, []).append(key)
+    
+    def _unindex(self, key: str):
+        """Remove an entry from the entries and buckets (lock held)."""
+        entry = self._entries.pop(key)
+        for buckets, band_key in zip(self._buckets, self._band_keys(entry["signature"])):
+            bucket = buckets.get(band_key)
+            if bucket and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del buckets[band_key]
+    
+    def _load(self):
+        """Read the saved index, dropping expired entries and ones hashed with other settings."""
+        if not self.index_file or not self.index_file.exists():
+            return
+        try:
+            saved = loads(self.index_file.read_bytes())
+        except (OSError, ValueError):
+            return
+        settings = (FORMAT_VERSION, self.hasher.num_perm, self.bands)
+        if (saved.get("version"), saved.get("num_perm"), saved.get("bands")) != settings:
+            return
+        self._counters.update(saved["counters"])
+        self._entries = OrderedDict(saved["entries"])
+        self._buckets = saved["buckets"]
+        cutoff = time.time() - self.ttl_seconds
+        for key in [key for key, entry in self._entries.items() if entry["created_at"] < cutoff]:
+            self._unindex(key)
+    
+    def _snapshot(self) -> Optional[Tuple[int, bytes]]:
+        """Serialize the index for `_write` (lock held)."""
+        if not self.index_file:
+            return None
+        self._dirty = False
+        self._generation += 1
+        return self._generation, dumps({
+            "version": FORMAT_VERSION,
+            "num_perm": self.hasher.num_perm,
+            "bands": self.bands,
+            "counters": self._counters,
+            "entries": self._entries,
+            "buckets": self._buckets
+        })
+    
+    def _write(self, snapshot: Optional[Tuple[int, bytes]]):
+        """Write a snapshot to disk unless a newer one already was.
+
+        Runs without the lock held, so lookups don't wait for the disk.
+        """
+        if snapshot is None:
+            return
+        generation, data = snapshot
+        with self._write_lock:
+            if generation <= self._written:
+                return
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(self.index_file, data)
+            self._written = generation
+    
+    def flush(self):
+        """Save hit counts and recency from lookups since the last save."""
+        with self._lock:
+            snapshot = self._snapshot() if self._dirty else None
+        self._write(snapshot)
+    
+    def lookup(self, question: str, scope: str = "") -> Optional[Dict[str, Any]]:
+        """Find the most similar earlier question in `scope` (e.g. provider and model), if close enough.
+
+        Returns the earlier question, its answer and their similarity.
+        """
+        normalized = normalize_question(question)
+        question_shingles = shingles(normalized)
+        band_keys = self._band_keys(self.hasher.signature(question_shingles))
+        cutoff = time.time() - self.ttl_seconds
+        
+        with self._lock:
+            candidates: Set[str] = set()
+            if self.scan_all:
+                candidates.update(self._entries)
+            else:
+                for buckets, band_key in zip(self._buckets, band_keys):
+                    candidates.update(buckets.get(band_key, ()))
+            
+            # The LSH buckets only suggest candidates; the exact similarity decides
+            best: Optional[Dict[str, Any]] = None
+            best_key = None
+            for key in candidates:
+                entry = self._entries[key]
+                if entry["scope"] != scope or entry["created_at"] < cutoff:
+                    continue
+                similarity = jaccard(question_shingles, shingles(key))
+                if similarity < self.threshold or (best is not None and similarity <= best["similarity"]):
+                    continue
+                if contradicts(normalized, key):
+                    continue
+                best = {"question": entry["question"], "answer": entry["answer"], "similarity": similarity}
+                best_key = key
+            
+            self._dirty = True
+            if best_key is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self._counters["hits"] += 1
+            return best
+    
+    def add(self, question: str, answer: str, scope: str = ""):
+        """Index an answered question, evicting the least recently used beyond max_entries."""
+        normalized = normalize_question(question)
+        entry = {
+            "question": question,
+            "answer": answer,
+            "scope": scope,
+            "created_at": time.time(),
+            "signature": self.hasher.signature(shingles(normalized))
+        }
+        with self._lock:
+            if normalized in self._entries:
+                self._unindex(normalized)
+            self._entries[normalized] = entry
+            self._index(normalized, entry)
+            cutoff = time.time() - self.ttl_seconds
+            for key in [key for key, entry in self._entries.items() if entry["created_at"] < cutoff]:
+                self._unindex(key)
+            while len(self._entries) > self.max_entries:
+                self._unindex(next(iter(self._entries)))
+            snapshot = self._snapshot()
+        self._write(snapshot)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get entry count and hit/miss counters."""
+        with self._lock:
+            hits = self._counters["hits"]
+            misses = self._counters["misses"]
+            entries = len(self._entries)
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
+    
+    def clear(self):
+        """Remove all questions and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._buckets = [{} for _ in range(self.bands)]
+            self._counters = {"hits": 0, "misses": 0}
+            snapshot = self._snapshot()
+        self._write(snapshot)
@@ -0,0 +1,136 @@
+"""
+Response Cache for Cloud Engineer Bootcamp
+
+Persistent, content-addressed cache of AI responses with TTL expiry,
+LRU eviction and hit/miss counters.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+class ResponseCache:
+    """Stores AI responses on disk keyed by the full request that produced them."""
+    
+    def __init__(self, cache_file: str = ".cache/responses.sqlite",
+                 ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 1000):
+        """Initialize the response cache."""
+        self.cache_file = Path(cache_file)
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(str(self.cache_file), timeout=10, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._ensure_schema()
+    
+    @classmethod
+    def from_config(cls, cache_config: Dict[str, Any]) -> "ResponseCache":
+        """Create a cache from the `response_cache` section of config.yaml."""
+        return cls(
+            cache_file=cache_config.get('path', '.cache/responses.sqlite'),
+            ttl_seconds=cache_config.get('ttl_hours', 168) * 3600,
+            max_entries=cache_config.get('max_entries', 1000)
+        )
+    
+    def _ensure_schema(self):
+        """Create cache tables if they don't exist yet."""
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+    
+    @staticmethod
+    def make_key(provider: str, model: str, system_prompt: Optional[str], prompt: str,
+                 temperature: float, max_tokens: int) -> str:
+        """Build a content-addressed key for a request."""
+        payload = json.dumps(
+            [provider, model, system_prompt or "", prompt, temperature, max_tokens],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _bump(self, counter: str):
+        """Increment a persistent counter."""
+        self._conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (counter,)
+        )
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached response, or None if missing or expired."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            
+            if row and now - row[1] <= self.ttl_seconds:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                self._bump("hits")
+                return row[0]
+            
+            if row:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._bump("misses")
+            return None
+    
+    def set(self, key: str, response: str):
+        """Store a response and evict expired and least recently used entries."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get entry count and hit/miss counters."""
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
+    
+    def clear(self):
+        """Remove all cached responses and reset counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM counters")
+    
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
@@ -0,0 +1,186 @@
+"""
+Retrieval for Cloud Engineer Bootcamp
+
+Splits curriculum files into chunks, ranks them against a question with BM25
+and packs the best ones into a token budget, so the mentor's prompt carries
+the relevant material instead of whole files.
+"""
+
+from collections import Counter
+from typing import Dict, Any, List, Optional
+
+from curriculum_index import CurriculumIndex
+from search_index import SearchIndex, bm25_scores, tokenize
+
+# Chunks from the day being studied outrank equally relevant material elsewhere
+CURRENT_DAY_BOOST = 1.5
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of English text and code (about 4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def _split_blocks(text: str) -> List[str]:
+    """Split Markdown into paragraphs, keeping fenced code blocks whole."""
+    blocks, current = [], []
+    in_fence = False
+    for line in text.splitlines():
+        if line.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+        if not line.strip() and not in_fence:
+            if current:
+                blocks.append("\n".join(current))
+                current = []
+            continue
+        current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """Group paragraphs into chunks of at most `max_tokens`, splitting long paragraphs by line."""
+    chunks, current, current_tokens = [], [], 0
+    
+    def flush():
+        nonlocal current, current_tokens
+        if current:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+    
+    for block in _split_blocks(text):
+        tokens = estimate_tokens(block)
+        if tokens > max_tokens:
+            flush()
+            piece, piece_tokens = [], 0
+            for line in block.splitlines():
+                line_tokens = estimate_tokens(line) + 1
+                if piece and piece_tokens + line_tokens > max_tokens:
+                    chunks.append("\n".join(piece))
+                    piece, piece_tokens = [], 0
+                piece.append(line)
+                piece_tokens += line_tokens
+            if piece:
+                chunks.append("\n".join(piece))
+            continue
+        if current_tokens + tokens > max_tokens:
+            flush()
+        current.append(block)
+        current_tokens += tokens
+    flush()
+    return chunks
+
+
+class Retriever:
+    """Selects curriculum chunks for a question within a token budget."""
+    
+    def __init__(self, curriculum_index: CurriculumIndex, search_index: Optional[SearchIndex] = None,
+                 chunk_tokens: int = 300, search_sections: int = 5):
+        """Initialize the retriever.
+
+        Candidates are the current day's chunks plus chunks from the
+        `search_sections` best-matching sections elsewhere in the content.
+        """
+        self.curriculum_index = curriculum_index
+        self.search_index = search_index
+        self.chunk_tokens = chunk_tokens
+        self.search_sections = search_sections
+        # (sha256, section number) -> chunks, so files are chunked once per content change
+        self._chunks: Dict[tuple, List[Dict[str, Any]]] = {}
+    
+    def _section_chunks(self, path: str, number: int) -> List[Dict[str, Any]]:
+        """Chunk one section of an indexed file."""
+        entry = self.curriculum_index.get(path)
+        key = (entry["sha256"], number)
+        if key not in self._chunks:
+            section = entry["sections"][number]
+            lines = self.curriculum_index.text(path).splitlines()
+            text = "\n".join(lines[section["start_line"]:section["end_line"]])
+            source = f"{path} › {section['heading']}" if section["heading"] else path
+            self._chunks[key] = [
+                {
+                    "id": f"{path}#{number}.{i}",
+                    "path": path,
+                    "source": source,
+                    "text": chunk,
+                    "tokens": estimate_tokens(chunk),
+                    "terms": Counter(tokenize(chunk))
+                }
+                for i, chunk in enumerate(chunk_text(text, self.chunk_tokens))
+            ]
+        return self._chunks[key]
+    
+    def _file_chunks(self, path: str) -> List[Dict[str, Any]]:
+        """Chunk every section of an indexed file."""
+        entry = self.curriculum_index.get(path)
+        if entry is None:
+            return []
+        chunks = []
+        for number in range(len(entry["sections"])):
+            chunks.extend(self._section_chunks(path, number))
+        return chunks
+    
+    def _day_opening(self, path: str) -> List[Dict[str, Any]]:
+        """The first chunk of a day's title section and of its objectives section."""
+        opening = []
+        for number, section in enumerate(self.curriculum_index.get(path)["sections"]):
+            is_objectives = "objective" in section["heading"].lower()
+            if number == 0 or is_objectives:
+                opening.extend(self._section_chunks(path, number)[:1])
+            if is_objectives:
+                break
+        return opening
+    
+    def retrieve(self, question: str, budget_tokens: int, week: Optional[int] = None,
+                 day: Optional[int] = None) -> Dict[str, Any]:
+        """Pick the chunks most relevant to a question that fit in `budget_tokens`.
+
+        Returns the selected chunks in ranked order along with their total
+        token estimate. When nothing matches the question, the opening of the
+        current day (its title and objectives) is used instead.
+        """
+        day_entry = self.curriculum_index.get_day(week, day) if week and day else None
+        day_path = day_entry["path"] if day_entry else None
+        candidates = {chunk["id"]: chunk for chunk in self._file_chunks(day_path)} if day_path else {}
+        
+        if self.search_index:
+            for result in self.search_index.search(question, limit=self.search_sections,
+                                                   kinds=["curriculum", "exercises", "resources"]):
+                number = int(result["id"].rsplit("#", 1)[1])
+                for chunk in self._section_chunks(result["path"], number):
+                    candidates.setdefault(chunk["id"], chunk)
+        
+        terms = list(dict.fromkeys(tokenize(question)))
+        postings: Dict[str, Dict[str, int]] = {}
+        for chunk_id, chunk in candidates.items():
+            for term in terms:
+                if term in chunk["terms"]:
+                    postings.setdefault(term, {})[chunk_id] = chunk["terms"][term]
+        lengths = {chunk_id: max(1, sum(chunk["terms"].values())) for chunk_id, chunk in candidates.items()}
+        scores = bm25_scores(terms, postings, lengths)
+        
+        for chunk_id in scores:
+            if candidates[chunk_id]["path"] == day_path:
+                scores[chunk_id] *= CURRENT_DAY_BOOST
+        
+        if scores:
+            ranked = [candidates[chunk_id] for chunk_id in sorted(scores, key=scores.get, reverse=True)]
+        elif day_path:
+            ranked = self._day_opening(day_path)
+        else:
+            ranked = []
+        
+        selected, used = [], 0
+        for chunk in ranked:
+            if used + chunk["tokens"] > budget_tokens:
+                continue
+            selected.append(chunk)
+            used += chunk["tokens"]
+        return {"chunks": selected, "tokens": used}
+    
+    def build_context(self, question: str, budget_tokens: int, week: Optional[int] = None,
+                      day: Optional[int] = None) -> str:
+        """Format the retrieved chunks for inclusion in a prompt."""
+        chunks = self.retrieve(question, budget_tokens, week, day)["chunks"]
+        return "\n\n".join(f"[{chunk['source']}]\n{chunk['text']}" for chunk in chunks)
@@ -0,0 +1,218 @@
+"""
+Search Index for Cloud Engineer Bootcamp
+
+A BM25-ranked inverted index over the sections recorded by the curriculum
+index. Postings are stored on disk and updated per file when its content hash
+changes, so queries never rescan the content tree.
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable
+
+from curriculum_index import CurriculumIndex
+
+INDEX_VERSION = 1
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset("""
+a an and are as at be by can do for from how i if in into is it its me my of on or so
+that the their then there these this to use using was we what when where which will with
+you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search terms, dropping stop words."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def make_snippet(text: str, terms: Iterable[str], width: int = 160) -> str:
+    """Pick the line that best matches the query terms and trim it to `width`."""
+    terms = set(terms)
+    best_line, best_hits = "", 0
+    for line in text.splitlines()[1:] or text.splitlines():
+        stripped = line.strip(" \t-*>#|`")
+        if not stripped:
+            continue
+        hits = len(terms.intersection(tokenize(stripped)))
+        if hits > best_hits or not best_line:
+            best_line, best_hits = stripped, hits
+    if len(best_line) > width:
+        best_line = best_line[:width - 1].rstrip() + "…"
+    return best_line
+
+
+def bm25_scores(terms: Iterable[str], postings: Dict[str, Dict[str, int]], lengths: Dict[str, int],
+                k1: float = 1.2, b: float = 0.75) -> Dict[str, float]:
+    """Score documents against query terms with BM25.
+
+    `postings` maps each term to {document id: term frequency} and `lengths`
+    maps every document id to its length in terms.
+    """
+    if not lengths:
+        return {}
+    total = len(lengths)
+    average_length = sum(lengths.values()) / total
+    scores: Dict[str, float] = {}
+    
+    for term in terms:
+        posting = postings.get(term)
+        if not posting:
+            continue
+        idf = math.log(1 + (total - len(posting) + 0.5) / (len(posting) + 0.5))
+        for doc_id, frequency in posting.items():
+            norm = frequency + k1 * (1 - b + b * lengths[doc_id] / average_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (k1 + 1) / norm
+    return scores
+
+
+class SearchIndex:
+    """BM25 index over curriculum sections, kept in sync with a CurriculumIndex."""
+    
+    def __init__(self, curriculum_index: CurriculumIndex, index_file: Optional[Path] = None,
+                 k1: float = 1.2, b: float = 0.75):
+        """Initialize the search index and load the saved copy, if any."""
+        self.curriculum_index = curriculum_index
+        self.index_file = Path(index_file or curriculum_index.cache_dir / "search.json")
+        self.k1 = k1
+        self.b = b
+        # file path -> sha256 of the content its sections were indexed from
+        self.files: Dict[str, str] = {}
+        # section id -> section metadata and length in terms
+        self.sections: Dict[str, Dict[str, Any]] = {}
+        # term -> {section id: term frequency}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self._load()
+    
+    def _load(self):
+        """Load the saved index, discarding it if it was built differently."""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get("version") == INDEX_VERSION:
+            self.files = saved["files"]
+            self.sections = saved["sections"]
+            self.postings = saved["postings"]
+    
+    def _save(self):
+        """Write the index atomically."""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_suffix(".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "files": self.files,
+                "sections": self.sections,
+                "postings": self.postings
+            }, f)
+        os.replace(tmp_file, self.index_file)
+    
+    def refresh(self) -> List[str]:
+        """Reindex files whose hash changed in the curriculum index and return them."""
+        indexed = self.curriculum_index.files
+        reindexed = []
+        
+        for path in list(self.files):
+            if path not in indexed:
+                self._remove_file(path)
+                reindexed.append(path)
+        
+        for path, entry in sorted(indexed.items()):
+            if self.files.get(path) == entry["sha256"]:
+                continue
+            self._remove_file(path)
+            self._add_file(path, entry)
+            reindexed.append(path)
+        
+        if reindexed:
+            self._save()
+        return reindexed
+    
+    def _remove_file(self, path: str):
+        """Drop a file's sections and postings."""
+        self.files.pop(path, None)
+        prefix = f"{path}#"
+        stale = {section_id for section_id in self.sections if section_id.startswith(prefix)}
+        if not stale:
+            return
+        for section_id in stale:
+            del self.sections[section_id]
+        for term in list(self.postings):
+            posting = self.postings[term]
+            for section_id in stale.intersection(posting):
+                del posting[section_id]
+            if not posting:
+                del self.postings[term]
+    
+    def _add_file(self, path: str, entry: Dict[str, Any]):
+        """Index each section of one file."""
+        lines = self.curriculum_index.text(path).splitlines()
+        # Headings of enclosing sections, so results can show where they sit
+        parents: List[Dict[str, Any]] = []
+        
+        for number, section in enumerate(entry["sections"]):
+            while parents and parents[-1]["level"] >= section["level"]:
+                parents.pop()
+            trail = [parent["heading"] for parent in parents if parent["level"] > 1]
+            if section["level"]:
+                parents.append(section)
+            
+            text = "\n".join(lines[section["start_line"]:section["end_line"]])
+            # Heading terms are counted twice so matching titles rank higher
+            terms = tokenize(text) + tokenize(section["heading"])
+            if not terms:
+                continue
+            
+            section_id = f"{path}#{number}"
+            self.sections[section_id] = {
+                "path": path,
+                "title": entry["title"],
+                "heading": section["heading"] or entry["title"],
+                "trail": trail,
+                "anchor": section["anchor"],
+                "line": section["start_line"] + 1,
+                "length": len(terms)
+            }
+            for term, count in Counter(terms).items():
+                self.postings.setdefault(term, {})[section_id] = count
+        
+        self.files[path] = entry["sha256"]
+    
+    def search(self, query: str, limit: int = 10, kinds: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Rank sections against a query with BM25.
+
+        `kinds` restricts results to top-level content directories such as
+        "curriculum" or "resources".
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.sections:
+            return []
+        
+        prefixes = tuple(f"{kind}/" for kind in kinds) if kinds else None
+        lengths = {section_id: section["length"] for section_id, section in self.sections.items()}
+        scores = bm25_scores(terms, self.postings, lengths, self.k1, self.b)
+        
+        ranked = sorted(
+            (item for item in scores.items() if not prefixes or item[0].startswith(prefixes)),
+            key=lambda item: item[1],
+            reverse=True
+        )[:limit]
+        return [self._result(section_id, score, terms) for section_id, score in ranked]
+    
+    def _result(self, section_id: str, score: float, terms: List[str]) -> Dict[str, Any]:
+        """Build a search result with the section's text and a snippet."""
+        section = self.sections[section_id]
+        entry = self.curriculum_index.get(section["path"])
+        number = int(section_id.rsplit("#", 1)[1])
+        bounds = entry["sections"][number]
+        lines = self.curriculum_index.text(section["path"]).splitlines()
+        text = "\n".join(lines[bounds["start_line"]:bounds["end_line"]]).strip()
+        return dict(section, id=section_id, score=score, text=text, snippet=make_snippet(text, terms))
@@ -0,0 +1,11 @@
+"""
+Test configuration for Cloud Engineer Bootcamp
+
+The modules live at the top of the repository rather than in a package, so
+the repository root is put on the import path.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
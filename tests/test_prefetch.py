@@ -0,0 +1,54 @@
+"""Tests for the prefetch store and prefetcher."""
+
+import threading
+
+from prefetch import PrefetchStore, Prefetcher
+
+
+def test_stores_sharing_a_file_keep_each_others_entries(tmp_path):
+    first = PrefetchStore(str(tmp_path / "prefetch.json"))
+    second = PrefetchStore(str(tmp_path / "prefetch.json"))
+    
+    first.put("primer:week1_day2", "first")
+    second.put("interview:Linux:abc:1", "second")
+    
+    saved = PrefetchStore(str(tmp_path / "prefetch.json"))
+    assert saved.get("primer:week1_day2") == "first"
+    assert saved.get("interview:Linux:abc:1") == "second"
+
+
+def test_a_value_is_taken_only_once(tmp_path):
+    first = PrefetchStore(str(tmp_path / "prefetch.json"))
+    second = PrefetchStore(str(tmp_path / "prefetch.json"))
+    first.put("interview:Linux:abc:1", "question")
+    
+    assert second.take("interview:Linux:") == "question"
+    assert first.take("interview:Linux:") is None
+
+
+def test_submissions_stop_at_max_requests():
+    prefetcher = Prefetcher(PrefetchStore(None), max_requests=2)
+    
+    assert [prefetcher.submit(f"key{i}", lambda: "value") for i in range(3)] == [True, True, False]
+    assert prefetcher.wait(timeout=5)
+
+
+def test_close_waits_for_requests_in_flight_and_drops_queued_ones():
+    prefetcher = Prefetcher(PrefetchStore(None), workers=1, max_requests=2)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+    
+    def slow():
+        started.set()
+        release.wait(5)
+        return "in flight"
+    
+    prefetcher.submit("slow", slow)
+    prefetcher.submit("queued", lambda: calls.append("queued") or "queued")
+    assert started.wait(5)
+    
+    assert not prefetcher.close(timeout=0.05)
+    release.set()
+    assert prefetcher.close(timeout=5)
+    assert prefetcher.store.get("slow") == "in flight"
+    assert prefetcher.store.get("queued") is None and calls == []
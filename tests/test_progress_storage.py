@@ -0,0 +1,232 @@
+"""Tests for the progress storage backends."""
+
+import json
+import multiprocessing
+
+import pytest
+
+from progress_model import Progress, SCHEMA_VERSION, loads
+from progress_storage import EventLogStorage, VersionConflictError, create_storage, set_change
+from progress_tracker import ProgressTracker
+
+BACKENDS = ["json", "eventlog", "sqlite"]
+
+
+def make_storage(tmp_path, backend: str, **options):
+    storage = create_storage(backend, tmp_path / "user_progress.json", db_file=tmp_path / "cohort.sqlite",
+                             learner_id="learner", **options)
+    storage.initialize(Progress())
+    return storage
+
+
+def make_tracker(workdir, backend: str, **options) -> ProgressTracker:
+    return ProgressTracker(
+        progress_file=str(workdir / "user_progress.json"),
+        backend=backend,
+        db_file=str(workdir / "cohort.sqlite"),
+        learner_id="learner",
+        compact_every=10,
+        **options
+    )
+
+
+# Version checks
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_stale_expected_version_conflicts(tmp_path, backend):
+    storage = make_storage(tmp_path, backend)
+    version = storage.load().version
+    storage.append([set_change(["days_completed"], 1)], expected_version=version)
+    
+    with pytest.raises(VersionConflictError):
+        storage.append([set_change(["days_completed"], 5)], expected_version=version)
+    assert storage.load().days_completed == 1
+    assert storage.load().version == version + 1
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_replace_conflicts_with_writes_based_on_the_old_document(tmp_path, backend):
+    storage = make_storage(tmp_path, backend)
+    for day in range(1, 5):
+        storage.append([set_change(["days_completed"], day)], expected_version=storage.load().version)
+    stale = storage.load().version
+    
+    storage.replace(Progress())
+    
+    with pytest.raises(VersionConflictError):
+        storage.append([set_change(["days_completed"], 99)], expected_version=stale)
+    assert storage.load().days_completed == 0
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_interleaved_trackers_retry_instead_of_overwriting(tmp_path, backend):
+    first = make_tracker(tmp_path, backend)
+    second = make_tracker(tmp_path, backend)
+    first.get_progress()
+    second.get_progress()
+    
+    second.add_note(1, 1, "second")
+    # first still holds the document from before second's write
+    first.add_note(1, 2, "first")
+    
+    notes = make_tracker(tmp_path, backend).get_progress().notes
+    assert {key: note.note for key, note in notes.items()} == {(1, 1): "second", (1, 2): "first"}
+
+
+def test_retries_give_up_after_max_retries(tmp_path, monkeypatch):
+    tracker = make_tracker(tmp_path, "eventlog", max_retries=2)
+    attempts = []
+    
+    def always_conflict(changes, expected_version=None):
+        attempts.append(expected_version)
+        raise VersionConflictError("always behind")
+    
+    monkeypatch.setattr(tracker.storage, "append", always_conflict)
+    with pytest.raises(VersionConflictError):
+        tracker.add_note(1, 1, "never stored")
+    assert len(attempts) == 3
+
+
+# Event log
+
+def log_lines(storage: EventLogStorage):
+    return storage.log_file.read_bytes().splitlines(keepends=True) if storage.log_file.exists() else []
+
+
+def test_event_log_replays_appended_records(tmp_path):
+    storage = make_storage(tmp_path, "eventlog")
+    for day in range(1, 4):
+        storage.append([set_change(["completed_days", f"week1_day{day}"], {"date": "2024-01-0{day}", "hours": 6})],
+                       expected_version=day - 1)
+    
+    assert len(log_lines(storage)) == 3
+    progress = EventLogStorage(tmp_path / "user_progress.json").load()
+    assert sorted(progress.completed_days) == [(1, 1), (1, 2), (1, 3)]
+    assert progress.version == 3
+
+
+def test_event_log_compacts_into_the_snapshot(tmp_path):
+    storage = make_storage(tmp_path, "eventlog", compact_every=3)
+    for day in range(1, 5):
+        storage.append([set_change(["days_completed"], day)], expected_version=day - 1)
+    
+    # The third record triggered a compaction, the fourth is in the new log
+    assert loads(storage.snapshot_file.read_bytes())["version"] == 3
+    assert [loads(line)["version"] for line in log_lines(storage)] == [4]
+    progress = EventLogStorage(tmp_path / "user_progress.json").load()
+    assert (progress.days_completed, progress.version) == (4, 4)
+
+
+def test_event_log_skips_records_already_in_the_snapshot(tmp_path):
+    storage = make_storage(tmp_path, "eventlog")
+    for day in range(1, 3):
+        storage.append([set_change(["days_completed"], day)], expected_version=day - 1)
+    lines = log_lines(storage)
+    storage.compact()
+    # A crash after writing the snapshot but before truncating the log
+    storage.log_file.write_bytes(b"".join(lines))
+    
+    progress = EventLogStorage(tmp_path / "user_progress.json").load()
+    assert (progress.days_completed, progress.version) == (2, 2)
+
+
+def test_event_log_recovers_from_a_torn_last_line(tmp_path):
+    storage = make_storage(tmp_path, "eventlog")
+    storage.append([set_change(["days_completed"], 1)], expected_version=0)
+    with open(storage.log_file, 'ab') as f:
+        f.write(b'{"version": 2, "changes": [{"op": "set", "pa')
+    
+    reader = EventLogStorage(tmp_path / "user_progress.json")
+    progress = reader.load()
+    assert (progress.days_completed, progress.version) == (1, 1)
+    
+    # The next write cuts the torn line off and starts on a clean one
+    reader.append([set_change(["days_completed"], 2)], expected_version=1)
+    assert [loads(line)["version"] for line in log_lines(reader)] == [1, 2]
+    progress = EventLogStorage(tmp_path / "user_progress.json").load()
+    assert (progress.days_completed, progress.version) == (2, 2)
+
+
+# Migration
+
+V1_DOCUMENT = {
+    "started": True,
+    "user_name": "Ada",
+    "start_date": "2024-01-15",
+    "current_week": 2,
+    "current_day": 1,
+    "days_completed": 2,
+    "streak": 2,
+    "last_activity_date": "2024-01-16",
+    "completed_weeks": {"1": True},
+    "completed_days": {
+        "week1_day1": {"completed_date": "2024-01-15", "hours_spent": 6.0},
+        "week1_day2": {"completed_date": "2024-01-16", "hours_spent": 4.5}
+    },
+    "assessment_scores": {"week1": {"score": 85, "date": "2024-01-19", "passed": True}},
+    "skills": {"Linux": 42.5},
+    "badges": ["First Steps"],
+    "portfolio_projects": [{
+        "name": "Backup script", "description": "Nightly backups", "technologies": ["bash"],
+        "repository": "", "completed_date": "2024-01-18"
+    }],
+    "total_hours": 10.5,
+    "notes": {"week1_day2": {"note": "Permissions finally make sense", "date": "2024-01-16"}}
+}
+
+
+@pytest.mark.parametrize("backend", ["json", "eventlog"])
+def test_v1_progress_file_is_migrated(tmp_path, backend):
+    (tmp_path / "user_progress.json").write_text(json.dumps(V1_DOCUMENT, indent=2), encoding='utf-8')
+    tracker = make_tracker(tmp_path, backend)
+    
+    progress = tracker.get_progress()
+    assert progress.user_name == "Ada"
+    assert progress.completed_days[(1, 2)].hours_spent == 4.5
+    assert progress.assessment_scores[1].passed
+    assert progress.completed_weeks == {1}
+    assert progress.notes[(1, 2)].note == "Permissions finally make sense"
+    assert progress.portfolio_projects[0].technologies == ["bash"]
+    assert progress.to_dict() == V1_DOCUMENT | {"version": 0}
+    
+    # The first write stores the current schema, keeping everything
+    tracker.add_note(2, 1, "Networking day")
+    if backend == "eventlog":
+        tracker.storage.compact()
+    stored = loads((tmp_path / "user_progress.json").read_bytes())
+    assert stored["schema_version"] == SCHEMA_VERSION
+    assert make_tracker(tmp_path, backend).get_progress().to_dict() == tracker.get_progress().to_dict()
+
+
+# Concurrent processes
+
+def _write_from_process(workdir: str, backend: str, worker: int, iterations: int):
+    from pathlib import Path
+    
+    tracker = make_tracker(Path(workdir), backend, max_retries=1000)
+    for i in range(iterations):
+        # Week numbers past the curriculum keep every worker's keys distinct
+        tracker.complete_day(100 + worker, i + 1, hours_spent=1.0)
+        tracker.add_note(100 + worker, i + 1, f"worker {worker} note {i}")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_concurrent_processes_lose_no_updates(tmp_path, backend):
+    workers, iterations = 3, 8
+    make_tracker(tmp_path, backend).initialize_progress("Cohort")
+    processes = [
+        multiprocessing.Process(target=_write_from_process, args=(str(tmp_path), backend, worker, iterations))
+        for worker in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+    assert [process.exitcode for process in processes] == [0] * workers
+    
+    progress = make_tracker(tmp_path, backend).get_progress()
+    expected = workers * iterations
+    assert len(progress.completed_days) == expected
+    assert progress.days_completed == expected
+    assert len(progress.notes) == expected
+    assert progress.total_hours == expected
@@ -0,0 +1,145 @@
+"""Tests for the progress tracker."""
+
+from datetime import date, timedelta
+
+import pytest
+
+import progress_tracker
+
+from progress_storage import VersionConflictError
+from progress_tracker import ProgressTracker
+
+BACKENDS = ["json", "eventlog", "sqlite"]
+
+
+def make_tracker(tmp_path, backend: str) -> ProgressTracker:
+    return ProgressTracker(
+        progress_file=str(tmp_path / "user_progress.json"),
+        backend=backend,
+        db_file=str(tmp_path / "cohort.sqlite"),
+        learner_id="learner"
+    )
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_repeated_reads_parse_once(tmp_path, backend):
+    tracker = make_tracker(tmp_path, backend)
+    for _ in range(10):
+        tracker.get_progress()
+        tracker.get_badges()
+        tracker.export_progress_report()
+    assert tracker.parse_count == 1
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_own_writes_keep_the_cache(tmp_path, backend):
+    tracker = make_tracker(tmp_path, backend)
+    tracker.initialize_progress("Ada")
+    for day in range(1, 6):
+        tracker.complete_day(1, day)
+        tracker.add_note(1, day, f"note {day}")
+    
+    assert tracker.parse_count == 1
+    assert tracker.get_progress().to_dict() == make_tracker(tmp_path, backend).get_progress().to_dict()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_write_by_another_tracker_drops_the_cache(tmp_path, backend):
+    tracker = make_tracker(tmp_path, backend)
+    other = make_tracker(tmp_path, backend)
+    tracker.get_progress()
+    
+    other.add_note(2, 3, "from another process")
+    
+    assert tracker.get_progress().notes[(2, 3)].note == "from another process"
+    assert tracker.parse_count == 2
+    # A mutation based on the reloaded document keeps the other writer's note
+    tracker.complete_day(2, 3)
+    stored = make_tracker(tmp_path, backend).get_progress()
+    assert (2, 3) in stored.notes and (2, 3) in stored.completed_days
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_failed_mutator_drops_the_cache(tmp_path, backend, monkeypatch):
+    tracker = make_tracker(tmp_path, backend)
+    tracker.get_progress()
+    
+    def fail(changes, expected_version=None):
+        raise OSError("disk full")
+    
+    monkeypatch.setattr(tracker.storage, "append", fail)
+    with pytest.raises(OSError):
+        tracker.complete_day(1, 1)
+    monkeypatch.undo()
+    
+    # complete_day changed the cached document before the write failed
+    progress = tracker.get_progress()
+    assert progress.days_completed == 0
+    assert (1, 1) not in progress.completed_days
+    assert tracker.parse_count == 2
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_conflict_retries_against_a_fresh_document(tmp_path, backend, monkeypatch):
+    tracker = make_tracker(tmp_path, backend)
+    tracker.get_progress()
+    append = tracker.storage.append
+    calls = []
+    
+    def conflict_once(changes, expected_version=None):
+        calls.append(expected_version)
+        if len(calls) == 1:
+            raise VersionConflictError("another writer got there first")
+        return append(changes, expected_version=expected_version)
+    
+    monkeypatch.setattr(tracker.storage, "append", conflict_once)
+    tracker.complete_day(1, 1)
+    
+    assert len(calls) == 2
+    # Re-run on a reloaded document, not the one the first attempt had already changed
+    assert tracker.parse_count == 2
+    assert tracker.get_progress().days_completed == 1
+    assert make_tracker(tmp_path, backend).get_progress().days_completed == 1
+
+
+def set_today(monkeypatch, today: date):
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return today
+    
+    monkeypatch.setattr(progress_tracker, "date", FixedDate)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_consecutive_days_grow_the_streak_and_award_badges(tmp_path, monkeypatch, backend):
+    start = date(2024, 3, 4)
+    set_today(monkeypatch, start)
+    tracker = make_tracker(tmp_path, backend)
+    tracker.initialize_progress("Ada")
+    
+    for offset in range(3):
+        set_today(monkeypatch, start + timedelta(days=offset))
+        tracker.complete_day(1, offset + 1)
+        # Another completion the same day leaves the streak alone
+        tracker.complete_day(1, offset + 1)
+    
+    progress = make_tracker(tmp_path, backend).get_progress()
+    assert progress.streak == 3
+    assert progress.last_activity_date == "2024-03-06"
+    assert "Streak Starter" in progress.badges
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_a_missed_day_restarts_the_streak(tmp_path, monkeypatch, backend):
+    start = date(2024, 3, 4)
+    set_today(monkeypatch, start)
+    tracker = make_tracker(tmp_path, backend)
+    tracker.initialize_progress("Ada")
+    set_today(monkeypatch, start + timedelta(days=1))
+    tracker.complete_day(1, 1)
+    
+    set_today(monkeypatch, start + timedelta(days=3))
+    tracker.complete_day(1, 2)
+    
+    assert tracker.get_progress().streak == 1
@@ -0,0 +1,73 @@
+"""Tests for the question cache."""
+
+import pytest
+
+from question_cache import QuestionCache, contradicts, normalize_question
+
+NEAR_DUPLICATES = [
+    ("What is an inode?", "explain inodes"),
+    ("What is a Kubernetes pod?", "explain kubernetes pods"),
+    ("How do I check disk usage?", "how to check disk usage"),
+    ("What does chmod 755 mean?", "chmod 755 meaning"),
+    ("What is terraform state?", "explain terraform state files"),
+    ("What is the difference between a process and a thread?", "difference between threads and processes"),
+]
+
+OPPOSITES = [
+    ("How do I install nginx on Ubuntu?", "How do I uninstall nginx on Ubuntu?"),
+    ("Why is my EC2 instance not reachable?", "Why is my EC2 instance reachable?"),
+    ("What does chmod 755 mean?", "What does chmod 644 mean?"),
+    ("Why is port 80 open?", "Why is port 443 open?"),
+    ("How do I enable SSH login?", "How do I disable SSH login?"),
+    ("How do I create an S3 bucket?", "How do I delete an S3 bucket?"),
+    ("What is a public subnet?", "What is a private subnet?"),
+]
+
+
+def cache_with(question: str, threshold: float = 0.7) -> QuestionCache:
+    cache = QuestionCache(None, threshold=threshold)
+    cache.add(question, f"answer to {question}")
+    return cache
+
+
+@pytest.mark.parametrize("first, second", NEAR_DUPLICATES)
+def test_near_duplicates_hit(first, second):
+    match = cache_with(first).lookup(second)
+    assert match is not None
+    assert match["answer"] == f"answer to {first}"
+    assert match["similarity"] >= 0.7
+
+
+@pytest.mark.parametrize("first, second", [
+    ("what does chmod do", "what does the chmod command do"),
+    ("how to build a docker image", "how do I create a docker image"),
+])
+def test_threshold_decides_loose_rewordings(first, second):
+    assert cache_with(first, threshold=0.0).lookup(second) is not None
+    assert cache_with(first, threshold=0.9).lookup(second) is None
+
+
+@pytest.mark.parametrize("first, second", OPPOSITES)
+def test_opposite_questions_miss_at_any_threshold(first, second):
+    assert contradicts(normalize_question(first), normalize_question(second))
+    assert cache_with(first).lookup(second) is None
+    assert cache_with(first, threshold=0.0).lookup(second) is None
+
+
+def test_answers_are_scoped():
+    cache = QuestionCache(None)
+    cache.add("What is an inode?", "ollama answer", scope="ollama/llama2")
+    assert cache.lookup("explain inodes", scope="openai/gpt-4") is None
+    assert cache.lookup("explain inodes", scope="ollama/llama2")["answer"] == "ollama answer"
+
+
+def test_hits_are_saved_on_flush(tmp_path):
+    index_file = tmp_path / "questions.json"
+    cache = QuestionCache(str(index_file))
+    cache.add("What is an inode?", "answer")
+    assert cache.lookup("explain inodes") is not None
+    cache.flush()
+    
+    stats = QuestionCache(str(index_file)).stats()
+    assert (stats["entries"], stats["hits"]) == (1, 1)
+    assert [path.name for path in tmp_path.iterdir()] == ["questions.json"]
@@ -0,0 +1,42 @@
+"""Tests for curriculum retrieval."""
+
+from curriculum_index import CurriculumIndex
+from retrieval import Retriever
+
+DAY = """# Day 1: Linux Basics
+
+## Objectives
+- Navigate the filesystem
+- Manage file permissions
+
+## Morning Session
+""" + "\n\n".join(f"Paragraph {i} about directories, paths and the shell." for i in range(40))
+
+
+def make_retriever(tmp_path) -> Retriever:
+    day_file = tmp_path / "curriculum" / "week1" / "day1.md"
+    day_file.parent.mkdir(parents=True)
+    day_file.write_text(DAY, encoding='utf-8')
+    index = CurriculumIndex(tmp_path, tmp_path / ".cache")
+    index.refresh()
+    return Retriever(index, chunk_tokens=60)
+
+
+def test_matching_chunks_are_ranked_first(tmp_path):
+    chunks = make_retriever(tmp_path).retrieve("file permissions", 1000, week=1, day=1)["chunks"]
+    
+    assert "Manage file permissions" in chunks[0]["text"]
+
+
+def test_no_match_falls_back_to_the_opening_of_the_day_only(tmp_path):
+    result = make_retriever(tmp_path).retrieve("kubernetes ingress", 10000, week=1, day=1)
+    
+    assert [chunk["source"] for chunk in result["chunks"]] == [
+        "curriculum/week1/day1.md › Day 1: Linux Basics", "curriculum/week1/day1.md › Objectives"
+    ]
+    assert "Manage file permissions" in result["chunks"][1]["text"]
+    assert result["tokens"] == sum(chunk["tokens"] for chunk in result["chunks"])
+
+
+def test_no_match_outside_a_day_selects_nothing(tmp_path):
+    assert make_retriever(tmp_path).retrieve("kubernetes ingress", 10000)["chunks"] == []
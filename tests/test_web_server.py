@@ -0,0 +1,72 @@
+"""Tests for the web server's per-learner state."""
+
+import asyncio
+import threading
+import time
+
+import web_server
+from web_server import MentorWebApp
+
+
+class FakeTracker:
+    """Records how many operations run on it at once."""
+    
+    def __init__(self, learner_id: str):
+        self.learner_id = learner_id
+        self.running = 0
+        self.most_running = 0
+        self._lock = threading.Lock()
+    
+    def operate(self):
+        with self._lock:
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        time.sleep(0.01)
+        with self._lock:
+            self.running -= 1
+        return self.learner_id
+
+
+def make_app() -> MentorWebApp:
+    return MentorWebApp(lambda: None, FakeTracker, {"progress_workers": 4})
+
+
+def test_least_recently_used_trackers_are_dropped(monkeypatch):
+    monkeypatch.setattr(web_server, "MAX_OPEN_TRACKERS", 2)
+    app = make_app()
+    
+    async def run():
+        for learner_id in ["ada", "grace", "ada", "linus"]:
+            assert await app._with_tracker(learner_id, FakeTracker.operate) == learner_id
+    
+    asyncio.run(run())
+    assert list(app._trackers) == ["ada", "linus"]
+
+
+def test_one_learners_operations_run_one_at_a_time():
+    app = make_app()
+    
+    async def run():
+        await asyncio.gather(*(app._with_tracker(learner_id, FakeTracker.operate)
+                               for learner_id in ["ada"] * 4 + ["grace"] * 4))
+    
+    asyncio.run(run())
+    assert [tracker.most_running for tracker, _ in app._trackers.values()] == [1, 1]
+
+
+def test_session_turn_locks_are_dropped_when_idle():
+    app = make_app()
+    order = []
+    
+    async def turn(learner_id: str, number: int):
+        async with app._session_turn(learner_id):
+            order.append(number)
+            await asyncio.sleep(0.01)
+            assert app._session_turns[learner_id][1] >= 1
+    
+    async def run():
+        await asyncio.gather(turn("ada", 1), turn("ada", 2), turn("grace", 3))
+    
+    asyncio.run(run())
+    assert sorted(order) == [1, 2, 3]
+    assert app._session_turns == {}
@@ -0,0 +1,499 @@
+"""
+Web Server for Cloud Engineer Bootcamp
+
+An ASGI application that serves the mentor over HTTP, so a whole cohort can
+share one process instead of each learner running the CLI in a shell.
+Answers stream as Server-Sent Events.
+
+Every request shares one MentorAgent. Its provider router (with the clients'
+connection pools), the response and question caches, and the curriculum and
+search indexes are built once, at startup. Provider streams run on a bounded
+pool of threads, and progress reads and writes on a small pool of their own,
+so the event loop only parses requests and forwards text.
+
+Run it with `python mentor_agent.py serve` (needs uvicorn).
+"""
+
+import asyncio
+import contextlib
+import re
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Deque, Iterator, List, Optional, Tuple
+
+from progress_model import dumps, loads
+from prompts import ASK_SYSTEM_PROMPT, INTERVIEW_TOPICS, INTERVIEW_QUESTION_PROMPT, STANDUP_PROMPT, \
+    INTERVIEW_FEEDBACK_PROMPT
+
+# Also used as a directory name for the learner's saved sessions
+LEARNER_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.@-]{0,63}$")
+_LEARNER = r"^/learners/(?P<learner_id>[^/]+)"
+
+ROUTES = [
+    ("GET", re.compile(r"^/health$"), "health"),
+    ("GET", re.compile(r"^/interview/topics$"), "interview_topics"),
+    ("GET", re.compile(_LEARNER + r"/progress$"), "progress"),
+    ("POST", re.compile(_LEARNER + r"/start$"), "start"),
+    ("POST", re.compile(_LEARNER + r"/complete-day$"), "complete_day"),
+    ("POST", re.compile(_LEARNER + r"/ask$"), "ask"),
+    ("POST", re.compile(_LEARNER + r"/session$"), "session"),
+    ("POST", re.compile(_LEARNER + r"/standup$"), "standup"),
+    ("POST", re.compile(_LEARNER + r"/interview$"), "interview"),
+    ("POST", re.compile(_LEARNER + r"/interview/feedback$"), "interview_feedback"),
+]
+
+# Call metrics sent to the client with the `done` event
+DONE_FIELDS = ("cached", "provider", "model", "prompt_tokens", "completion_tokens", "cached_tokens",
+               "first_token_ms", "total_ms", "error")
+
+JSON_HEADERS = [(b"content-type", b"application/json")]
+SSE_HEADERS = [
+    (b"content-type", b"text/event-stream; charset=utf-8"),
+    (b"cache-control", b"no-cache"),
+    # Stop nginx and similar proxies from buffering the stream
+    (b"x-accel-buffering", b"no"),
+]
+
+# Conversations kept in memory between a learner's session requests
+MAX_OPEN_SESSIONS = 1024
+# Progress trackers (and their cached documents) kept between a learner's requests
+MAX_OPEN_TRACKERS = 1024
+
+_HEARTBEAT = object()
+_DISCONNECTED = object()
+_END = object()
+
+
+class HTTPError(Exception):
+    """Raised while handling a request to answer with an error status."""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> bytes:
+    """Format a Server-Sent Event with a JSON payload."""
+    return b"event: " + event.encode('ascii') + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def _required(body: Dict[str, Any], field: str) -> str:
+    """Get a non-empty string field from a request body."""
+    value = body.get(field)
+    if not isinstance(value, str) or not value.strip():
+        raise HTTPError(400, f"'{field}' is required")
+    return value.strip()
+
+
+def _done(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the call metrics worth sending to the client."""
+    return {field: metrics[field] for field in DONE_FIELDS if metrics.get(field) is not None}
+
+
+class MentorWebApp:
+    """ASGI application serving the mentor's commands to many learners at once."""
+    
+    def __init__(self, agent_factory: Callable[[], Any], tracker_factory: Callable[[str], Any],
+                 web_config: Optional[Dict[str, Any]] = None):
+        """Initialize the app.
+
+        `agent_factory()` builds the shared MentorAgent and
+        `tracker_factory(learner_id)` a learner's ProgressTracker. Both run
+        on worker threads.
+        """
+        web_config = web_config or {}
+        self.agent_factory = agent_factory
+        self.tracker_factory = tracker_factory
+        self.max_streams = web_config.get('max_streams', 256)
+        self.heartbeat_seconds = web_config.get('heartbeat_seconds', 15)
+        self.max_body = web_config.get('max_body_kb', 64) * 1024
+        self.progress_workers = web_config.get('progress_workers', 4)
+        self.agent = None
+        self.active_streams = 0
+        self.requests_served = 0
+        # A provider call blocks its thread for the whole answer; requests
+        # beyond max_streams wait for a free thread, with heartbeats
+        self._streams = ThreadPoolExecutor(max_workers=self.max_streams, thread_name_prefix="mentor-stream")
+        # Different learners' progress is handled in parallel; each tracker
+        # has a lock, so one learner's requests still run one at a time
+        self._progress = ThreadPoolExecutor(max_workers=self.progress_workers, thread_name_prefix="mentor-progress")
+        self._trackers: "OrderedDict[str, Tuple[Any, threading.Lock]]" = OrderedDict()
+        self._trackers_lock = threading.Lock()
+        self._sessions: "OrderedDict[Tuple[str, int, int], Any]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+        # learner_id -> [lock, requests holding or waiting for it]
+        self._session_turns: Dict[str, List[Any]] = {}
+        self._startup_lock = asyncio.Lock()
+    
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+    
+    # Lifecycle
+    
+    def _build_agent(self):
+        """Create the shared agent and everything its first request would otherwise build."""
+        agent = self.agent_factory()
+        agent.router
+        agent.retriever
+        agent.question_cache
+        return agent
+    
+    async def startup(self):
+        """Build the shared agent, unless that already happened."""
+        async with self._startup_lock:
+            if self.agent is None:
+                self.agent = await asyncio.get_running_loop().run_in_executor(self._streams, self._build_agent)
+    
+    def shutdown(self):
+        """Stop taking streams and finish pending progress writes."""
+        self._streams.shutdown(wait=False, cancel_futures=True)
+        self._progress.shutdown(wait=True)
+    
+    async def _lifespan(self, receive: Callable, send: Callable):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    
+    # Requests
+    
+    def _route(self, method: str, path: str) -> Tuple[Callable, Dict[str, str]]:
+        """Find the handler for a request."""
+        allowed = False
+        for route_method, pattern, name in ROUTES:
+            match = pattern.match(path)
+            if not match:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            params = match.groupdict()
+            if "learner_id" in params and not LEARNER_ID_PATTERN.match(params["learner_id"]):
+                raise HTTPError(400, "learner IDs are up to 64 letters, digits and _.@-")
+            return getattr(self, f"_handle_{name}"), params
+        if allowed:
+            raise HTTPError(405, f"{method} is not allowed on {path}")
+        raise HTTPError(404, f"no such endpoint: {path}")
+    
+    async def _read_body(self, receive: Callable) -> Dict[str, Any]:
+        """Read a JSON object request body, if any."""
+        chunks: List[bytes] = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise HTTPError(400, "client disconnected")
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body:
+                raise HTTPError(413, f"request bodies are limited to {self.max_body // 1024} KB")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+        if not size:
+            return {}
+        try:
+            body = loads(b"".join(chunks))
+        except ValueError:
+            raise HTTPError(400, "the request body must be JSON")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "the request body must be a JSON object")
+        return body
+    
+    async def _http(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        self.requests_served += 1
+        try:
+            handler, params = self._route(scope["method"], scope["path"])
+            body = await self._read_body(receive) if scope["method"] == "POST" else {}
+            if self.agent is None:
+                # ASGI servers run without lifespan events too
+                await self.startup()
+            result = await handler(body, receive, send, **params)
+        except HTTPError as e:
+            await self._send_json(send, e.status, {"error": str(e)})
+            return
+        if result is not None:
+            await self._send_json(send, 200, result)
+    
+    @staticmethod
+    async def _send_json(send: Callable, status: int, data: Dict[str, Any]):
+        body = dumps(data)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": JSON_HEADERS + [(b"content-length", str(len(body)).encode('ascii'))]
+        })
+        await send({"type": "http.response.body", "body": body})
+    
+    async def _stream(self, receive: Callable, send: Callable,
+                      events: Callable[[], Iterator[Tuple[str, Dict[str, Any]]]]):
+        """Send the (event, data) pairs `events()` yields on a stream thread as Server-Sent Events.
+
+        The stream thread wakes the event loop only when it isn't already
+        due to run, and the loop sends everything that arrived since in one
+        write, so hundreds of streams cost far fewer wakeups than tokens.
+        A comment is sent every heartbeat_seconds so proxies keep the
+        connection open while the provider thinks. When the client goes
+        away, the stream is closed at the next event, which closes the
+        provider's response.
+        """
+        loop = asyncio.get_running_loop()
+        pending: Deque[Any] = deque()
+        ready = asyncio.Event()
+        # Set from when a stream thread schedules a wakeup until the loop takes it
+        wakeup = threading.Event()
+        cancelled = threading.Event()
+        
+        def put(item):
+            pending.append(item)
+            if not wakeup.is_set():
+                wakeup.set()
+                try:
+                    loop.call_soon_threadsafe(ready.set)
+                except RuntimeError:
+                    # The event loop is gone (server shutting down)
+                    cancelled.set()
+        
+        def produce():
+            iterator = events()
+            try:
+                for event in iterator:
+                    if cancelled.is_set():
+                        break
+                    put(event)
+            except Exception as e:
+                put(("error", {"error": str(e)}))
+            finally:
+                iterator.close()
+                put(_END)
+        
+        async def heartbeat():
+            while True:
+                await asyncio.sleep(self.heartbeat_seconds)
+                pending.append(_HEARTBEAT)
+                ready.set()
+        
+        async def watch_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            pending.append(_DISCONNECTED)
+            ready.set()
+        
+        await send({"type": "http.response.start", "status": 200, "headers": SSE_HEADERS})
+        watchers = [asyncio.ensure_future(heartbeat()), asyncio.ensure_future(watch_disconnect())]
+        self.active_streams += 1
+        producer = loop.run_in_executor(self._streams, produce)
+        last = None
+        try:
+            while last is not _END and last is not _DISCONNECTED:
+                await ready.wait()
+                ready.clear()
+                # Cleared before draining, so an event added from here on schedules a new wakeup
+                wakeup.clear()
+                parts = []
+                while pending:
+                    last = pending.popleft()
+                    if last is _END or last is _DISCONNECTED:
+                        break
+                    parts.append(b": keep-alive\n\n" if last is _HEARTBEAT else sse_event(*last))
+                if parts and last is not _DISCONNECTED:
+                    await send({"type": "http.response.body", "body": b"".join(parts), "more_body": True})
+            if last is _END:
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            cancelled.set()
+            for watcher in watchers:
+                watcher.cancel()
+            self.active_streams -= 1
+        # Whatever the events do after their last chunk (saving the turn,
+        # indexing the answer) finishes before the request does
+        await producer
+    
+    def _tracker(self, learner_id: str) -> Tuple[Any, threading.Lock]:
+        """Get a learner's tracker and its lock, keeping recently used ones open."""
+        with self._trackers_lock:
+            entry = self._trackers.get(learner_id)
+            if entry is not None:
+                self._trackers.move_to_end(learner_id)
+                return entry
+        entry = (self.tracker_factory(learner_id), threading.Lock())
+        with self._trackers_lock:
+            entry = self._trackers.setdefault(learner_id, entry)
+            # A tracker evicted mid-operation still finishes it; storage version
+            # checks keep it safe alongside the learner's next tracker
+            while len(self._trackers) > MAX_OPEN_TRACKERS:
+                self._trackers.popitem(last=False)
+        return entry
+    
+    async def _with_tracker(self, learner_id: str, operation: Callable[[Any], Any]) -> Any:
+        """Run `operation(tracker)` for a learner on a progress thread."""
+        def run():
+            tracker, lock = self._tracker(learner_id)
+            with lock:
+                return operation(tracker)
+        
+        return await asyncio.get_running_loop().run_in_executor(self._progress, run)
+    
+    def _ai_events(self, prompt: str, system_prompt: Optional[str], command: str,
+                   use_cache: bool = True) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream one AI response as events."""
+        metrics: Dict[str, Any] = {}
+        for text in self.agent.stream_ai_response(prompt, system_prompt, use_cache=use_cache, command=command,
+                                                  metrics=metrics):
+            yield "chunk", {"text": text}
+        yield "done", _done(metrics)
+    
+    # Handlers
+    
+    async def _handle_health(self, body, receive, send):
+        router = self.agent.router
+        return {
+            "status": "ok",
+            "provider": router.primary.name if router else None,
+            "active_streams": self.active_streams,
+            "max_streams": self.max_streams,
+            "requests_served": self.requests_served
+        }
+    
+    async def _handle_interview_topics(self, body, receive, send):
+        return {"topics": INTERVIEW_TOPICS}
+    
+    async def _handle_progress(self, body, receive, send, learner_id: str):
+        return await self._with_tracker(learner_id, lambda tracker: tracker.get_progress().to_dict())
+    
+    async def _handle_start(self, body, receive, send, learner_id: str):
+        name = _required(body, "name")
+        
+        def start(tracker):
+            if not tracker.get_progress().started:
+                tracker.initialize_progress(name)
+            return tracker.get_progress().to_dict()
+        
+        return await self._with_tracker(learner_id, start)
+    
+    async def _handle_complete_day(self, body, receive, send, learner_id: str):
+        advance = bool(body.get("advance", False))
+        days_per_week = self.agent.config.get('days_per_week', 5)
+        
+        def complete(tracker):
+            progress = tracker.get_progress()
+            tracker.complete_day(progress.current_week, progress.current_day)
+            # Like the CLI, moving on to the next week is left to the assessment
+            if advance and progress.current_day < days_per_week:
+                tracker.advance_to_next_day()
+            return tracker.get_progress().to_dict()
+        
+        return await self._with_tracker(learner_id, complete)
+    
+    async def _handle_ask(self, body, receive, send, learner_id: str):
+        question = _required(body, "question")
+        use_cache = not body.get("no_cache", False)
+        progress = await self._with_tracker(learner_id, lambda tracker: tracker.get_progress())
+        week, day = progress.current_week, progress.current_day
+        agent = self.agent
+        
+        def events():
+            match = agent.similar_answer(question) if use_cache else None
+            if match:
+                yield "chunk", {"text": match["answer"]}
+                yield "done", {"cached": True, "similar_question": match["question"],
+                               "similarity": round(match["similarity"], 3)}
+                return
+            
+            metrics: Dict[str, Any] = {}
+            chunks = []
+            for text in agent.stream_ai_response(agent.grounded_prompt(question, week, day), ASK_SYSTEM_PROMPT,
+                                                 use_cache=use_cache, command="ask", metrics=metrics):
+                chunks.append(text)
+                yield "chunk", {"text": text}
+            if use_cache:
+                agent.remember_answer(question, "".join(chunks), metrics)
+            yield "done", _done(metrics)
+        
+        await self._stream(receive, send, events)
+    
+    def _session_memory(self, learner_id: str, week: int, day: int):
+        """Get a learner's conversation for a day, keeping recently used ones open."""
+        key = (learner_id, week, day)
+        with self._sessions_lock:
+            memory = self._sessions.get(key)
+            if memory is not None:
+                self._sessions.move_to_end(key)
+                return memory
+        memory = self.agent.conversation_memory(week, day, learner_id)
+        with self._sessions_lock:
+            memory = self._sessions.setdefault(key, memory)
+            while len(self._sessions) > MAX_OPEN_SESSIONS:
+                self._sessions.popitem(last=False)
+        return memory
+    
+    @contextlib.asynccontextmanager
+    async def _session_turn(self, learner_id: str):
+        """Take a learner's turn lock, dropping the lock once no request holds or waits for it."""
+        turn = self._session_turns.setdefault(learner_id, [asyncio.Lock(), 0])
+        turn[1] += 1
+        try:
+            async with turn[0]:
+                yield
+        finally:
+            turn[1] -= 1
+            if not turn[1]:
+                del self._session_turns[learner_id]
+    
+    async def _handle_session(self, body, receive, send, learner_id: str):
+        message = _required(body, "message")
+        progress = await self._with_tracker(learner_id, lambda tracker: tracker.get_progress())
+        week, day = progress.current_week, progress.current_day
+        agent = self.agent
+        
+        def events():
+            memory = self._session_memory(learner_id, week, day)
+            # Summarization of older turns may still be running from the last message
+            memory.wait()
+            request = agent.session_request(memory, message, week, day)
+            metrics: Dict[str, Any] = {}
+            chunks = []
+            for text in agent.stream_ai_response(request["prompt"], request["system_prompt"],
+                                                 history=request["history"], command="session", metrics=metrics):
+                chunks.append(text)
+                yield "chunk", {"text": text}
+            memory.add_turn(message, "".join(chunks), request["prompt_tokens"])
+            memory.compact_in_background()
+            yield "done", dict(_done(metrics), week=week, day=day, prompt_parts=request["prompt_tokens"])
+        
+        # One message at a time per learner, so turns are recorded in order
+        async with self._session_turn(learner_id):
+            await self._stream(receive, send, events)
+    
+    async def _handle_standup(self, body, receive, send, learner_id: str):
+        prompt = STANDUP_PROMPT.format(
+            yesterday=_required(body, "yesterday"),
+            today=_required(body, "today"),
+            blockers=body.get("blockers") or "None"
+        )
+        await self._stream(receive, send, lambda: self._ai_events(prompt, None, "standup"))
+    
+    async def _handle_interview(self, body, receive, send, learner_id: str):
+        topic = _required(body, "topic")
+        if topic not in INTERVIEW_TOPICS:
+            raise HTTPError(400, "unknown topic; see /interview/topics")
+        prompt = INTERVIEW_QUESTION_PROMPT.format(topic=topic)
+        await self._stream(receive, send, lambda: self._ai_events(prompt, None, "interview"))
+    
+    async def _handle_interview_feedback(self, body, receive, send, learner_id: str):
+        prompt = INTERVIEW_FEEDBACK_PROMPT.format(question=_required(body, "question"),
+                                                  answer=_required(body, "answer"))
+        await self._stream(receive, send, lambda: self._ai_events(prompt, None, "interview"))